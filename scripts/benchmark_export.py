@@ -0,0 +1,80 @@
+"""
+Benchmarks streaming exports of a large analysis history.
+
+Fills a temporary storage engine with synthetic records, then exports them to
+CSV (plain and gzip), Markdown and, with pyarrow, Parquet and Arrow IPC,
+printing throughput, file size and peak Python memory.
+
+Usage:
+    python scripts/benchmark_export.py --records 1000000 --engine sqlite
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add project root to sys.path to allow importing from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.exporter import ReportExporter
+from src.storage import JournalStorageManager, SQLiteStorageManager
+
+ENGINES = {"journal": JournalStorageManager, "sqlite": SQLiteStorageManager}
+
+
+def fill(storage, count: int, group: int = 10000) -> None:
+    """Saves count synthetic records in grouped commits."""
+    for start in range(0, count, group):
+        storage.save_many([
+            {
+                "text": f"Synthetic document number {i} about shipping and billing...",
+                "summary": f"Summary of document {i}.",
+                "word_count": 120 + i % 50, "char_count": 700 + i % 300, "line_count": 3 + i % 7,
+                "sentiment": ("POSITIVE", "NEGATIVE", "NEUTRAL")[i % 3], "confidence": "HIGH",
+            }
+            for i in range(start, min(start + group, count))
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming export benchmark")
+    parser.add_argument("--records", type=int, default=200000, help="Number of records to export")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="sqlite")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="ta_export_")
+    storage = ENGINES[args.engine](data_dir=os.path.join(work_dir, "data"))
+    print(f"Saving {args.records} records ({args.engine})...")
+    fill(storage, args.records)
+    exporter = ReportExporter(export_dir=os.path.join(work_dir, "exports"))
+
+    runs = {
+        "csv": lambda: exporter.to_csv(storage.iter_history()),
+        "csv (3 columns)": lambda: exporter.to_csv(storage.iter_history(), filename="narrow.csv",
+                                                   columns=["id", "timestamp", "sentiment"]),
+        "csv.gz": lambda: exporter.to_csv(storage.iter_history(), compress=True),
+        "markdown": lambda: exporter.to_markdown(storage.iter_history()),
+    }
+    try:
+        import pyarrow  # noqa: F401
+        runs["parquet"] = lambda: exporter.to_parquet(storage.iter_history())
+        runs["arrow"] = lambda: exporter.to_arrow(storage.iter_history())
+    except ImportError:
+        print("pyarrow not installed: skipping Parquet/Arrow.")
+    print(f"--- Export of {args.records} records ---")
+    for label, run in runs.items():
+        tracemalloc.start()
+        start = time.perf_counter()
+        path = run()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"{label:<16} {elapsed:6.1f} s {args.records / elapsed:9.0f} records/s "
+              f"{size_mb:8.1f} MB  peak {peak / (1024 * 1024):6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
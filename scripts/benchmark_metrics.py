@@ -0,0 +1,82 @@
+"""
+Benchmarks the cost of each extended metric on a large text file.
+
+Streams the file once per configuration: the basic word/char/line counts,
+the token pass alone, every metric on its own, and all metrics together with
+both frequency tables.
+
+Usage:
+    python scripts/benchmark_metrics.py --mb 100
+    python scripts/benchmark_metrics.py --file path/to/corpus.txt
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add project root to sys.path to allow importing from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.analyzer import TextAnalyzer
+from src.text_metrics import METRICS, compute_file_metrics
+
+
+def make_corpus(path: str, megabytes: int, seed: int = 0) -> None:
+    """Writes a synthetic English-like corpus of roughly the given size."""
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice("etaoinshrdlucmfwypvbgkjqxz") for _ in range(rng.randint(1, 10)))
+        for _ in range(20000)
+    ]
+    # Zipf-like frequencies, as in natural text.
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    target = megabytes * 1024 * 1024
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            words = rng.choices(vocabulary, cum_weights=cum_weights, k=200000)
+            # Close a sentence roughly every 15 words.
+            for i in range(15, len(words), 15):
+                words[i] += rng.choice((".", "!", "?", ".\n"))
+            block = " ".join(words) + ". "
+            f.write(block)
+            written += len(block)
+
+
+def timed(label: str, size_mb: float, func) -> float:
+    """Runs func once and prints its time and throughput."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed:8.2f} s {size_mb / elapsed:8.1f} MB/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extended metrics benchmark")
+    parser.add_argument("--file", help="Existing text file to measure")
+    parser.add_argument("--mb", type=int, default=100, help="Size of the generated corpus")
+    args = parser.parse_args()
+
+    path = args.file
+    if not path:
+        path = os.path.join(tempfile.mkdtemp(prefix="ta_metrics_"), "corpus.txt")
+        print(f"Generating {args.mb} MB corpus in {path}...")
+        make_corpus(path, args.mb)
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    print(f"--- Extended metrics on {size_mb:.1f} MB ---")
+
+    timed("basic counts (analyze_file)", size_mb, lambda: TextAnalyzer().analyze_file(path))
+    base = timed("token pass (no metrics)", size_mb, lambda: compute_file_metrics(path, metrics=()))
+    for metric in METRICS:
+        elapsed = timed(metric, size_mb, lambda: compute_file_metrics(path, metrics=(metric,)))
+        print(f"{'':<34} +{elapsed - base:7.2f} s over the token pass")
+    for table in ("counter", "array"):
+        timed(f"all metrics ({table} table)", size_mb, lambda: compute_file_metrics(path, table=table))
+
+
+if __name__ == "__main__":
+    main()
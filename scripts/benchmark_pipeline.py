@@ -0,0 +1,125 @@
+"""
+Benchmarks TextAnalyzerApp.perform_analysis offline against the fake LLM backend.
+
+Runs the same synthetic documents twice, once reusing one model instance and
+once building a model per request, and prints throughput, latency
+percentiles and the request/retry counters for each run.
+
+Usage:
+    python scripts/benchmark_pipeline.py --docs 200 --latency-ms 50 --model-init-ms 20
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add project root to sys.path to allow importing from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+WORDS = (
+    "good great love excellent happy bad awful hate poor sad the a of and to in "
+    "product service delivery price quality support team order time experience"
+).split()
+
+
+def make_documents(count: int, words_per_doc: int, seed: int) -> list:
+    """Builds reproducible synthetic documents."""
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(words_per_doc)) + "." for _ in range(count)]
+
+
+def run_pipeline(documents: list, args, reuse_model: bool) -> dict:
+    """Runs perform_analysis over every document and collects timings."""
+    from src.llm_backend import FakeBackend
+    from src.main import TextAnalyzerApp
+
+    app = TextAnalyzerApp(use_cache=False)
+    app.ai_client.backend = FakeBackend(
+        latency=args.latency_ms / 1000,
+        error_rate=args.error_rate,
+        requests_per_minute=args.rpm,
+        model_init_latency=args.model_init_ms / 1000,
+        seed=args.seed,
+        reuse_model=reuse_model,
+    )
+
+    timings = []
+    start = time.perf_counter()
+    for document in documents:
+        doc_start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            app.perform_analysis(document, source="Benchmark")
+        timings.append(time.perf_counter() - doc_start)
+    elapsed = time.perf_counter() - start
+
+    timings.sort()
+    return {
+        "elapsed": elapsed,
+        "docs_per_sec": len(documents) / elapsed,
+        "p50_ms": statistics.median(timings) * 1000,
+        "p95_ms": timings[int(len(timings) * 0.95) - 1] * 1000,
+        "requests": app.ai_client.backend.requests,
+        "models_created": app.ai_client.backend.models_created,
+        "retries": app.ai_client.scheduler.stats["retries"],
+        "failed": app.ai_client.scheduler.stats["failed"],
+    }
+
+
+def time_gemini_model_init(iterations: int = 200):
+    """Measures google.generativeai.GenerativeModel construction, if installed."""
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        return None
+    start = time.perf_counter()
+    for _ in range(iterations):
+        genai.GenerativeModel("gemini-flash-latest")
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline perform_analysis benchmark")
+    parser.add_argument("--docs", type=int, default=200, help="Documents to analyze")
+    parser.add_argument("--words", type=int, default=300, help="Words per document")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Fake request latency")
+    parser.add_argument("--model-init-ms", type=float, default=20, help="Fake model construction cost")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 503")
+    parser.add_argument("--rpm", type=int, default=0, help="Fake server quota (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for documents and errors")
+    args = parser.parse_args()
+
+    documents = make_documents(args.docs, args.words, args.seed)
+
+    # Keep the benchmark's storage, logs and caches out of the project tree,
+    # and do not let client-side pacing hide the backend's behaviour.
+    os.chdir(tempfile.mkdtemp(prefix="ta_bench_"))
+    os.environ["LLM_BACKEND"] = "fake"
+    os.environ.setdefault("GEMINI_RPM", "1000000")
+    os.environ.setdefault("GEMINI_TPM", "1000000000")
+
+    print(f"--- perform_analysis benchmark: {args.docs} docs, {args.latency_ms:g} ms latency, "
+          f"{args.model_init_ms:g} ms model init ---")
+    results = {}
+    for reuse_model in (True, False):
+        label = "reused model" if reuse_model else "model per request"
+        results[reuse_model] = result = run_pipeline(documents, args, reuse_model)
+        print(f"\n{label}:")
+        print(f"  {result['docs_per_sec']:.1f} docs/s, p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms")
+        print(f"  requests {result['requests']}, models built {result['models_created']}, "
+              f"retries {result['retries']}, failed {result['failed']}")
+
+    saved = results[False]["elapsed"] - results[True]["elapsed"]
+    print(f"\nReusing the model saved {saved:.2f}s ({saved / args.docs * 1000:.1f} ms per document).")
+
+    real_init = time_gemini_model_init()
+    if real_init is not None:
+        print(f"genai.GenerativeModel construction: {real_init:.3f} ms per instance.")
+
+
+if __name__ == "__main__":
+    main()
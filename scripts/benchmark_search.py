@@ -0,0 +1,84 @@
+"""
+Benchmarks the full-text search index on a synthetic history.
+
+Indexes N generated records (default 100k) in a temporary directory, then
+times term, phrase and prefix queries.
+
+Usage:
+    python scripts/benchmark_search.py --docs 100000
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add project root to sys.path to allow importing from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.search_index import SearchIndex
+
+
+def make_records(count: int, seed: int = 0):
+    """Yields analysis-like records with Zipf-distributed words."""
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice("etaoinshrdlucmfwypvbgkjqxz") for _ in range(rng.randint(2, 9)))
+        for _ in range(20000)
+    ]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    for i in range(count):
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(50, 400))
+        full_text = " ".join(words)
+        yield {
+            "id": f"doc-{i}",
+            "timestamp": f"2024-01-01T00:00:{i:06d}",
+            "sentiment": rng.choice(("POSITIVE", "NEGATIVE", "NEUTRAL")),
+            "text": full_text[:100],
+            "full_text": full_text,
+            "summary": " ".join(words[:12]),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search benchmark")
+    parser.add_argument("--docs", type=int, default=100000, help="Number of records to index")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="ta_search_"), "search_index.sqlite3")
+    index = SearchIndex(path)
+
+    start = time.perf_counter()
+    records = make_records(args.docs)
+    while index.add_many(itertools.islice(records, 5000)):
+        pass
+    elapsed = time.perf_counter() - start
+    print(f"Indexed {len(index)} records in {elapsed:.1f} s "
+          f"({os.path.getsize(path) / (1024 * 1024):.0f} MB index)")
+
+    sample = next(make_records(1))["full_text"].split()
+    queries = {
+        "common term": sample[0],
+        "two terms": f"{sample[0]} {sample[1]}",
+        "other term": sample[-1],
+        "phrase": f'"{sample[3]} {sample[4]}"',
+        "prefix": sample[2][:2] + "*",
+    }
+
+    print(f"--- Queries over {args.docs} records (top 10, {args.repeat} runs) ---")
+    for label, query in queries.items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results = index.search(query, limit=10)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        print(f"{label:<12} {query!r:<24} median {timings[len(timings) // 2]:7.2f} ms "
+              f"max {timings[-1]:7.2f} ms ({len(results)} results)")
+
+
+if __name__ == "__main__":
+    main()
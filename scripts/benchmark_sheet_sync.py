@@ -0,0 +1,78 @@
+"""
+Benchmarks incremental Google Sheets sync against a full rewrite, offline.
+
+Runs on the local fake sheet backend with simulated request latency and
+transient failures: exports a synthetic history, then adds a few records
+and compares re-uploading everything (clear + rewrite) with appending only
+the new rows.
+
+Usage:
+    python scripts/benchmark_sheet_sync.py --records 20000 --new 100 --latency-ms 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add project root to sys.path to allow importing from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.sheet_sync import FakeWorksheet, SheetSync
+
+
+def make_history(count: int):
+    """Returns analysis-like records, newest first."""
+    return [
+        {
+            "id": f"doc-{i:08d}",
+            "timestamp": f"2024-01-01T00:00:{i:08d}",
+            "sentiment": ("POSITIVE", "NEGATIVE", "NEUTRAL")[i % 3],
+            "confidence": "HIGH",
+            "word_count": 120 + i % 50,
+            "char_count": 700 + i % 300,
+            "line_count": 4,
+            "text": f"Record {i} " + "lorem ipsum " * 8,
+            "summary": f"Summary of record {i} " + "dolor sit amet " * 5,
+            "content_hash": f"{i:064x}",
+        }
+        for i in reversed(range(count))
+    ]
+
+
+def run(label: str, sheet: FakeWorksheet, sync: SheetSync, history, full: bool) -> None:
+    requests = sheet.requests
+    start = time.perf_counter()
+    rows = sync.sync(history, full=full)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {rows:>7} rows {sheet.requests - requests:>5} requests {elapsed:8.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Google Sheets sync benchmark (fake backend)")
+    parser.add_argument("--records", type=int, default=20000, help="Records already in the history")
+    parser.add_argument("--new", type=int, default=100, help="Records added before the second export")
+    parser.add_argument("--latency-ms", type=float, default=200, help="Simulated latency per request")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Share of requests failing with 429/503")
+    parser.add_argument("--batch-rows", type=int, default=500, help="Rows per append request")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="ta_sheets_")
+    sheet = FakeWorksheet(os.path.join(directory, "sheet.jsonl"), latency=args.latency_ms / 1000,
+                          error_rate=args.error_rate, seed=0)
+    sync = SheetSync(sheet, "benchmark", state_path=os.path.join(directory, "state.json"),
+                     batch_rows=args.batch_rows, base_delay=args.latency_ms / 1000)
+
+    history = make_history(args.records + args.new)
+    older = history[args.new:]
+
+    print(f"--- {args.records} records + {args.new} new, {args.latency_ms:.0f} ms/request, "
+          f"{args.error_rate:.0%} transient errors ---")
+    run("Initial export", sheet, sync, older, full=True)
+    run("Full rewrite", sheet, sync, older, full=True)
+    run("Incremental (new)", sheet, sync, history, full=False)
+    run("Incremental (no-op)", sheet, sync, history, full=False)
+
+
+if __name__ == "__main__":
+    main()
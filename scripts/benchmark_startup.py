@@ -0,0 +1,94 @@
+"""
+Benchmarks the CLI start-up time.
+
+Reports the import time of src.main (with the heaviest packages it pulls in,
+from `python -X importtime`) and the wall-clock time of common one-shot
+commands. Commands run in a temporary working directory, so the real history
+is left untouched, with the fake LLM backend, so no request leaves the machine.
+
+Usage:
+    python scripts/benchmark_startup.py --repeat 10
+"""
+import argparse
+import collections
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MAIN = os.path.join(PROJECT_ROOT, "src", "main.py")
+
+COMMANDS = {
+    "--help": ["--help"],
+    "--text --local-only": ["--text", "Fast start, great results.", "--local-only"],
+    "--text (fake AI)": ["--text", "Fast start, great results.", "--no-cache"],
+    "--search": ["--search", "results"],
+}
+
+
+def import_profile(env: dict, cwd: str, top: int):
+    """
+    Imports src.main under -X importtime.
+
+    Returns:
+        tuple: (total ms, [(package, cumulative ms)] of the heaviest packages)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=cwd, env=dict(env, PYTHONPATH=PROJECT_ROOT), capture_output=True, text=True, check=True,
+    )
+    total = 0.0
+    packages = collections.Counter()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        name = name.rstrip()
+        if name.strip() == "src.main":
+            total = int(cumulative_us) / 1000
+        packages[name.strip().split(".")[0]] += int(self_us) / 1000
+    return total, packages.most_common(top)
+
+
+def time_command(args: list, env: dict, cwd: str, repeat: int) -> float:
+    """Returns the median wall-clock time (ms) of a CLI command."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, MAIN, *args], cwd=cwd, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI start-up benchmark")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per command")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest packages to list")
+    args = parser.parse_args()
+
+    env = dict(os.environ, LLM_BACKEND="fake", FAKE_LLM_LATENCY_MS="0", FAKE_LLM_ERROR_RATE="0")
+    workdir = tempfile.mkdtemp(prefix="ta_startup_")
+
+    total, packages = import_profile(env, workdir, args.top)
+    print(f"--- import src.main: {total:.0f} ms ---")
+    for name, ms in packages:
+        print(f"{name:<28} {ms:7.1f} ms")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+    interpreter = (time.perf_counter() - start) * 1000 / args.repeat
+
+    print(f"--- Commands (median of {args.repeat}, bare interpreter {interpreter:.0f} ms) ---")
+    for label, command in COMMANDS.items():
+        print(f"{label:<22} {time_command(command, env, workdir, args.repeat):7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Module for combining per-chunk AI results into a document-level result.
+"""
+from typing import List
+
+VALID_SENTIMENTS = ("POSITIVE", "NEGATIVE", "NEUTRAL")
+
+CONFIDENCE_WEIGHTS = {"HIGH": 1.0, "MEDIUM": 0.66, "LOW": 0.33}
+
+
+def stratified_sample(items: list, k: int) -> list:
+    """
+    Picks k items spread evenly across the sequence.
+
+    The sequence is cut into k equal strata and the middle item of each is
+    taken, so the start, middle and end of a document are all represented.
+
+    Args:
+        items (list): The items, in document order.
+        k (int): Number of items to pick.
+
+    Returns:
+        list: The picked items, in order. All items if k >= len(items).
+    """
+    if k >= len(items):
+        return list(items)
+    if k <= 0:
+        return []
+    stride = len(items) / k
+    return [items[int(stride * i + stride / 2)] for i in range(k)]
+
+
+def aggregate_sentiments(results: List[dict], weights: List[float] = None) -> dict:
+    """
+    Votes per-chunk sentiments into one overall sentiment and confidence.
+
+    Each valid chunk votes with its weight (e.g. chunk length) times the
+    weight of its own confidence. The overall confidence reflects how much
+    of the vote went to the winning label.
+
+    Args:
+        results (List[dict]): Per-chunk {"sentiment", "confidence"} dicts.
+        weights (List[float]): Optional weight per result. Defaults to 1.
+
+    Returns:
+        dict: {"sentiment", "confidence"}. If no chunk produced a valid
+            sentiment, the first result (an error marker) is returned.
+    """
+    weights = weights or [1.0] * len(results)
+    scores = dict.fromkeys(VALID_SENTIMENTS, 0.0)
+    for result, weight in zip(results, weights):
+        sentiment = result.get("sentiment")
+        if sentiment in scores:
+            scores[sentiment] += weight * CONFIDENCE_WEIGHTS.get(result.get("confidence"), 0.33)
+
+    total = sum(scores.values())
+    if total == 0:
+        return dict(results[0]) if results else {"sentiment": "ERROR", "confidence": "None"}
+
+    winner = max(scores, key=scores.get)
+    agreement = scores[winner] / total
+    if agreement >= 0.75:
+        confidence = "HIGH"
+    elif agreement >= 0.5:
+        confidence = "MEDIUM"
+    else:
+        confidence = "LOW"
+    return {"sentiment": winner, "confidence": confidence}
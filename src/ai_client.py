@@ -1,122 +1,628 @@
-
 """
 Module for interacting with Google's Gemini API.
 Handles authentication, prompt construction, and error handling via GeminiClient class.
+Both a blocking API and an asyncio API (for concurrent requests) are provided,
+plus a combined mode that gets sentiment and summary from a single request.
+Texts too long for one summary prompt go through ChunkedSummarizer, and texts
+above the sentiment payload cap are scored chunk by chunk and voted. Every
+request goes through a RequestScheduler that paces it against the quota, and
+is sent by a pluggable LLMBackend (Gemini, or a local fake for offline runs).
 """
 import os
 import logging
 import json
-import google.generativeai as genai
-from google.api_core import exceptions
+import asyncio
+import sys
+from typing import List
 from dotenv import load_dotenv
 
+from src.aggregation import VALID_SENTIMENTS, aggregate_sentiments, stratified_sample
+from src.chunking import CHARS_PER_TOKEN, estimate_tokens, pack_by_budget, split_into_chunks
+from src.llm_backend import LLMBackend, create_backend
+from src.response_cache import ResponseCache
+from src.scheduler import RequestScheduler
+from src.summarizer import ChunkedSummarizer
+
 logger = logging.getLogger(__name__)
 
+
+def _is_google_api_error(error: Exception) -> bool:
+    """
+    Checks whether an error comes from the Google API client.
+
+    Such an error can only exist once google.api_core is loaded, so the SDK
+    is never imported just to run this check.
+    """
+    exceptions = sys.modules.get("google.api_core.exceptions")
+    return exceptions is not None and isinstance(error, exceptions.GoogleAPIError)
+
+
 class GeminiClient:
     """Class to manage interactions with Gemini AI."""
 
-    def __init__(self, api_key: str = None, model_name: str = "gemini-flash-latest"):
+    VALID_SENTIMENTS = VALID_SENTIMENTS
+    SENTIMENT_STRATEGIES = ("sample", "all")
+
+    # Response schema for the combined prompt (OpenAPI subset understood by Gemini).
+    COMBINED_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "sentiment": {"type": "string", "enum": list(VALID_SENTIMENTS)},
+            "confidence": {"type": "string", "enum": ["HIGH", "MEDIUM", "LOW"]},
+            "summary": {"type": "string"},
+        },
+        "required": ["sentiment", "confidence", "summary"],
+    }
+
+    # Response schema for multi-document sentiment requests.
+    BATCH_SCHEMA = {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                "index": {"type": "integer"},
+                "sentiment": {"type": "string", "enum": list(VALID_SENTIMENTS)},
+                "confidence": {"type": "string", "enum": ["HIGH", "MEDIUM", "LOW"]},
+            },
+            "required": ["index", "sentiment", "confidence"],
+        },
+    }
+
+    # Prompt tokens spent per packed item on numbering and instructions.
+    BATCH_ITEM_OVERHEAD_TOKENS = 8
+
+    def __init__(self, api_key: str = None, model_name: str = "gemini-flash-latest",
+                 cache: ResponseCache = None, max_concurrency: int = None,
+                 request_timeout: float = None, combined_prompt: bool = None,
+                 batch_token_budget: int = None, batch_max_items: int = 50,
+                 summary_chunk_chars: int = 10000, sentiment_max_tokens: int = None,
+                 sentiment_strategy: str = None, sentiment_sample_chunks: int = None,
+                 scheduler: RequestScheduler = None, backend: LLMBackend = None):
         """
         Initializes the Gemini Client.
 
         Args:
             api_key (str): The Gemini API Key. If None, tries to load from env.
             model_name (str): The model to use.
+            cache (ResponseCache): Optional cache of previous responses.
+            max_concurrency (int): Maximum async requests in flight at once.
+                Defaults to GEMINI_MAX_CONCURRENCY from env, then 8.
+            request_timeout (float): Seconds before an async request is abandoned.
+                Defaults to GEMINI_TIMEOUT_SECONDS from env, then 60.
+            combined_prompt (bool): Make analyze() use one combined request.
+                Defaults to GEMINI_COMBINED_PROMPT from env, then True.
+            batch_token_budget (int): Estimated prompt tokens per batched
+                sentiment request. Defaults to GEMINI_BATCH_TOKEN_BUDGET, then 8000.
+            batch_max_items (int): Maximum texts packed into one request.
+            summary_chunk_chars (int): Longer texts are summarized map-reduce
+                style instead of in a single prompt.
+            sentiment_max_tokens (int): Payload cap for one sentiment request.
+                Longer texts are scored in chunks. Defaults to
+                GEMINI_SENTIMENT_MAX_TOKENS from env, then 8000.
+            sentiment_strategy (str): 'sample' scores a stratified sample of
+                chunks, 'all' scores every chunk. Defaults to
+                GEMINI_SENTIMENT_STRATEGY from env, then 'sample'.
+            sentiment_sample_chunks (int): Chunks scored by the 'sample'
+                strategy. Defaults to GEMINI_SENTIMENT_SAMPLE_CHUNKS, then 6.
+            scheduler (RequestScheduler): Rate limiting, retries and adaptive
+                concurrency. Defaults to one built from GEMINI_RPM, GEMINI_TPM
+                and GEMINI_MAX_RETRIES.
+            backend (LLMBackend): Sends the prompts. Defaults to the one
+                selected by LLM_BACKEND from env, then Gemini.
         """
         load_dotenv()
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         self.model_name = model_name
+        self.cache = cache
+        self.max_concurrency = max(1, max_concurrency or int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")))
+        self.request_timeout = request_timeout or float(os.getenv("GEMINI_TIMEOUT_SECONDS", "60"))
+        if combined_prompt is None:
+            combined_prompt = os.getenv("GEMINI_COMBINED_PROMPT", "1").lower() not in ("0", "false", "no")
+        self.combined_prompt = combined_prompt
+        self.batch_token_budget = batch_token_budget or int(os.getenv("GEMINI_BATCH_TOKEN_BUDGET", "8000"))
+        self.batch_max_items = max(1, batch_max_items)
+        self.summary_chunk_chars = summary_chunk_chars
+        self.summarizer = ChunkedSummarizer(self, chunk_chars=min(8000, summary_chunk_chars))
+        self.sentiment_max_tokens = sentiment_max_tokens or int(os.getenv("GEMINI_SENTIMENT_MAX_TOKENS", "8000"))
+        self.sentiment_strategy = (sentiment_strategy or os.getenv("GEMINI_SENTIMENT_STRATEGY", "sample")).lower()
+        if self.sentiment_strategy not in self.SENTIMENT_STRATEGIES:
+            raise ValueError(f"Unknown sentiment strategy '{self.sentiment_strategy}'. "
+                             f"Choose from: {', '.join(self.SENTIMENT_STRATEGIES)}")
+        self.sentiment_sample_chunks = sentiment_sample_chunks or int(os.getenv("GEMINI_SENTIMENT_SAMPLE_CHUNKS", "6"))
+        self.scheduler = scheduler or RequestScheduler.from_env(max_concurrency=self.max_concurrency)
+        self._slots = None
+        self._slots_loop = None
+        self.backend = backend or create_backend(api_key=self.api_key, model_name=model_name)
 
-        if not self.api_key:
-            logger.warning("GEMINI_API_KEY not found.")
-        else:
-            genai.configure(api_key=self.api_key)
+    # --- Prompts and response handling -------------------------------------
 
-    def analyze_sentiment(self, text: str) -> dict:
-        """
-        Analyzes the sentiment of the text using Gemini API.
+    @staticmethod
+    def _sentiment_prompt(text: str) -> str:
+        """Builds the sentiment classification prompt."""
+        return (
+            f"Analyze the sentiment of the following text: '{text}'.\n"
+            "Respond STRICTLY in the following JSON format:\n"
+            "{\"sentiment\": \"POSITIVE\" | \"NEGATIVE\" | \"NEUTRAL\", \"confidence\": \"HIGH\" | \"MEDIUM\" | \"LOW\"}\n"
+            "Do not include any other text or markdown formatting."
+        )
+
+    @staticmethod
+    def _summary_prompt(text: str) -> str:
+        """Builds the summary prompt."""
+        return (
+            f"Summarize the following text in 2-3 concise sentences: '{text}'.\n"
+            "Keep it plain text."
+        )
+
+    @staticmethod
+    def _combined_prompt(text: str) -> str:
+        """Builds the single prompt asking for sentiment, confidence and summary."""
+        return (
+            f"Analyze the following text: '{text}'.\n"
+            "Return a JSON object with the overall sentiment (POSITIVE, NEGATIVE or NEUTRAL), "
+            "your confidence (HIGH, MEDIUM or LOW) and a plain-text summary of 2-3 concise sentences:\n"
+            "{\"sentiment\": \"...\", \"confidence\": \"...\", \"summary\": \"...\"}\n"
+            "Do not include any other text or markdown formatting."
+        )
+
+    @staticmethod
+    def _batch_sentiment_prompt(texts: List[str]) -> str:
+        """Builds one prompt classifying several numbered texts."""
+        items = "\n".join(f"[{i}] '{text}'" for i, text in enumerate(texts))
+        return (
+            "Analyze the sentiment of each numbered text below.\n"
+            "Respond STRICTLY with a JSON array holding one object per text, in the same order:\n"
+            "[{\"index\": 0, \"sentiment\": \"POSITIVE\" | \"NEGATIVE\" | \"NEUTRAL\", "
+            "\"confidence\": \"HIGH\" | \"MEDIUM\" | \"LOW\"}, ...]\n"
+            "Do not include any other text or markdown formatting.\n\n"
+            f"{items}"
+        )
+
+    @staticmethod
+    def _strip_code_fences(response_text: str) -> str:
+        """Basic cleanup if model wraps in ```json ... ```"""
+        if response_text.startswith("```"):
+            lines = response_text.splitlines()
+            if lines[0].startswith("```"):
+                lines = lines[1:]
+            if lines and lines[-1].startswith("```"):
+                lines = lines[:-1]
+            response_text = "\n".join(lines).strip()
+        return response_text
+
+    def _sentiment_from_response(self, response) -> dict:
         """
-        if not self.api_key:
-            logger.error("Attempted analysis without API Key.")
-            return {"sentiment": "ERROR", "confidence": "None"}
+        Turns a generate_content response into a sentiment dict.
 
+        Raises:
+            json.JSONDecodeError: If the response is not JSON.
+            ValueError: If required keys are missing.
+        """
         try:
-            model = genai.GenerativeModel(self.model_name)
-            
-            prompt = (
-                f"Analyze the sentiment of the following text: '{text}'.\n"
-                "Respond STRICTLY in the following JSON format:\n"
-                "{\"sentiment\": \"POSITIVE\" | \"NEGATIVE\" | \"NEUTRAL\", \"confidence\": \"HIGH\" | \"MEDIUM\" | \"LOW\"}\n"
-                "Do not include any other text or markdown formatting."
-            )
+            if response.prompt_feedback.block_reason:
+                 logger.warning(f"Response blocked: {response.prompt_feedback}")
+                 return {"sentiment": "BLOCKED", "confidence": "Filters Triggered"}
 
-            logger.debug(f"Sending request to Gemini: {text[:50]}...")
-            
-            try:
-                response = model.generate_content(prompt)
-                
-                if response.prompt_feedback.block_reason:
-                     logger.warning(f"Response blocked: {response.prompt_feedback}")
-                     return {"sentiment": "BLOCKED", "confidence": "Filters Triggered"}
-
-                response_text = response.text.strip()
-                logger.debug(f"Received raw response: {response_text}")
-
-            except ValueError:
-                logger.error("Gemini response empty/blocked.")
-                return {"sentiment": "AI_ERROR", "confidence": "Content Blocked"}
-
-            # Basic cleanup if model wraps in ```json ... ```
-            if response_text.startswith("```"):
-                lines = response_text.splitlines()
-                if lines[0].startswith("```"):
-                    lines = lines[1:]
-                if lines[-1].startswith("```"):
-                    lines = lines[:-1]
-                response_text = "\n".join(lines).strip()
-
-            result = json.loads(response_text)
-            
-            if "sentiment" not in result or "confidence" not in result:
-                 raise ValueError("Missing keys in JSON response")
-                 
-            return result
-
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse AI response as JSON: {e}")
+            response_text = response.text.strip()
+            logger.debug(f"Received raw response: {response_text}")
+
+        except ValueError:
+            logger.error("Gemini response empty/blocked.")
+            return {"sentiment": "AI_ERROR", "confidence": "Content Blocked"}
+
+        result = json.loads(self._strip_code_fences(response_text))
+
+        if "sentiment" not in result or "confidence" not in result:
+             raise ValueError("Missing keys in JSON response")
+
+        return result
+
+    def _combined_from_response(self, response) -> tuple:
+        """
+        Splits a combined response into (sentiment dict, summary).
+
+        Raises:
+            ValueError: If the response is blocked, not JSON or misses a key.
+        """
+        result = self._sentiment_from_response(response)
+        if result["sentiment"] not in self.VALID_SENTIMENTS:
+            raise ValueError(f"Unusable combined response: {result['sentiment']}")
+
+        summary = result.pop("summary", None)
+        if not isinstance(summary, str) or not summary.strip():
+            raise ValueError("Missing summary in combined response")
+
+        return {"sentiment": result["sentiment"], "confidence": result["confidence"]}, summary.strip()
+
+    def _batch_from_response(self, response, count: int) -> List[dict]:
+        """
+        Maps a batched response back to its inputs.
+
+        Raises:
+            ValueError: If the reply is blocked, not a JSON array, or does not
+                hold exactly one valid result per input index.
+        """
+        if response.prompt_feedback.block_reason:
+            raise ValueError(f"Batch blocked: {response.prompt_feedback}")
+
+        items = json.loads(self._strip_code_fences(response.text.strip()))
+        if not isinstance(items, list):
+            raise ValueError("Batch response is not a JSON array")
+
+        results = [None] * count
+        for item in items:
+            index = item.get("index") if isinstance(item, dict) else None
+            if not isinstance(index, int) or not 0 <= index < count or results[index] is not None:
+                raise ValueError(f"Bad or duplicate index in batch response: {index}")
+            if item.get("sentiment") not in self.VALID_SENTIMENTS or "confidence" not in item:
+                raise ValueError(f"Invalid batch item: {item}")
+            results[index] = {"sentiment": item["sentiment"], "confidence": item["confidence"]}
+
+        if any(result is None for result in results):
+            raise ValueError("Batch response is missing items")
+        return results
+
+    @staticmethod
+    def _sentiment_error(error: Exception) -> dict:
+        """Maps an exception raised during sentiment analysis to a result dict."""
+        if isinstance(error, json.JSONDecodeError):
+            logger.error(f"Failed to parse AI response as JSON: {error}")
             return {"sentiment": "UNKNOWN", "confidence": "Low - Parse Error"}
-            
-        except exceptions.GoogleAPIError as e:
-            logger.error(f"Gemini API Error: {e}")
+
+        if _is_google_api_error(error):
+            logger.error(f"Gemini API Error: {error}")
             return {"sentiment": "API ERROR", "confidence": "None"}
-            
-        except Exception as e:
-            logger.error(f"Unexpected AI Error: {e}")
+
+        if isinstance(error, asyncio.TimeoutError):
+            logger.error("Gemini request timed out.")
+            return {"sentiment": "TIMEOUT", "confidence": "None"}
+
+        logger.error(f"Unexpected AI Error: {error}")
+        return {"sentiment": "ERROR", "confidence": "None"}
+
+    @staticmethod
+    def _summary_from_response(response) -> str:
+        """Extracts the summary text from a generate_content response."""
+        if response.text:
+            return response.text.strip()
+        return "No summary generated."
+
+    def _cache_get(self, kind: str, text: str):
+        """Looks a response up in the cache, if one is configured."""
+        if self.cache is None:
+            return None
+        return self.cache.get(self.model_name, kind, text)
+
+    def _cache_set(self, kind: str, text: str, value) -> None:
+        """Stores a response in the cache, if one is configured."""
+        if self.cache is not None:
+            self.cache.set(self.model_name, kind, text, value)
+
+    # --- Blocking API -------------------------------------------------------
+
+    def analyze_sentiment(self, text: str) -> dict:
+        """
+        Analyzes the sentiment of the text using Gemini API.
+        """
+        if not self.backend.available:
+            logger.error("Attempted analysis without API Key.")
             return {"sentiment": "ERROR", "confidence": "None"}
 
+        # Runs on the async path so the request is paced by the scheduler.
+        return asyncio.run(self.analyze_sentiment_async(text))
+
     def generate_summary(self, text: str) -> str:
         """
         Generates a concise summary of the text using Gemini.
         """
-        if not self.api_key:
+        if not self.backend.available:
             return "AI Summary Unavailable (No Key)"
 
+        return asyncio.run(self.generate_summary_async(text))
+
+    def analyze(self, text: str) -> tuple:
+        """
+        Gets sentiment and summary, with one combined request or two
+        concurrent ones depending on combined_prompt.
+
+        Returns:
+            tuple: (sentiment dict, summary str)
+        """
+        return asyncio.run(self.analyze_async(text))
+
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[dict]:
+        """
+        Analyzes the sentiment of many short texts with packed requests.
+
+        Returns:
+            List[dict]: One sentiment dict per text, in input order.
+        """
+        return asyncio.run(self.analyze_sentiment_batch_async(texts))
+
+    def analyze_all(self, text: str) -> tuple:
+        """
+        Gets sentiment, confidence and summary from a single request.
+
+        Returns:
+            tuple: (sentiment dict, summary str)
+        """
+        return asyncio.run(self.analyze_all_async(text))
+
+    # --- Async API ----------------------------------------------------------
+
+    def _request_slots(self) -> asyncio.Semaphore:
+        """Returns the semaphore bounding in-flight requests on the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._slots_loop = loop
+        return self._slots
+
+    async def generate_text_async(self, prompt: str) -> str:
+        """
+        Sends a free-form prompt and returns the plain-text reply.
+
+        Raises:
+            ValueError: If the reply is blocked or empty.
+            Exception: API errors and timeouts are not caught here.
+        """
+        response = await self._generate_async(prompt)
+        if not response.text:
+            raise ValueError("Empty response from Gemini")
+        return response.text.strip()
+
+    async def _generate_async(self, prompt: str, generation_config: dict = None):
+        """
+        Sends one prompt to the backend through the scheduler.
+
+        The scheduler waits for request and token quota, retries throttling
+        (429), server errors and timeouts with jittered backoff, and narrows
+        concurrency while the API keeps throttling.
+        """
+        async def attempt():
+            async with self._request_slots():
+                return await asyncio.wait_for(
+                    self.backend.generate(prompt, generation_config=generation_config),
+                    timeout=self.request_timeout
+                )
+
+        return await self.scheduler.run(attempt, tokens=estimate_tokens(prompt))
+
+    async def analyze_sentiment_async(self, text: str) -> dict:
+        """
+        Async version of analyze_sentiment.
+
+        Texts above sentiment_max_tokens are never sent whole: they are split
+        into chunks under the cap and scored chunk by chunk (see
+        _analyze_long_sentiment_async).
+        """
+        if not self.backend.available:
+            logger.error("Attempted analysis without API Key.")
+            return {"sentiment": "ERROR", "confidence": "None"}
+
+        if estimate_tokens(text) > self.sentiment_max_tokens:
+            return await self._analyze_long_sentiment_async(text)
+        return await self._analyze_sentiment_single_async(text)
+
+    async def _analyze_long_sentiment_async(self, text: str) -> dict:
+        """
+        Scores a long text from chunks and votes an overall sentiment.
+
+        With the 'sample' strategy only sentiment_sample_chunks chunks,
+        spread evenly over the document, are sent, so cost and latency stay
+        flat however long the text is. With 'all' every chunk is scored
+        concurrently.
+        """
+        cached = self._cache_get("sentiment", text)
+        if cached is not None:
+            return cached
+
+        max_chars = self.sentiment_max_tokens * CHARS_PER_TOKEN
+        chunks = split_into_chunks(text, max_chars=max_chars, min_chars=max_chars // 2)
+        if self.sentiment_strategy == "sample":
+            chunks = stratified_sample(chunks, self.sentiment_sample_chunks)
+
+        logger.debug(f"Scoring sentiment of {len(chunks)} chunks ({self.sentiment_strategy} strategy)")
+        results = await asyncio.gather(*(self._analyze_sentiment_single_async(chunk) for chunk in chunks))
+        result = aggregate_sentiments(list(results), weights=[len(chunk) for chunk in chunks])
+
+        if result["sentiment"] in self.VALID_SENTIMENTS:
+            self._cache_set("sentiment", text, result)
+        return result
+
+    async def _analyze_sentiment_single_async(self, text: str) -> dict:
+        """Scores a text that fits in a single sentiment request."""
+        cached = self._cache_get("sentiment", text)
+        if cached is not None:
+            return cached
+
         try:
-            model = genai.GenerativeModel(self.model_name)
-            
-            prompt = (
-                f"Summarize the following text in 2-3 concise sentences: '{text[:10000]}'.\n" 
-                "Keep it plain text."
-            )
+            logger.debug(f"Sending async request to Gemini: {text[:50]}...")
+            response = await self._generate_async(self._sentiment_prompt(text))
+            result = self._sentiment_from_response(response)
+        except Exception as e:
+            return self._sentiment_error(e)
 
-            logger.debug(f"Requesting summary for text length {len(text)}...")
-            response = model.generate_content(prompt)
-            
-            if response.text:
-                return response.text.strip()
-            else:
-                return "No summary generated."
+        if result["sentiment"] in self.VALID_SENTIMENTS:
+            self._cache_set("sentiment", text, result)
+        return result
+
+    async def generate_summary_async(self, text: str) -> str:
+        """
+        Async version of generate_summary.
+        """
+        if not self.backend.available:
+            return "AI Summary Unavailable (No Key)"
+
+        cached = self._cache_get("summary", text)
+        if cached is not None:
+            return cached
+
+        if len(text) > self.summary_chunk_chars:
+            try:
+                logger.debug(f"Requesting chunked summary for text length {len(text)}...")
+                summary = await self.summarizer.summarize_async(text)
+            except Exception as e:
+                logger.error(f"Chunked summary generation failed: {e}")
+                return "Summary Error"
+            self._cache_set("summary", text, summary)
+            return summary
+
+        try:
+            logger.debug(f"Requesting async summary for text length {len(text)}...")
+            response = await self._generate_async(self._summary_prompt(text))
+            summary = self._summary_from_response(response)
 
         except Exception as e:
             logger.error(f"Summary generation failed: {e}")
             return "Summary Error"
+
+        if response.text:
+            self._cache_set("summary", text, summary)
+        return summary
+
+    async def analyze_sentiment_batch_async(self, texts: List[str]) -> List[dict]:
+        """
+        Async version of analyze_sentiment_batch.
+
+        Uncached texts are packed into requests of at most batch_token_budget
+        estimated tokens, and each request asks for a JSON array of results.
+
+        Returns:
+            List[dict]: One sentiment dict per text, in input order.
+        """
+        if not self.backend.available:
+            logger.error("Attempted analysis without API Key.")
+            return [{"sentiment": "ERROR", "confidence": "None"} for _ in texts]
+
+        results = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            cached = self._cache_get("sentiment", text)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+
+        groups = pack_by_budget(
+            pending,
+            self.batch_token_budget,
+            cost=lambda i: estimate_tokens(texts[i]) + self.BATCH_ITEM_OVERHEAD_TOKENS,
+            max_items=self.batch_max_items,
+        )
+        logger.debug(f"Packing {len(pending)} texts into {len(groups)} sentiment requests")
+
+        group_results = await asyncio.gather(
+            *(self._sentiment_group_async([texts[i] for i in group]) for group in groups)
+        )
+        for group, group_result in zip(groups, group_results):
+            for i, result in zip(group, group_result):
+                results[i] = result
+        return results
+
+    async def _sentiment_group_async(self, texts: List[str]) -> List[dict]:
+        """
+        Sends one packed sentiment request.
+
+        A malformed reply splits the group in half and retries each half,
+        down to single texts, which use the regular sentiment prompt.
+        """
+        if len(texts) == 1:
+            return [await self.analyze_sentiment_async(texts[0])]
+
+        try:
+            response = await self._generate_async(
+                self._batch_sentiment_prompt(texts),
+                generation_config={
+                    "response_mime_type": "application/json",
+                    "response_schema": self.BATCH_SCHEMA,
+                },
+            )
+            results = self._batch_from_response(response, len(texts))
+        except ValueError as e:
+            logger.warning(f"Malformed batch of {len(texts)} texts, splitting: {e}")
+            middle = len(texts) // 2
+            left, right = await asyncio.gather(
+                self._sentiment_group_async(texts[:middle]),
+                self._sentiment_group_async(texts[middle:]),
+            )
+            return left + right
+        except Exception as e:
+            error = self._sentiment_error(e)
+            return [dict(error) for _ in texts]
+
+        for text, result in zip(texts, results):
+            self._cache_set("sentiment", text, result)
+        return results
+
+    async def analyze_all_async(self, text: str) -> tuple:
+        """
+        Async version of analyze_all.
+
+        The text is sent once, with a response schema forcing JSON output.
+        If the request fails or the reply cannot be parsed, it falls back to
+        separate sentiment and summary requests.
+
+        Returns:
+            tuple: (sentiment dict, summary str)
+        """
+        if not self.backend.available:
+            logger.error("Attempted analysis without API Key.")
+            return {"sentiment": "ERROR", "confidence": "None"}, "AI Summary Unavailable (No Key)"
+
+        cached_sentiment = self._cache_get("sentiment", text)
+        cached_summary = self._cache_get("summary", text)
+        if cached_sentiment is not None and cached_summary is not None:
+            return cached_sentiment, cached_summary
+
+        try:
+            logger.debug(f"Sending combined request to Gemini: {text[:50]}...")
+            response = await self._generate_async(
+                self._combined_prompt(text),
+                generation_config={
+                    "response_mime_type": "application/json",
+                    "response_schema": self.COMBINED_SCHEMA,
+                },
+            )
+            ai_result, summary = self._combined_from_response(response)
+        except Exception as e:
+            logger.warning(f"Combined analysis failed, falling back to two requests: {e}")
+            return await self._analyze_separately_async(text)
+
+        self._cache_set("sentiment", text, ai_result)
+        self._cache_set("summary", text, summary)
+        return ai_result, summary
+
+    async def analyze_async(self, text: str) -> tuple:
+        """
+        Async version of analyze.
+
+        Returns:
+            tuple: (sentiment dict, summary str)
+        """
+        fits_one_prompt = (len(text) <= self.summary_chunk_chars
+                           and estimate_tokens(text) <= self.sentiment_max_tokens)
+        if self.combined_prompt and fits_one_prompt:
+            return await self.analyze_all_async(text)
+        return await self._analyze_separately_async(text)
+
+    async def _analyze_separately_async(self, text: str) -> tuple:
+        """
+        Requests sentiment and summary for one text concurrently.
+
+        Returns:
+            tuple: (sentiment dict, summary str)
+        """
+        return tuple(await asyncio.gather(
+            self.analyze_sentiment_async(text),
+            self.generate_summary_async(text),
+        ))
+
+    async def analyze_many_async(self, texts: List[str]) -> List[tuple]:
+        """
+        Analyzes many texts with up to max_concurrency requests in flight.
+
+        Returns:
+            List[tuple]: (sentiment dict, summary str) per text, in input order.
+        """
+        return list(await asyncio.gather(*(self.analyze_async(text) for text in texts)))
@@ -1,8 +1,95 @@
-
 """
 Module for local text analysis.
-Provides the TextAnalyzer class to calculate basic statistics.
+Provides the TextAnalyzer class to calculate basic statistics, either on a
+whole string or incrementally over a stream of chunks.
 """
+from typing import Iterable
+
+# Characters str.splitlines() treats as line boundaries ("\r\n" counts once).
+LINE_BREAKS = ("\n", "\r", "\x0b", "\x0c", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class StreamCounter:
+    """
+    Accumulates word/char/line counts over consecutive chunks of text.
+
+    Only the counts and the first/last character seen are kept, so memory
+    stays bounded by the chunk size. Counters of adjacent segments can be
+    merged, which fixes up words and "\\r\\n" pairs split across the boundary.
+    """
+
+    def __init__(self):
+        self.words = 0
+        self.chars = 0
+        self.breaks = 0
+        self.crlf = 0
+        self.first_char = ""
+        self.last_char = ""
+
+    @classmethod
+    def from_chunk(cls, chunk: str) -> "StreamCounter":
+        """Counts a single chunk in isolation."""
+        counter = cls()
+        if not chunk:
+            return counter
+        counter.words = len(chunk.split())
+        counter.chars = len(chunk)
+        counter.crlf = chunk.count("\r\n")
+        counter.breaks = sum(chunk.count(c) for c in LINE_BREAKS) - counter.crlf
+        counter.first_char = chunk[0]
+        counter.last_char = chunk[-1]
+        return counter
+
+    def merge(self, other: "StreamCounter") -> "StreamCounter":
+        """
+        Appends the counts of the segment that directly follows this one.
+
+        Returns:
+            StreamCounter: self, to allow chaining.
+        """
+        if not other.chars:
+            return self
+        if not self.chars:
+            self.__dict__.update(other.__dict__)
+            return self
+
+        self.words += other.words
+        self.breaks += other.breaks
+        self.crlf += other.crlf
+        if not self.last_char.isspace() and not other.first_char.isspace():
+            # One word straddles the boundary and was counted on both sides.
+            self.words -= 1
+        if self.last_char == "\r" and other.first_char == "\n":
+            self.breaks -= 1
+            self.crlf += 1
+
+        self.chars += other.chars
+        self.last_char = other.last_char
+        return self
+
+    def update(self, chunk: str) -> None:
+        """Counts the next chunk of the stream."""
+        self.merge(StreamCounter.from_chunk(chunk))
+
+    def result(self, translate_newlines: bool = False) -> dict:
+        """
+        Returns the counts in the same shape as TextAnalyzer.analyze.
+
+        Args:
+            translate_newlines (bool): Count each "\\r\\n" as one character,
+                as reading the file in text mode would.
+        """
+        line_count = self.breaks
+        if self.chars and self.last_char not in LINE_BREAKS:
+            line_count += 1
+        return {
+            "word_count": self.words,
+            "char_count": self.chars - self.crlf if translate_newlines else self.chars,
+            "line_count": line_count
+        }
+
 
 class TextAnalyzer:
     """Class for performing local text analysis."""
@@ -34,3 +121,40 @@ class TextAnalyzer:
             "char_count": len(text),
             "line_count": len(lines)
         }
+
+    def analyze_stream(self, chunks: Iterable[str]) -> dict:
+        """
+        Calculates the same statistics as analyze over an iterable of chunks.
+
+        Chunks may split words or "\\r\\n" anywhere; the result equals
+        analyze("".join(chunks)) without ever holding the joined text.
+
+        Args:
+            chunks (Iterable[str]): Consecutive pieces of the text.
+
+        Returns:
+            dict: Same keys as analyze.
+        """
+        counter = StreamCounter()
+        for chunk in chunks:
+            counter.update(chunk)
+        return counter.result()
+
+    def analyze_file(self, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     encoding: str = "utf-8") -> dict:
+        """
+        Streams a text file in fixed-size chunks and calculates its statistics.
+
+        Peak memory is bounded by chunk_size regardless of the file size. The
+        result matches analyze(open(file_path).read()).
+
+        Args:
+            file_path (str): Path to the text file.
+            chunk_size (int): Number of characters read per chunk.
+            encoding (str): File encoding.
+
+        Returns:
+            dict: Same keys as analyze.
+        """
+        with open(file_path, "r", encoding=encoding) as f:
+            return self.analyze_stream(iter(lambda: f.read(chunk_size), ""))
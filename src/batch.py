@@ -0,0 +1,282 @@
+"""
+Module for batch analysis of many files.
+Provides the BatchRunner class: local analysis runs in a process pool, AI
+calls in a bounded thread pool, and results are committed to storage in
+groups with a checkpoint file so an interrupted run can resume.
+"""
+import glob
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Callable, List
+
+from src.analyzer import TextAnalyzer
+from src.chunking import estimate_tokens
+from src.storage import BaseStorage, build_analysis_record
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".txt", ".pdf")
+
+
+def discover_files(target: str) -> List[str]:
+    """
+    Finds the .txt/.pdf files to analyze.
+
+    Args:
+        target (str): A directory (searched recursively) or a glob pattern.
+
+    Returns:
+        List[str]: Sorted absolute paths of the matching files.
+    """
+    target = os.path.expanduser(target)
+    if os.path.isdir(target):
+        candidates = []
+        for root, _, files in os.walk(target):
+            candidates.extend(os.path.join(root, name) for name in files)
+    else:
+        candidates = glob.glob(target, recursive=True)
+
+    return sorted(
+        os.path.abspath(path) for path in candidates
+        if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS)
+    )
+
+
+def _load_and_analyze(file_path: str, pdf_cache_dir: str = None) -> tuple:
+    """
+    Reads one document and computes its local statistics.
+
+    Runs in a worker process, so the pool pays the import cost once per
+    worker instead of once per file.
+
+    Args:
+        file_path (str): Document to read.
+        pdf_cache_dir (str): PDFTextCache directory, or None to skip caching.
+
+    Returns:
+        tuple: (file_path, text, local_stats)
+    """
+    if file_path.lower().endswith(".pdf"):
+        # pypdf is only needed when the batch actually contains PDFs.
+        from src.pdf_cache import PDFTextCache
+        from src.pdf_utils import PDFProcessor
+        cache = PDFTextCache(pdf_cache_dir) if pdf_cache_dir else None
+        # The batch already runs one document per core, so extract in-process.
+        text = PDFProcessor(workers=1, cache=cache).extract_text(file_path)
+    else:
+        with open(file_path, "r", encoding="utf-8") as f:
+            text = f.read()
+    return file_path, text, TextAnalyzer().analyze(text)
+
+
+class BatchCheckpoint:
+    """Append-only log of files whose results are safely in storage."""
+
+    def __init__(self, path: str):
+        """
+        Initializes the checkpoint.
+
+        Args:
+            path (str): Path of the checkpoint JSON Lines file.
+        """
+        self.path = path
+        self._done = self._load()
+
+    @staticmethod
+    def fingerprint(file_path: str) -> str:
+        """Identifies a file version by path, size and modification time."""
+        stat = os.stat(file_path)
+        return f"{file_path}|{stat.st_size}|{stat.st_mtime_ns}"
+
+    def _load(self) -> set:
+        """Reads the fingerprints recorded by previous runs."""
+        done = set()
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["fingerprint"])
+                except (json.JSONDecodeError, KeyError):
+                    continue
+        return done
+
+    def is_done(self, file_path: str) -> bool:
+        """Checks whether this version of the file was already committed."""
+        return self.fingerprint(file_path) in self._done
+
+    def mark_done(self, entries: list) -> None:
+        """
+        Records committed files.
+
+        Args:
+            entries (list): (file_path, record_id) tuples.
+        """
+        lines = []
+        for file_path, record_id in entries:
+            fingerprint = self.fingerprint(file_path)
+            self._done.add(fingerprint)
+            lines.append(json.dumps({"fingerprint": fingerprint, "record_id": record_id}) + "\n")
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+
+
+class BatchRunner:
+    """Class to analyze many documents with bounded concurrency."""
+
+    def __init__(self, storage: BaseStorage, ai_client=None, workers: int = None,
+                 ai_concurrency: int = 4, commit_every: int = 50,
+                 max_in_flight: int = None, checkpoint_path: str = None,
+                 pdf_cache_dir: str = None, sentiment_only: bool = False):
+        """
+        Initializes the BatchRunner.
+
+        Args:
+            storage (BaseStorage): Storage engine receiving the records.
+            ai_client: Object exposing analyze(text) -> (sentiment, summary)
+                and, for sentiment_only runs, analyze_sentiment_batch(texts)
+                (normally a GeminiClient). None skips the AI step.
+            workers (int): Processes for local analysis. Defaults to the CPU count.
+            ai_concurrency (int): Maximum AI requests in flight.
+            commit_every (int): Records per grouped storage commit.
+            max_in_flight (int): Documents held in memory at once.
+            checkpoint_path (str): Checkpoint file. Defaults to the data dir.
+            pdf_cache_dir (str): PDFTextCache directory shared by the workers.
+            sentiment_only (bool): Skip summaries and pack many documents
+                into each sentiment request.
+        """
+        self.storage = storage
+        self.ai_client = ai_client
+        self.workers = workers or os.cpu_count() or 1
+        self.ai_concurrency = max(1, ai_concurrency)
+        self.commit_every = max(1, commit_every)
+        self.max_in_flight = max_in_flight or (self.workers + self.ai_concurrency) * 2
+        self.pdf_cache_dir = pdf_cache_dir
+        self.sentiment_only = sentiment_only and ai_client is not None
+        self.checkpoint = BatchCheckpoint(
+            checkpoint_path or os.path.join(storage.data_dir, "batch_checkpoint.jsonl")
+        )
+
+    def _ai_analyze(self, file_path: str, text: str, local_stats: dict) -> list:
+        """Runs the AI step for one document (in the AI thread pool)."""
+        ai_result = {"sentiment": "SKIPPED", "confidence": "None"}
+        summary = "N/A"
+        if self.ai_client is not None:
+            ai_result, summary = self.ai_client.analyze(text)
+        return [(file_path, build_analysis_record(text, summary, local_stats, ai_result))]
+
+    def _ai_sentiment_group(self, documents: list) -> list:
+        """Runs one packed sentiment request for a group of documents."""
+        results = self.ai_client.analyze_sentiment_batch([text for _, text, _ in documents])
+        return [
+            (file_path, build_analysis_record(text, "N/A", local_stats, ai_result))
+            for (file_path, text, local_stats), ai_result in zip(documents, results)
+        ]
+
+    def _group_ready(self, group: list) -> bool:
+        """Checks whether a sentiment group has reached the client's token budget."""
+        tokens = sum(estimate_tokens(text) for _, text, _ in group)
+        return tokens >= self.ai_client.batch_token_budget or len(group) >= self.ai_client.batch_max_items
+
+    def run(self, target: str, on_progress: Callable[[int, int], None] = None) -> dict:
+        """
+        Analyzes every .txt/.pdf file matched by target.
+
+        Files recorded in the checkpoint are skipped, so re-running the same
+        command after a crash picks up where the last grouped commit ended.
+
+        Args:
+            target (str): Directory or glob pattern.
+            on_progress (Callable[[int, int], None]): Called with
+                (processed, total) after each document finishes.
+
+        Returns:
+            dict: Run summary with counts, elapsed seconds, docs/s and MB/s.
+        """
+        files = discover_files(target)
+        pending_files = [path for path in files if not self.checkpoint.is_done(path)]
+        summary = {
+            "found": len(files),
+            "skipped": len(files) - len(pending_files),
+            "processed": 0,
+            "failed": 0,
+            "bytes": 0,
+        }
+        start = time.perf_counter()
+        buffer = []
+        sentiment_group = []
+        file_iter = iter(pending_files)
+
+        def flush():
+            if not buffer:
+                return
+            ids = self.storage.save_many([record for _, record in buffer])
+            self.checkpoint.mark_done([(path, record_id) for (path, _), record_id in zip(buffer, ids)])
+            buffer.clear()
+
+        def report():
+            if on_progress:
+                on_progress(summary["processed"] + summary["failed"], len(pending_files))
+
+        with ProcessPoolExecutor(max_workers=self.workers) as local_pool, \
+                ThreadPoolExecutor(max_workers=self.ai_concurrency) as ai_pool:
+            in_flight = {}
+
+            def refill():
+                while len(in_flight) + len(sentiment_group) < self.max_in_flight:
+                    path = next(file_iter, None)
+                    if path is None:
+                        return
+                    future = local_pool.submit(_load_and_analyze, path, self.pdf_cache_dir)
+                    in_flight[future] = ("local", [path])
+
+            def submit_sentiment_group():
+                future = ai_pool.submit(self._ai_sentiment_group, list(sentiment_group))
+                in_flight[future] = ("ai", [path for path, _, _ in sentiment_group])
+                sentiment_group.clear()
+
+            refill()
+            while in_flight or sentiment_group:
+                if sentiment_group and not any(stage == "local" for stage, _ in in_flight.values()):
+                    # Nothing left to grow the group with, send what we have.
+                    submit_sentiment_group()
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, paths = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Batch {stage} step failed for {', '.join(paths)}: {e}")
+                        summary["failed"] += len(paths)
+                        report()
+                        continue
+
+                    if stage == "local":
+                        summary["bytes"] += os.path.getsize(paths[0])
+                        if self.sentiment_only:
+                            sentiment_group.append(result)
+                            if self._group_ready(sentiment_group):
+                                submit_sentiment_group()
+                        else:
+                            in_flight[ai_pool.submit(self._ai_analyze, *result)] = ("ai", paths)
+                        continue
+
+                    buffer.extend(result)
+                    summary["processed"] += len(result)
+                    if len(buffer) >= self.commit_every:
+                        flush()
+                    report()
+                refill()
+
+        flush()
+
+        elapsed = time.perf_counter() - start
+        summary["elapsed"] = elapsed
+        summary["docs_per_sec"] = summary["processed"] / elapsed if elapsed else 0.0
+        summary["mb_per_sec"] = summary["bytes"] / (1024 * 1024) / elapsed if elapsed else 0.0
+        logger.info(f"Batch finished: {summary}")
+        return summary
@@ -0,0 +1,72 @@
+"""
+Module for storing document bodies via BlobStore class.
+Texts are saved once per distinct content, zlib-compressed, under their
+SHA-256 digest, so records only need to carry the digest.
+"""
+import hashlib
+import logging
+import os
+import zlib
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text: str) -> str:
+    """Returns the SHA-256 hex digest used to identify a document's content."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+class BlobStore:
+    """Class to keep compressed, deduplicated texts addressed by content hash."""
+
+    def __init__(self, directory: str, compression_level: int = 6):
+        """
+        Initializes the BlobStore.
+
+        Args:
+            directory (str): Root directory of the blobs.
+            compression_level (int): zlib level (1 fastest - 9 smallest).
+        """
+        self.directory = directory
+        self.compression_level = compression_level
+
+    def _path(self, digest: str) -> str:
+        """Returns the file path of a blob (fanned out by the first two hex digits)."""
+        return os.path.join(self.directory, digest[:2], digest[2:] + ".z")
+
+    def __contains__(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def put(self, text: str) -> str:
+        """
+        Stores a text unless an identical one is already stored.
+
+        Returns:
+            str: The content hash that references the text.
+        """
+        digest = content_hash(text)
+        path = self._path(digest)
+        if os.path.exists(path):
+            return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(zlib.compress((text or "").encode("utf-8"), self.compression_level))
+        # Atomic, so a reader never sees a half-written blob.
+        os.replace(temp_path, path)
+        logger.debug(f"Stored blob {digest[:12]}")
+        return digest
+
+    def get(self, digest: str) -> str:
+        """
+        Loads a stored text.
+
+        Raises:
+            KeyError: If no blob has this digest.
+        """
+        try:
+            with open(self._path(digest), "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        except FileNotFoundError:
+            raise KeyError(digest) from None
@@ -0,0 +1,113 @@
+"""
+Module with helpers for sizing AI requests.
+Provides a cheap token estimate, budget-based packing of texts into groups
+and splitting of long documents into chunks on page/paragraph boundaries.
+"""
+import re
+import zlib
+from typing import Callable, Iterable, List
+
+# Gemini tokens average roughly four characters of English text.
+CHARS_PER_TOKEN = 4
+
+# Form feeds separate PDF pages; blank lines separate paragraphs.
+_BLOCK_SEPARATOR = re.compile(r"\f|\n[ \t]*\n")
+
+# On average one paragraph in this many closes a chunk early (see split_into_chunks).
+_BOUNDARY_DIVISOR = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimates the number of tokens a text will use in a prompt."""
+    return len(text or "") // CHARS_PER_TOKEN + 1
+
+
+def pack_by_budget(items: Iterable, budget: int, cost: Callable = estimate_tokens,
+                   max_items: int = None) -> List[list]:
+    """
+    Greedily packs items into consecutive groups under a cost budget.
+
+    An item whose own cost exceeds the budget gets a group of its own.
+
+    Args:
+        items (Iterable): Items to pack, kept in order.
+        budget (int): Maximum total cost per group.
+        cost (Callable): Returns the cost of one item.
+        max_items (int): Optional cap on items per group.
+
+    Returns:
+        List[list]: The groups.
+    """
+    groups = []
+    current = []
+    current_cost = 0
+    for item in items:
+        item_cost = cost(item)
+        full = max_items is not None and len(current) >= max_items
+        if current and (full or current_cost + item_cost > budget):
+            groups.append(current)
+            current = []
+            current_cost = 0
+        current.append(item)
+        current_cost += item_cost
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _split_blocks(text: str, max_chars: int) -> List[str]:
+    """Splits text into pages/paragraphs, hard-wrapping any longer than max_chars."""
+    blocks = []
+    for block in _BLOCK_SEPARATOR.split(text):
+        block = block.strip()
+        while len(block) > max_chars:
+            cut = block.rfind("\n", 0, max_chars)
+            if cut <= 0:
+                cut = block.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            blocks.append(block[:cut].strip())
+            block = block[cut:].strip()
+        if block:
+            blocks.append(block)
+    return blocks
+
+
+def split_into_chunks(text: str, max_chars: int = 8000, min_chars: int = 2000) -> List[str]:
+    """
+    Splits a long document into chunks on page and paragraph boundaries.
+
+    Boundaries are content-defined: once a chunk holds min_chars, it is
+    closed after any paragraph whose checksum hits a fixed pattern (or when
+    max_chars would be exceeded). An edit therefore only changes the chunks
+    around it, and the chunks after it come out identical, which keeps
+    per-chunk caches useful across document revisions.
+
+    Args:
+        text (str): The document.
+        max_chars (int): Upper bound on chunk length.
+        min_chars (int): Chunks are not closed early below this length.
+
+    Returns:
+        List[str]: The chunks, in document order.
+    """
+    chunks = []
+    current = []
+    current_len = 0
+    for block in _split_blocks(text, max_chars):
+        if current and current_len + len(block) + 2 > max_chars:
+            chunks.append("\n\n".join(current))
+            current = []
+            current_len = 0
+
+        current.append(block)
+        current_len += len(block) + 2
+
+        if current_len >= min_chars and zlib.crc32(block.encode("utf-8")) % _BOUNDARY_DIVISOR == 0:
+            chunks.append("\n\n".join(current))
+            current = []
+            current_len = 0
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
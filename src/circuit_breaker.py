@@ -0,0 +1,70 @@
+"""
+Module for the CircuitBreaker class.
+Stops calling a failing service after repeated errors and lets a single trial
+request through once a cool-down has passed.
+"""
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Class to track consecutive failures of a remote service."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = None, reset_timeout: float = None):
+        """
+        Initializes the CircuitBreaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the
+                circuit. Defaults to AI_BREAKER_FAILURES from env, then 5.
+            reset_timeout (float): Seconds the circuit stays open before a
+                trial request. Defaults to AI_BREAKER_RESET_SECONDS, then 30.
+        """
+        self.failure_threshold = failure_threshold or int(os.getenv("AI_BREAKER_FAILURES", "5"))
+        self.reset_timeout = reset_timeout or float(os.getenv("AI_BREAKER_RESET_SECONDS", "30"))
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Checks whether a request may be sent.
+
+        While open, returns False until reset_timeout has passed; then one
+        caller gets True (half-open) and the others keep getting False until
+        that trial is recorded.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Closes the circuit."""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("AI circuit closed again.")
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Counts a failure; opens the circuit at the threshold or on a failed trial."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"AI circuit opened after {self.failures} consecutive failures.")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
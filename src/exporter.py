@@ -1,16 +1,70 @@
 
 """
 Module for exporting analysis data via ReportExporter class.
+CSV, Markdown, Parquet and Arrow exports stream records from any iterable
+(such as a storage cursor), so memory use does not grow with the size of the
+history. pyarrow is only imported by the columnar exports, and gspread by
+the Google Sheets export.
 """
 import csv
+import gzip
+import itertools
 import logging
 import os
+import time
 from datetime import datetime
-from typing import List, Dict
-import gspread
+from typing import Callable, Dict, Iterable, List
 
 logger = logging.getLogger(__name__)
 
+# Rows written between two progress callbacks.
+PROGRESS_EVERY = 1000
+
+# Arrow type of each known record field in columnar exports; others are strings.
+COLUMN_TYPES = {
+    "id": "string",
+    "timestamp": "timestamp",
+    "sentiment": "category",
+    "confidence": "category",
+    "word_count": "int64",
+    "char_count": "int64",
+    "line_count": "int64",
+    "text": "string",
+    "summary": "string",
+    "content_hash": "string",
+    "full_text": "string",
+}
+COLUMNAR_DEFAULT_COLUMNS = [name for name in COLUMN_TYPES if name != "full_text"]
+
+# Rows per Arrow record batch (and Parquet row group).
+COLUMNAR_BATCH_ROWS = 10000
+
+
+def _import_pyarrow():
+    """Imports pyarrow, which only the columnar exports need."""
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Parquet/Arrow export requires pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def _parse_timestamp(value):
+    """Parses an ISO timestamp, or returns None if it is missing or malformed."""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_int(value):
+    """Converts a count to int, or returns None if it is missing or malformed."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 class ReportExporter:
     """Class to handle exporting data to various formats."""
 
@@ -29,45 +83,97 @@ class ReportExporter:
         if not os.path.exists(self.export_dir):
             os.makedirs(self.export_dir)
 
-    def to_csv(self, data: List[Dict], filename: str = "export_history.csv") -> str:
+    def _open_output(self, filename: str, compress: bool):
         """
-        Exports a list of analysis records to a CSV file.
+        Opens an export file for text writing, gzip-compressed if asked.
+
+        Returns:
+            tuple: (file path, open file object)
         """
-        if not data:
+        if compress and not filename.endswith(".gz"):
+            filename += ".gz"
+        filepath = os.path.join(self.export_dir, filename)
+        if compress:
+            return filepath, gzip.open(filepath, "wt", newline="", encoding="utf-8")
+        return filepath, open(filepath, "w", newline="", encoding="utf-8")
+
+    @staticmethod
+    def _log_throughput(count: int, filepath: str, start: float) -> None:
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        size_mb = os.path.getsize(filepath) / (1024 * 1024)
+        logger.info(f"Exported {count} records to {filepath} in {elapsed:.1f}s "
+                    f"({count / elapsed:.0f} records/s, {size_mb / elapsed:.1f} MB/s)")
+
+    def to_csv(self, data: Iterable[Dict], filename: str = "export_history.csv",
+               columns: List[str] = None, compress: bool = False,
+               progress: Callable[[int], None] = None) -> str:
+        """
+        Exports analysis records to a CSV file, one row at a time.
+
+        Args:
+            data (Iterable[Dict]): Records; any iterable, e.g. a storage cursor.
+            filename (str): Name of the file in the export directory.
+            columns (List[str]): Columns to write. Defaults to the keys of the
+                first record, without full_text. Other keys are ignored.
+            compress (bool): Write gzip (".gz" is appended to filename).
+            progress (Callable[[int], None]): Called with the number of rows
+                written so far, every PROGRESS_EVERY rows and at the end.
+        """
+        records = iter(data)
+        first = next(records, None)
+        if first is None:
             logger.warning("No data to export.")
             return ""
-            
-        filepath = os.path.join(self.export_dir, filename)
 
+        if columns is None:
+            columns = [key for key in first if key != "full_text"]
+
+        start = time.perf_counter()
+        filepath, csvfile = self._open_output(filename, compress)
+        count = 0
         try:
-            fieldnames = list(data[0].keys())
-            
-            with open(filepath, mode='w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            with csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=columns, extrasaction="ignore")
                 writer.writeheader()
-                writer.writerows(data)
-                
-            logger.info(f"Exported {len(data)} records to {filepath}")
+                for record in itertools.chain((first,), records):
+                    writer.writerow(record)
+                    count += 1
+                    if progress and count % PROGRESS_EVERY == 0:
+                        progress(count)
+            if progress:
+                progress(count)
+
+            self._log_throughput(count, filepath, start)
             return os.path.abspath(filepath)
         except Exception as e:
             logger.error(f"CSV export failed: {e}")
             raise e
 
-    def to_markdown(self, data: List[Dict], filename: str = "export_history.md") -> str:
+    def to_markdown(self, data: Iterable[Dict], filename: str = "export_history.md",
+                    compress: bool = False, progress: Callable[[int], None] = None) -> str:
         """
-        Exports a list of analysis records to a Markdown file.
+        Exports analysis records to a Markdown file, one section at a time.
+
+        Args:
+            data (Iterable[Dict]): Records; any iterable, e.g. a storage cursor.
+            filename (str): Name of the file in the export directory.
+            compress (bool): Write gzip (".gz" is appended to filename).
+            progress (Callable[[int], None]): As in to_csv.
         """
-        if not data:
+        records = iter(data)
+        first = next(records, None)
+        if first is None:
             return ""
-            
-        filepath = os.path.join(self.export_dir, filename)
 
+        start = time.perf_counter()
+        filepath, f = self._open_output(filename, compress)
+        count = 0
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
+            with f:
                 f.write("# Analysis History Export\n\n")
                 f.write(f"Generated on: {datetime.now().isoformat()}\n\n")
                 
-                for record in data:
+                for record in itertools.chain((first,), records):
                     f.write(f"## ID: {record.get('id', 'N/A')}\n")
                     f.write(f"**Date:** {record.get('timestamp')}\n\n")
                     f.write(f"**Sentiment:** {record.get('sentiment')} ({record.get('confidence')})\n")
@@ -77,13 +183,143 @@ class ReportExporter:
                     f.write("### Text Snippet\n")
                     f.write(f"> {text_snippet}\n\n")
                     f.write("---\n\n")
-                    
-            logger.info(f"Exported {len(data)} records to {filepath}")
+                    count += 1
+                    if progress and count % PROGRESS_EVERY == 0:
+                        progress(count)
+            if progress:
+                progress(count)
+
+            self._log_throughput(count, filepath, start)
             return os.path.abspath(filepath)
         except Exception as e:
             logger.error(f"Markdown export failed: {e}")
             raise e
 
+    @staticmethod
+    def _arrow_schema(pa, columns: List[str]):
+        """Builds the typed Arrow schema of the selected columns."""
+        types = {
+            "string": pa.string(),
+            "int64": pa.int64(),
+            "timestamp": pa.timestamp("us"),
+            # Few distinct values: stored once, rows keep small integer codes.
+            "category": pa.dictionary(pa.int32(), pa.string()),
+        }
+        return pa.schema([(name, types[COLUMN_TYPES.get(name, "string")]) for name in columns])
+
+    @staticmethod
+    def _record_batches(pa, schema, records: Iterable[Dict], batch_rows: int,
+                        progress: Callable[[int], None] = None):
+        """
+        Converts records to typed Arrow record batches of batch_rows rows.
+
+        Dictionary columns share one growing dictionary across batches, so
+        writers only need to emit the new values (deltas).
+        """
+        records = iter(records)
+        dictionaries = {field.name: {} for field in schema if pa.types.is_dictionary(field.type)}
+        count = 0
+        while True:
+            chunk = list(itertools.islice(records, batch_rows))
+            if not chunk:
+                return
+            arrays = []
+            for field in schema:
+                values = [record.get(field.name) for record in chunk]
+                if field.name in dictionaries:
+                    codes = dictionaries[field.name]
+                    indices = [None if v is None else codes.setdefault(str(v), len(codes)) for v in values]
+                    arrays.append(pa.DictionaryArray.from_arrays(
+                        pa.array(indices, pa.int32()), pa.array(list(codes), pa.string())))
+                elif pa.types.is_timestamp(field.type):
+                    arrays.append(pa.array([_parse_timestamp(v) for v in values], field.type))
+                elif pa.types.is_integer(field.type):
+                    arrays.append(pa.array([_parse_int(v) for v in values], field.type))
+                else:
+                    arrays.append(pa.array([None if v is None else str(v) for v in values], field.type))
+            yield pa.record_batch(arrays, schema=schema)
+            count += len(chunk)
+            if progress:
+                progress(count)
+
+    def _to_columnar(self, data: Iterable[Dict], filename: str, columns: List[str], fmt: str,
+                     batch_rows: int, progress: Callable[[int], None]) -> str:
+        """Writes records as Parquet or Arrow IPC, one record batch at a time."""
+        pa = _import_pyarrow()
+        records = iter(data)
+        first = next(records, None)
+        if first is None:
+            logger.warning("No data to export.")
+            return ""
+
+        schema = self._arrow_schema(pa, list(columns or COLUMNAR_DEFAULT_COLUMNS))
+        filepath = os.path.join(self.export_dir, filename)
+        start = time.perf_counter()
+        count = 0
+
+        def counted(done: int):
+            nonlocal count
+            count = done
+            if progress:
+                progress(done)
+
+        batches = self._record_batches(pa, schema, itertools.chain((first,), records), batch_rows, counted)
+        try:
+            if fmt == "parquet":
+                import pyarrow.parquet as pq
+                with pq.ParquetWriter(filepath, schema, compression="zstd") as writer:
+                    for batch in batches:
+                        writer.write_batch(batch)
+            else:
+                import pyarrow.ipc as ipc
+                options = ipc.IpcWriteOptions(compression="zstd", emit_dictionary_deltas=True)
+                with ipc.new_file(filepath, schema, options=options) as writer:
+                    for batch in batches:
+                        writer.write_batch(batch)
+
+            self._log_throughput(count, filepath, start)
+            return os.path.abspath(filepath)
+        except Exception as e:
+            logger.error(f"{fmt.capitalize()} export failed: {e}")
+            raise e
+
+    def to_parquet(self, data: Iterable[Dict], filename: str = "export_history.parquet",
+                   columns: List[str] = None, batch_rows: int = COLUMNAR_BATCH_ROWS,
+                   progress: Callable[[int], None] = None) -> str:
+        """
+        Exports analysis records to a zstd-compressed Parquet file.
+
+        Columns are typed (counts as int64, timestamp as timestamp[us],
+        sentiment and confidence dictionary-encoded) and written in record
+        batches of batch_rows rows, so memory use is bounded by one batch.
+
+        Args:
+            data (Iterable[Dict]): Records; any iterable, e.g. a storage cursor.
+            filename (str): Name of the file in the export directory.
+            columns (List[str]): Columns to write. Defaults to every known
+                field except full_text.
+            batch_rows (int): Rows per record batch (Parquet row group).
+            progress (Callable[[int], None]): Called with the number of rows
+                written after each batch.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        return self._to_columnar(data, filename, columns, "parquet", batch_rows, progress)
+
+    def to_arrow(self, data: Iterable[Dict], filename: str = "export_history.arrow",
+                 columns: List[str] = None, batch_rows: int = COLUMNAR_BATCH_ROWS,
+                 progress: Callable[[int], None] = None) -> str:
+        """
+        Exports analysis records to an Arrow IPC (Feather v2) file.
+
+        Same typing, batching and arguments as to_parquet.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        return self._to_columnar(data, filename, columns, "arrow", batch_rows, progress)
+
     def to_google_sheet(self, data: List[Dict], sheet_name: str, credentials_path: str = None) -> str:
         """
         Exports data to a Google Sheet.
@@ -97,6 +333,8 @@ class ReportExporter:
         if not os.path.exists(credentials_path):
             raise FileNotFoundError(f"Credentials file not found at: {credentials_path}. See GOOGLE_SETUP.md")
 
+        import gspread
+
         try:
             gc = gspread.service_account(filename=credentials_path)
             
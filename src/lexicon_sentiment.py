@@ -0,0 +1,175 @@
+"""
+Module for offline sentiment scoring via LexiconSentimentAnalyzer class.
+Texts are tokenized once and scored against a precompiled word lexicon, with
+negation and intensifier handling, without any network request.
+"""
+import bisect
+import logging
+import math
+import os
+import re
+from itertools import compress, repeat
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Built-in English lexicon, grouped by polarity weight.
+_LEXICON_GROUPS = {
+    3.0: "excellent outstanding amazing fantastic superb wonderful brilliant perfect love loved "
+         "loves exceptional incredible magnificent delightful marvelous flawless",
+    2.0: "good great happy pleased enjoy enjoyed enjoying enjoyable nice beautiful best better "
+         "impressive impressed recommend recommended glad satisfied satisfying awesome lovely "
+         "positive success successful favorite pleasant reliable helpful friendly effective "
+         "efficient strong win winning valuable excited exciting thank thanks grateful fun",
+    1.0: "fine ok okay decent fair like liked likes useful clean clear smooth solid comfortable "
+         "calm improve improved improvement supported safe stable correct works working hope "
+         "hopeful agree easy fast benefit interesting",
+    -1.0: "slow problem problems issue issues difficult hard confusing confused unclear late "
+          "lacking lack limited mediocre boring odd weird doubt concern concerned risk "
+          "unfortunately complicated",
+    -2.0: "bad poor sad angry annoyed annoying disappointed disappointing disappointment unhappy "
+          "wrong broken fail failed fails failure error errors bug bugs buggy worse expensive "
+          "useless unreliable ugly rude negative frustrating frustrated weak loss lose losing "
+          "complaint complain crash crashed waste wasted",
+    -3.0: "terrible awful horrible worst hate hated hates disgusting dreadful abysmal pathetic "
+          "atrocious disaster unacceptable furious nightmare garbage",
+}
+
+DEFAULT_LEXICON = {word: weight for weight, words in _LEXICON_GROUPS.items() for word in words.split()}
+
+NEGATORS = frozenset((
+    "not no never none nobody nothing neither nor without hardly barely cannot "
+    "dont doesnt didnt isnt arent wasnt werent wont wouldnt cant couldnt shouldnt hasnt havent"
+).split())
+
+INTENSIFIERS = {
+    "very": 1.5, "really": 1.5, "extremely": 1.8, "incredibly": 1.8, "absolutely": 1.8,
+    "highly": 1.5, "totally": 1.5, "completely": 1.5, "so": 1.3, "too": 1.3, "quite": 1.2,
+    "slightly": 0.5, "somewhat": 0.5, "kinda": 0.5,
+}
+
+# Clause boundaries: negation does not reach past these.
+BOUNDARIES = frozenset(".,;:!?") | {"but"}
+
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?|[.,;:!?]")
+
+# A negated word keeps part of its weight with the opposite sign.
+NEGATION_SCALAR = -0.74
+# Normalization constant of the compound score (as in VADER).
+NORMALIZATION_ALPHA = 15.0
+
+
+def load_lexicon(path: str) -> Dict[str, float]:
+    """
+    Loads extra lexicon entries from a "word<TAB>weight" file.
+
+    Blank lines and lines starting with '#' are ignored.
+    """
+    lexicon = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            word, weight = line.split("\t")[:2]
+            lexicon[word.lower()] = float(weight)
+    return lexicon
+
+
+class LexiconSentimentAnalyzer:
+    """Class to score sentiment locally from a word lexicon."""
+
+    def __init__(self, lexicon: Dict[str, float] = None, negation_window: int = 3):
+        """
+        Initializes the LexiconSentimentAnalyzer.
+
+        Args:
+            lexicon (Dict[str, float]): Word weights. Defaults to the built-in
+                lexicon, extended by SENTIMENT_LEXICON_PATH from env if set.
+            negation_window (int): Tokens after a negator that get flipped.
+        """
+        if lexicon is None:
+            lexicon = dict(DEFAULT_LEXICON)
+            extra_path = os.getenv("SENTIMENT_LEXICON_PATH")
+            if extra_path:
+                lexicon.update(load_lexicon(extra_path))
+        self.negation_window = negation_window
+        # Contractions are matched without the apostrophe ("don't" -> "dont").
+        self._weights = {word.replace("'", ""): weight for word, weight in lexicon.items()}
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Lowercases and splits text into words and clause punctuation."""
+        text = text.lower().replace("’", "'")
+        return [token.replace("'", "") for token in TOKEN_PATTERN.findall(text)]
+
+    def score(self, text: str) -> tuple:
+        """
+        Scores one text.
+
+        Lookups run over the whole token array at once (map/compress);
+        Python-level work is proportional to the number of sentiment words
+        and negators, not to the length of the text.
+
+        Returns:
+            tuple: (compound score in [-1, 1], positive mass, negative mass,
+            number of sentiment words)
+        """
+        tokens = self.tokenize(text)
+        scores = list(map(self._weights.get, tokens, repeat(0.0)))
+        hits = list(compress(range(len(tokens)), scores))
+        if not hits:
+            return 0.0, 0.0, 0.0, 0
+
+        for i in hits:
+            if i and tokens[i - 1] in INTENSIFIERS:
+                scores[i] *= INTENSIFIERS[tokens[i - 1]]
+
+        boundaries = list(compress(range(len(tokens)), map(BOUNDARIES.__contains__, tokens)))
+        flipped = set()
+        for j in compress(range(len(tokens)), map(NEGATORS.__contains__, tokens)):
+            next_boundary = bisect.bisect_right(boundaries, j)
+            end = j + 1 + self.negation_window
+            if next_boundary < len(boundaries):
+                end = min(end, boundaries[next_boundary])
+            for k in range(bisect.bisect_right(hits, j), bisect.bisect_left(hits, end)):
+                if hits[k] not in flipped:
+                    flipped.add(hits[k])
+                    scores[hits[k]] *= NEGATION_SCALAR
+
+        hit_scores = [scores[i] for i in hits]
+        positive = sum(s for s in hit_scores if s > 0)
+        negative = -sum(s for s in hit_scores if s < 0)
+        # Dividing by sqrt(hits) keeps long documents from saturating.
+        total = (positive - negative) / math.sqrt(len(hits))
+        compound = total / math.sqrt(total * total + NORMALIZATION_ALPHA)
+        return compound, positive, negative, len(hits)
+
+    def analyze(self, text: str) -> dict:
+        """
+        Classifies the sentiment of a text.
+
+        Returns:
+            dict: {"sentiment": POSITIVE/NEGATIVE/NEUTRAL, "confidence": HIGH/MEDIUM/LOW}
+        """
+        compound, positive, negative, hits = self.score(text)
+        if compound >= 0.05:
+            sentiment = "POSITIVE"
+        elif compound <= -0.05:
+            sentiment = "NEGATIVE"
+        else:
+            sentiment = "NEUTRAL"
+
+        agreement = max(positive, negative) / (positive + negative) if hits else 0.0
+        strength = abs(compound)
+        if hits >= 2 and strength >= 0.5 and agreement >= 0.8:
+            confidence = "HIGH"
+        elif strength >= 0.25 and agreement >= 0.6:
+            confidence = "MEDIUM"
+        else:
+            confidence = "LOW"
+        return {"sentiment": sentiment, "confidence": confidence}
+
+    def analyze_many(self, texts: List[str]) -> List[dict]:
+        """Classifies many texts, in input order."""
+        return [self.analyze(text) for text in texts]
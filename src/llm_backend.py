@@ -0,0 +1,235 @@
+"""
+Module for the model backends used by GeminiClient.
+Each backend keeps one reusable model instance and exposes a single async
+generate() call. GeminiBackend talks to the Gemini API; FakeBackend answers
+locally with configurable latency, error rate and throttling, so the whole
+pipeline can be load-tested offline and reproducibly.
+"""
+import asyncio
+import collections
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("gemini", "fake")
+
+
+class LLMBackend:
+    """Base class for model backends."""
+
+    # False when the backend cannot send requests (e.g. no API key).
+    available = True
+
+    def __init__(self, reuse_model: bool = True):
+        """
+        Initializes the backend.
+
+        Args:
+            reuse_model (bool): Keep one model instance for every request.
+                False builds a new one per request.
+        """
+        self.reuse_model = reuse_model
+        self.models_created = 0
+        self._model = None
+
+    def _create_model(self):
+        """Builds a model instance."""
+        raise NotImplementedError
+
+    def model(self):
+        """Returns the shared model instance, building it on first use."""
+        if self._model is None or not self.reuse_model:
+            self._model = self._create_model()
+            self.models_created += 1
+        return self._model
+
+    async def generate(self, prompt: str, generation_config: dict = None):
+        """
+        Sends one prompt.
+
+        Returns:
+            A response with .text and .prompt_feedback.block_reason.
+        """
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    """Backend calling Gemini through google.generativeai."""
+
+    def __init__(self, api_key: str = None, model_name: str = "gemini-flash-latest",
+                 reuse_model: bool = True):
+        """
+        Initializes the GeminiBackend.
+
+        Args:
+            api_key (str): The Gemini API Key.
+            model_name (str): The model to use.
+            reuse_model (bool): Keep one GenerativeModel for every request.
+        """
+        super().__init__(reuse_model)
+        import google.generativeai as genai
+
+        self._genai = genai
+        self.model_name = model_name
+        self.available = bool(api_key)
+        if not api_key:
+            logger.warning("GEMINI_API_KEY not found.")
+        else:
+            genai.configure(api_key=api_key)
+
+    def _create_model(self):
+        """Builds a GenerativeModel."""
+        return self._genai.GenerativeModel(self.model_name)
+
+    async def generate(self, prompt: str, generation_config: dict = None):
+        """Sends one prompt to Gemini."""
+        return await self.model().generate_content_async(prompt, generation_config=generation_config)
+
+
+class FakeAPIError(Exception):
+    """Error raised by FakeBackend; carries an HTTP status in .code like google.api_core errors."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FakeBackend(LLMBackend):
+    """
+    Local stand-in for Gemini.
+
+    Replies are derived from a checksum of the prompt, so the same input
+    always gets the same answer. Sentiment, combined and batched prompts get
+    well-formed JSON; anything else gets a plain-text "summary".
+    """
+
+    SENTIMENTS = ("POSITIVE", "NEGATIVE", "NEUTRAL")
+    CONFIDENCES = ("HIGH", "MEDIUM", "LOW")
+    # Payload between the quotes of '...: '{text}'.\n' prompts.
+    PAYLOAD_PATTERN = re.compile(r"'(.*)'\.\n", re.DOTALL)
+    BATCH_ITEM_PATTERN = re.compile(r"^\[(\d+)\] '", re.MULTILINE)
+
+    def __init__(self, latency: float = 0.2, error_rate: float = 0.0, requests_per_minute: int = 0,
+                 model_init_latency: float = 0.0, seed: int = 0, reuse_model: bool = True):
+        """
+        Initializes the FakeBackend.
+
+        Args:
+            latency (float): Seconds each request takes.
+            error_rate (float): Share of requests failing with a 503.
+            requests_per_minute (int): Requests above this rate, over a sliding
+                minute, fail with a 429. 0 disables throttling.
+            model_init_latency (float): Seconds spent building a model
+                instance, to measure what reusing it saves.
+            seed (int): Seed of the error draws.
+            reuse_model (bool): Keep one model instance for every request.
+        """
+        super().__init__(reuse_model)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests_per_minute = requests_per_minute
+        self.model_init_latency = model_init_latency
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._recent = collections.deque()
+        self._lock = threading.Lock()
+
+    def _create_model(self):
+        """Simulates a blocking model constructor."""
+        if self.model_init_latency:
+            time.sleep(self.model_init_latency)
+        return object()
+
+    def _admit(self) -> None:
+        """
+        Applies throttling and random failures to one request.
+
+        Raises:
+            FakeAPIError: 429 when over the rate, 503 for injected errors.
+        """
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            if self.requests_per_minute:
+                while self._recent and now - self._recent[0] >= 60:
+                    self._recent.popleft()
+                if len(self._recent) >= self.requests_per_minute:
+                    raise FakeAPIError(429, "Resource has been exhausted (fake quota)")
+                self._recent.append(now)
+            if self.error_rate and self._random.random() < self.error_rate:
+                raise FakeAPIError(503, "Service unavailable (injected)")
+
+    @classmethod
+    def _verdict(cls, text: str) -> dict:
+        """Deterministic sentiment for a text."""
+        digest = zlib.crc32(text.encode("utf-8"))
+        return {"sentiment": cls.SENTIMENTS[digest % 3], "confidence": cls.CONFIDENCES[(digest // 3) % 3]}
+
+    @staticmethod
+    def _summary(text: str) -> str:
+        """Plain-text stand-in for a summary: the first words of the text."""
+        words = text.split()
+        return " ".join(words[:30]) + ("..." if len(words) > 30 else "")
+
+    def _reply(self, prompt: str, generation_config: dict = None) -> str:
+        """Builds the reply text the real model would be asked for."""
+        match = self.PAYLOAD_PATTERN.search(prompt)
+        payload = match.group(1) if match else prompt
+        schema = (generation_config or {}).get("response_schema") or {}
+
+        if schema.get("type") == "array":
+            items = self.BATCH_ITEM_PATTERN.split(prompt)[2::2]
+            texts = [item.rstrip()[:-1] for item in items]
+            return json.dumps([dict(index=i, **self._verdict(text)) for i, text in enumerate(texts)])
+        if schema.get("type") == "object":
+            return json.dumps(dict(self._verdict(payload), summary=self._summary(payload)))
+        if prompt.startswith("Analyze the sentiment"):
+            return json.dumps(self._verdict(payload))
+        return self._summary(payload)
+
+    async def generate(self, prompt: str, generation_config: dict = None):
+        """Answers one prompt after the configured latency."""
+        self.model()
+        self._admit()
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(
+            text=self._reply(prompt, generation_config),
+            prompt_feedback=SimpleNamespace(block_reason=None),
+        )
+
+
+def create_backend(name: str = None, api_key: str = None,
+                   model_name: str = "gemini-flash-latest") -> LLMBackend:
+    """
+    Builds the backend selected by name or the LLM_BACKEND environment variable.
+
+    The fake backend reads FAKE_LLM_LATENCY_MS, FAKE_LLM_ERROR_RATE,
+    FAKE_LLM_RPM and FAKE_LLM_SEED.
+
+    Args:
+        name (str): 'gemini' (default) or 'fake'.
+        api_key (str): The Gemini API Key.
+        model_name (str): The model to use.
+
+    Returns:
+        LLMBackend: The configured backend.
+    """
+    name = (name or os.getenv("LLM_BACKEND", "gemini")).lower()
+    if name == "gemini":
+        return GeminiBackend(api_key=api_key, model_name=model_name)
+    if name == "fake":
+        return FakeBackend(
+            latency=float(os.getenv("FAKE_LLM_LATENCY_MS", "200")) / 1000,
+            error_rate=float(os.getenv("FAKE_LLM_ERROR_RATE", "0")),
+            requests_per_minute=int(os.getenv("FAKE_LLM_RPM", "0")),
+            seed=int(os.getenv("FAKE_LLM_SEED", "0")),
+        )
+    raise ValueError(f"Unknown LLM backend '{name}'. Choose from: {', '.join(BACKENDS)}")
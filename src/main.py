@@ -2,27 +2,32 @@
 """
 Main entry point for the Text-Analyzer-CLI.
 Orchestrates the CLI interface via the TextAnalyzerApp class.
+Heavy dependencies (the Gemini SDK, gspread, pypdf, NumPy, pyarrow and the
+interactive parts of rich) are imported by the commands that use them, and
+components are built on first use, so one-shot commands start quickly.
 """
 import sys
 import os
 import argparse
 import logging
+import time
+from functools import cached_property
+from dotenv import load_dotenv
 
 # Add project root to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from rich.console import Console
 from rich.table import Table
-from rich.panel import Panel
-from rich.prompt import Prompt, Confirm
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich import print as rprint
 
-from src.analyzer import TextAnalyzer
-from src.storage import StorageManager
-from src.ai_client import GeminiClient
-from src.pdf_utils import PDFProcessor
-from src.exporter import ReportExporter
+from src.analyzer import StreamCounter, TextAnalyzer
+from src.storage import build_analysis_record, create_storage
+from src.near_duplicate import is_reusable
+from src.sentiment_router import SENTIMENT_ENGINES, SentimentRouter
+from src.text_metrics import METRICS, compute_metrics, parse_metrics
+
+load_dotenv()
 
 # Configure Logging
 if not os.path.exists('logs'):
@@ -35,20 +40,74 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Text files at least this large get their local stats from the multi-core engine.
+PARALLEL_STATS_MIN_BYTES = 64 * 1024 * 1024
+
 class TextAnalyzerApp:
     """Main Application Class."""
 
-    def __init__(self, debug_mode: bool = False):
-        """Initializes the application and its components."""
+    def __init__(self, debug_mode: bool = False, use_cache: bool = True, sentiment_engine: str = None,
+                 local_only: bool = False):
+        """
+        Initializes the application. Components are built on first use.
+
+        Args:
+            debug_mode (bool): Enable debug logging.
+            use_cache (bool): Reuse cached Gemini responses for repeated texts,
+                and earlier results for near-duplicate texts.
+            sentiment_engine (str): 'gemini', 'local' or 'hybrid'. Defaults to
+                SENTIMENT_ENGINE from env, then 'gemini'.
+            local_only (bool): Use local stats and the offline lexicon only:
+                no Gemini client is created and no AI request is sent.
+        """
         self.console = Console()
         self.setup_logging(debug_mode)
-        
-        # Initialize Components
-        self.analyzer = TextAnalyzer()
-        self.storage = StorageManager()
-        self.ai_client = GeminiClient()
-        self.pdf_processor = PDFProcessor()
-        self.exporter = ReportExporter()
+
+        self.use_cache = use_cache
+        self.reuse_duplicates = use_cache
+        self.local_only = local_only
+        self.sentiment_engine = "local" if local_only else sentiment_engine
+
+    @cached_property
+    def analyzer(self) -> TextAnalyzer:
+        return TextAnalyzer()
+
+    @cached_property
+    def parallel_analyzer(self):
+        from src.parallel_analyzer import ParallelTextAnalyzer
+
+        return ParallelTextAnalyzer()
+
+    @cached_property
+    def storage(self):
+        return create_storage()
+
+    @cached_property
+    def ai_client(self):
+        """The GeminiClient, or None in local-only mode."""
+        if self.local_only:
+            return None
+        from src.ai_client import GeminiClient
+        from src.response_cache import ResponseCache
+
+        return GeminiClient(cache=ResponseCache() if self.use_cache else None)
+
+    @cached_property
+    def sentiment_router(self) -> SentimentRouter:
+        return SentimentRouter(self.ai_client, engine=self.sentiment_engine)
+
+    @cached_property
+    def pdf_processor(self):
+        from src.pdf_cache import PDFTextCache
+        from src.pdf_utils import PDFProcessor
+
+        return PDFProcessor(cache=PDFTextCache())
+
+    @cached_property
+    def exporter(self):
+        from src.exporter import ReportExporter
+
+        return ReportExporter()
 
     def setup_logging(self, debug_mode: bool):
         """Configures logging based on the debug flag."""
@@ -59,13 +118,25 @@ class TextAnalyzerApp:
 
     def show_header(self):
         """Displays the application header."""
+        from rich.panel import Panel
+
         self.console.print(Panel.fit(
             "[bold cyan]Text Analyzer CLI[/bold cyan]",
             border_style="cyan"
         ))
 
-    def perform_analysis(self, text: str, source: str = "Input"):
-        """Orchestrates the analysis process."""
+    def perform_analysis(self, text: str, source: str = "Input", local_stats: dict = None,
+                         metrics: list = None):
+        """
+        Orchestrates the analysis process.
+
+        Args:
+            text (str): The text to analyze.
+            source (str): Label describing where the text came from.
+            local_stats (dict): Precomputed local statistics, if already available.
+            metrics (list): Extended metrics to compute and display (see
+                text_metrics.METRICS). None skips them.
+        """
         if not text or not text.strip():
             rprint("[bold red]Error:[/bold red] Input text is empty.")
             return
@@ -74,39 +145,42 @@ class TextAnalyzerApp:
 
         # 1. Local Analysis
         try:
-            local_stats = self.analyzer.analyze(text)
+            if local_stats is None:
+                local_stats = self.analyzer.analyze(text)
             logger.debug(f"Local stats: {local_stats}")
+            extended = compute_metrics(text, metrics) if metrics else None
         except Exception as e:
             logger.error(f"Local analysis failed: {e}")
             rprint(f"[bold red]Local Analysis Failed:[/bold red] {e}")
             return
 
-        # 2. AI Analysis
+        # 2. AI Analysis (skipped when an earlier record is a near-duplicate)
         ai_result = {"sentiment": "SKIPPED", "confidence": "None"}
         summary = "N/A"
-        try:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                transient=True
-            ) as progress:
-                progress.add_task(description="Consulting Gemini AI...", total=None)
-                ai_result = self.ai_client.analyze_sentiment(text)
-                summary = self.ai_client.generate_summary(text)
-                logger.debug(f"AI result: {ai_result}, Summary: {summary}")
-        except Exception as e:
-            logger.error(f"AI analysis failed: {e}")
-            rprint(f"[bold red]AI Analysis Failed:[/bold red] {e}")
+        reused = self._find_reusable_duplicate(text)
+        if reused:
+            ai_result, summary = reused
+        elif self.local_only:
+            ai_result, summary = self.sentiment_router.analyze(text)
+        else:
+            from rich.progress import Progress, SpinnerColumn, TextColumn
+
+            try:
+                with Progress(
+                    SpinnerColumn(),
+                    TextColumn("[progress.description]{task.description}"),
+                    transient=True
+                ) as progress:
+                    progress.add_task(description="Consulting Gemini AI...", total=None)
+                    ai_result, summary = self.sentiment_router.analyze(text)
+                    logger.debug(f"AI result: {ai_result}, Summary: {summary}")
+            except Exception as e:
+                logger.error(f"AI analysis failed: {e}")
+                rprint(f"[bold red]AI Analysis Failed:[/bold red] {e}")
 
         # 3. Save to DB
-        record = {
-            "text": text[:100] + "..." if len(text) > 100 else text, 
-            "full_text": text, 
-            "summary": summary,
-            **local_stats,
-            **ai_result
-        }
-        
+        record = build_analysis_record(text, summary, local_stats, ai_result)
+
         try:
             record_id = self.storage.save_analysis(record)
             rprint(f"[green]Analysis saved (ID: {record_id[:8]})[/green]")
@@ -116,6 +190,47 @@ class TextAnalyzerApp:
 
         # 4. Display Results
         self._display_results(local_stats, ai_result, summary)
+        if extended:
+            self._display_metrics(extended)
+
+    def _find_reusable_duplicate(self, text: str):
+        """
+        Looks for an earlier record whose text is an exact or near-duplicate.
+
+        Returns:
+            tuple: (sentiment dict, summary) of the matched record, or None.
+        """
+        if not self.reuse_duplicates or self.storage.duplicate_index is None:
+            return None
+        try:
+            match = self.storage.duplicate_index.find(text)
+            record = self.storage.get_record(match["id"]) if match else None
+        except Exception as e:
+            logger.error(f"Near-duplicate lookup failed: {e}")
+            return None
+        if not record or not is_reusable(record):
+            return None
+
+        kind = "Duplicate" if match["similarity"] == 1.0 else "Near-duplicate"
+        rprint(f"[cyan]{kind} of record {match['id'][:8]} ({(match['timestamp'] or '')[:19]}, "
+               f"{match['similarity']:.0%} similar): reusing its sentiment and summary.[/cyan]")
+        logger.info(f"Reused analysis {match['id']} (similarity {match['similarity']:.2f})")
+        return ({"sentiment": record["sentiment"], "confidence": record.get("confidence", "Unknown")},
+                record.get("summary", "N/A"))
+
+    def extract_pdf(self, file_path: str) -> tuple:
+        """
+        Extracts a PDF and counts its local stats while pages stream in.
+
+        Returns:
+            tuple: (text, local_stats)
+        """
+        counter = StreamCounter()
+        chunks = []
+        for chunk in self.pdf_processor.iter_text_chunks(file_path):
+            counter.update(chunk)
+            chunks.append(chunk)
+        return "".join(chunks), counter.result()
 
     def _display_results(self, local_stats: dict, ai_result: dict, summary: str):
         """Helper to print results table."""
@@ -135,6 +250,29 @@ class TextAnalyzerApp:
 
         self.console.print(table)
 
+    def _display_metrics(self, extended: dict):
+        """Helper to print the extended metrics table."""
+        table = Table(title="Extended Metrics")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", style="magenta")
+
+        labels = {
+            "sentences": "Sentences",
+            "avg_word_length": "Avg word length",
+            "type_token_ratio": "Type/token ratio",
+            "flesch_reading_ease": "Flesch reading ease",
+            "flesch_kincaid_grade": "Flesch-Kincaid grade",
+        }
+        for key, label in labels.items():
+            if key in extended:
+                table.add_row(label, str(extended[key]))
+        if "top_words" in extended:
+            table.add_row("Top words", ", ".join(f"{word} ({count})" for word, count in extended["top_words"]))
+        if "bigrams" in extended:
+            table.add_row("Top bigrams", ", ".join(f"{pair} ({count})" for pair, count in extended["bigrams"]))
+
+        self.console.print(table)
+
     def show_history(self):
         """Displays the analysis history."""
         try:
@@ -164,25 +302,123 @@ class TextAnalyzerApp:
             logger.error(f"Error showing history: {e}")
             rprint(f"[red]Error retrieving history: {e}[/red]")
 
+    def search_history(self, query: str, limit: int = 10):
+        """
+        Displays the stored analyses that best match a full-text query.
+
+        Args:
+            query (str): Terms and "quoted phrases" to look for.
+            limit (int): Maximum number of results.
+        """
+        if self.storage.search_index is None:
+            rprint("[red]Full-text search is not available (SQLite lacks FTS5).[/red]")
+            return
+        try:
+            start = time.perf_counter()
+            results = self.storage.search_index.search(query, limit=limit)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        except ValueError as e:
+            rprint(f"[yellow]{e}[/yellow]")
+            return
+        except Exception as e:
+            logger.error(f"Error searching history: {e}")
+            rprint(f"[red]Error searching history: {e}[/red]")
+            return
+
+        if not results:
+            rprint(f"[yellow]No analyses match '{query}'.[/yellow]")
+            return
+
+        table = Table(title=f"Search results for '{query}' ({elapsed_ms:.1f} ms)")
+        table.add_column("Score", justify="right")
+        table.add_column("Timestamp", style="dim")
+        table.add_column("Snippet")
+        table.add_column("Sentiment")
+        table.add_column("ID", style="dim")
+
+        for result in results:
+            sentiment = result.get("sentiment") or "N/A"
+            color = "green" if sentiment == "POSITIVE" else "red" if sentiment == "NEGATIVE" else "yellow"
+            table.add_row(
+                f"{result['score']:.2f}",
+                (result.get("timestamp") or "")[:19],
+                result.get("text") or "",
+                f"[{color}]{sentiment}[/{color}]",
+                result["id"][:8],
+            )
+
+        self.console.print(table)
+
+    def show_similar(self, reference: str, limit: int = 10):
+        """
+        Displays the stored analyses most similar to a record or a text.
+
+        Args:
+            reference (str): A record ID (or the 8-character prefix shown in
+                tables), otherwise a text to compare against.
+            limit (int): Maximum number of results.
+        """
+        try:
+            start = time.perf_counter()
+            results = self.storage.vector_index.similar(reference, limit=limit)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            logger.error(f"Error finding similar analyses: {e}")
+            rprint(f"[red]Error finding similar analyses: {e}[/red]")
+            return
+
+        if not results:
+            rprint("[yellow]No similar analyses found.[/yellow]")
+            return
+
+        table = Table(title=f"Similar analyses ({elapsed_ms:.1f} ms)")
+        table.add_column("Similarity", justify="right")
+        table.add_column("Timestamp", style="dim")
+        table.add_column("Snippet")
+        table.add_column("Sentiment")
+        table.add_column("ID", style="dim")
+
+        for result in results:
+            sentiment = result.get("sentiment") or "N/A"
+            color = "green" if sentiment == "POSITIVE" else "red" if sentiment == "NEGATIVE" else "yellow"
+            table.add_row(
+                f"{result['similarity']:.0%}",
+                (result.get("timestamp") or "")[:19],
+                result.get("text") or "",
+                f"[{color}]{sentiment}[/{color}]",
+                result["id"][:8],
+            )
+
+        self.console.print(table)
+
     def run_interactive_menu(self):
         """Runs the main interactive loop."""
+        from rich.prompt import Prompt, Confirm
+
         self.show_header()
         while True:
             self.console.print("\n[bold]Main Menu[/bold]")
             self.console.print("1. [cyan]Analizza Testo[/cyan] 📝")
             self.console.print("2. [cyan]Vedi Storico[/cyan] 📜")
-            self.console.print("3. [cyan]Esporta Dati[/cyan] 💾")
-            self.console.print("4. [red]Esci[/red] ❌")
+            self.console.print("3. [cyan]Cerca nello Storico[/cyan] 🔎")
+            self.console.print("4. [cyan]Trova Analisi Simili[/cyan] 🧭")
+            self.console.print("5. [cyan]Esporta Dati[/cyan] 💾")
+            self.console.print("6. [red]Esci[/red] ❌")
             
-            choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4"], default="1")
+            choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4", "5", "6"], default="1")
 
             if choice == "1":
                 self._handle_analysis_input()
             elif choice == "2":
                 self.show_history()
             elif choice == "3":
-                self._handle_export_menu()
+                rprint('[dim]Tips: parole singole, "frasi esatte" tra virgolette, prefisso con *.[/dim]')
+                self.search_history(Prompt.ask("Search for"))
             elif choice == "4":
+                self.show_similar(Prompt.ask("Record ID (first 8 characters) or text"))
+            elif choice == "5":
+                self._handle_export_menu()
+            elif choice == "6":
                 if Confirm.ask("Are you sure you want to exit?"):
                     rprint("[bold cyan]Goodbye![/bold cyan] 👋")
                     break
@@ -191,6 +427,8 @@ class TextAnalyzerApp:
 
     def _handle_analysis_input(self):
         """Handles text/file input for analysis."""
+        from rich.prompt import Prompt
+
         rprint("[dim]Tips: Supporta .txt e .pdf (testo selezionabile). Max consigliato: <100 pagine.[/dim]")
         text_input = Prompt.ask("Enter text to analyze (or file path)")
         clean_input = text_input.strip().strip("'").strip('"')
@@ -201,8 +439,9 @@ class TextAnalyzerApp:
                  try:
                      if expanded_path.lower().endswith(".pdf"):
                          rprint(f"[cyan]Detected PDF file: {expanded_path}[/cyan]")
-                         content = self.pdf_processor.extract_text(expanded_path)
-                         self.perform_analysis(content, source=f"PDF: {os.path.basename(expanded_path)}")
+                         content, local_stats = self.extract_pdf(expanded_path)
+                         self.perform_analysis(content, source=f"PDF: {os.path.basename(expanded_path)}",
+                                               local_stats=local_stats)
                      else:
                          with open(expanded_path, "r", encoding="utf-8") as f:
                              self.perform_analysis(f.read(), source=f"File: {os.path.basename(expanded_path)}")
@@ -212,35 +451,179 @@ class TextAnalyzerApp:
         
         self.perform_analysis(text_input)
 
+    def export_history(self, fmt: str, columns: list = None, compress: bool = False) -> str:
+        """
+        Streams the whole history to a CSV, Markdown, Parquet or Arrow file.
+
+        Args:
+            fmt (str): 'csv', 'markdown', 'parquet' or 'arrow'.
+            columns (list): CSV/Parquet/Arrow columns (default: every stored
+                field except full_text). Document bodies are read only if
+                'full_text' is selected.
+            compress (bool): Write a .gz file (CSV and Markdown; the columnar
+                formats are always zstd-compressed).
+
+        Returns:
+            str: The path of the export, or "" if the history is empty.
+        """
+        from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
+        records = self.storage.iter_history()
+        if columns and "full_text" in columns:
+            records = self.storage.with_full_text(records)
+
+        start = time.perf_counter()
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            TextColumn("{task.completed} records"),
+            TimeElapsedColumn(),
+            transient=True
+        ) as progress:
+            task = progress.add_task(description=f"Exporting {fmt.upper()}...", total=None)
+
+            def report(count: int):
+                progress.update(task, completed=count)
+
+            if fmt == "csv":
+                path = self.exporter.to_csv(records, columns=columns, compress=compress, progress=report)
+            elif fmt == "parquet":
+                path = self.exporter.to_parquet(records, columns=columns, progress=report)
+            elif fmt == "arrow":
+                path = self.exporter.to_arrow(records, columns=columns, progress=report)
+            else:
+                path = self.exporter.to_markdown(records, compress=compress, progress=report)
+            count = progress.tasks[0].completed
+
+        if not path:
+            rprint("[yellow]No history to export.[/yellow]")
+            return ""
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        rprint(f"[green]Exported {count:.0f} records ({size_mb:.1f} MB) in {elapsed:.1f}s "
+               f"({count / elapsed:.0f} records/s) to:[/green] {path}")
+        return path
+
+    def sync_sheet(self, sheet_name: str, full: bool = False) -> int:
+        """
+        Appends the records not yet exported to a Google Sheet.
+
+        Args:
+            sheet_name (str): Name of the spreadsheet (shared with the bot email).
+            full (bool): Clear the sheet and upload the whole history again.
+
+        Returns:
+            int: The number of rows appended.
+        """
+        from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+        from src.sheet_sync import SheetSync, open_worksheet
+
+        worksheet = open_worksheet(sheet_name)
+        sync = SheetSync(worksheet, sheet_name)
+        start = time.perf_counter()
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            TextColumn("{task.completed} rows"),
+            TimeElapsedColumn(),
+            transient=True
+        ) as progress:
+            task = progress.add_task(description="Syncing Google Sheet...", total=None)
+            count = sync.sync(self.storage.iter_history(), full=full,
+                              progress=lambda done: progress.update(task, completed=done))
+
+        if not count:
+            rprint(f"[yellow]Sheet '{sheet_name}' is already up to date.[/yellow]")
+        else:
+            rprint(f"[green]Appended {count} rows in {time.perf_counter() - start:.1f}s to:[/green] "
+                   f"{worksheet.url}")
+        return count
+
     def _handle_export_menu(self):
         """Handles the export file menu."""
+        from rich.prompt import Prompt, Confirm
+
         rprint("\n[bold]Export Options[/bold]")
         rprint("1. [cyan]Export to CSV[/cyan] 📊")
         rprint("2. [cyan]Export to Markdown[/cyan] 📝")
         rprint("3. [green]Export to Google Sheet[/green] ☁️")
-        rprint("4. [dim]Cancel[/dim]")
+        rprint("4. [cyan]Export to Parquet[/cyan] 🧱")
+        rprint("5. [cyan]Export to Arrow IPC[/cyan] 🏹")
+        rprint("6. [dim]Cancel[/dim]")
         
-        exp_choice = Prompt.ask("Choose format", choices=["1", "2", "3", "4"], default="1")
+        exp_choice = Prompt.ask("Choose format", choices=["1", "2", "3", "4", "5", "6"], default="1")
         
-        if exp_choice in ["1", "2", "3"]:
-            try:
-                history = self.storage.get_history(limit=100)
+        try:
+            if exp_choice == "1":
+                columns = None
+                if Confirm.ask("Include the full document text?", default=False):
+                    first = next(self.storage.iter_history(), {})
+                    columns = [key for key in first if key != "full_text"] + ["full_text"]
+                self.export_history("csv", columns=columns,
+                                    compress=Confirm.ask("Compress with gzip?", default=False))
+            elif exp_choice == "2":
+                self.export_history("markdown", compress=Confirm.ask("Compress with gzip?", default=False))
+            elif exp_choice == "3":
+                if Confirm.ask("Append only the new records (incremental sync)?", default=True):
+                    self.sync_sheet(Prompt.ask("Enter Google Sheet Name"))
+                    return
+                history = list(self.storage.with_full_text(self.storage.iter_history()))
                 if not history:
                     rprint("[yellow]No history to export.[/yellow]")
-                else:
-                    if exp_choice == "1":
-                        path = self.exporter.to_csv(history)
-                        rprint(f"[green]Successfully exported CSV to:[/green] {path}")
-                    elif exp_choice == "2":
-                        path = self.exporter.to_markdown(history)
-                        rprint(f"[green]Successfully exported Markdown to:[/green] {path}")
-                    elif exp_choice == "3":
-                        sheet_name = Prompt.ask("Enter Google Sheet Name")
-                        url = self.exporter.to_google_sheet(history, sheet_name)
-                        rprint(f"[green]Successfully exported to:[/green] {url}")
-                        
-            except Exception as e:
-                rprint(f"[red]Export failed: {e}[/red]")
+                    return
+                sheet_name = Prompt.ask("Enter Google Sheet Name")
+                url = self.exporter.to_google_sheet(history, sheet_name)
+                rprint(f"[green]Successfully exported to:[/green] {url}")
+            elif exp_choice in ["4", "5"]:
+                self.export_history("parquet" if exp_choice == "4" else "arrow")
+        except Exception as e:
+            rprint(f"[red]Export failed: {e}[/red]")
+
+    def run_batch(self, target: str, workers: int = None, ai_concurrency: int = 4,
+                  commit_every: int = 50, sentiment_only: bool = False):
+        """Analyzes every .txt/.pdf file in a directory or glob and reports throughput."""
+        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
+        from src.batch import BatchRunner
+
+        runner = BatchRunner(
+            self.storage,
+            ai_client=self.sentiment_router,
+            workers=workers,
+            ai_concurrency=ai_concurrency,
+            commit_every=commit_every,
+            pdf_cache_dir=self.pdf_processor.cache.cache_dir,
+            sentiment_only=sentiment_only,
+        )
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            transient=True
+        ) as progress:
+            task = progress.add_task(description=f"Batch analyzing {target}...", total=None)
+            summary = runner.run(
+                target,
+                on_progress=lambda done, total: progress.update(task, completed=done, total=total),
+            )
+
+        table = Table(title="Batch Results")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", style="magenta")
+        table.add_row("Files found", str(summary["found"]))
+        table.add_row("Skipped (already done)", str(summary["skipped"]))
+        table.add_row("Processed", str(summary["processed"]))
+        table.add_row("Failed", str(summary["failed"]))
+        table.add_row("Elapsed", f"{summary['elapsed']:.2f} s")
+        table.add_row("Throughput", f"{summary['docs_per_sec']:.2f} docs/s, {summary['mb_per_sec']:.2f} MB/s")
+        if self.ai_client is not None and self.ai_client.cache is not None:
+            cache_stats = self.ai_client.cache.stats()
+            table.add_row("AI cache", f"{cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        sources = self.sentiment_router.stats
+        table.add_row("Sentiment sources",
+                      f"{sources['gemini']} Gemini, {sources['local']} local, {sources['fallback']} fallback")
+        self.console.print(table)
 
     def run(self):
         """Entry point for argument parsing and app execution."""
@@ -266,22 +649,77 @@ def main():
     parser = argparse.ArgumentParser(description="Text Analyzer CLI powered by Gemini AI")
     parser.add_argument("--text", help="Text string to analyze directly")
     parser.add_argument("--file", help="Path to a text file to analyze")
+    parser.add_argument("--batch", help="Directory or glob of .txt/.pdf files to analyze")
+    parser.add_argument("--workers", type=int, help="Processes for local batch analysis (default: CPU count)")
+    parser.add_argument("--ai-concurrency", type=int, default=4, help="Maximum concurrent AI requests in batch mode")
+    parser.add_argument("--commit-every", type=int, default=50, help="Records per grouped storage commit in batch mode")
+    parser.add_argument("--sentiment-only", action="store_true",
+                        help="In batch mode, skip summaries and pack many documents into each sentiment request")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always call Gemini, ignoring cached responses and near-duplicate records")
+    parser.add_argument("--metrics", nargs="?", const="all",
+                        help=f"Also compute extended metrics for --text/--file: 'all' or a comma list of "
+                             f"{', '.join(METRICS)}")
+    parser.add_argument("--sentiment-engine", choices=SENTIMENT_ENGINES,
+                        help="gemini (default), local (offline lexicon) or hybrid (local first, "
+                             "low-confidence texts escalated to Gemini)")
+    parser.add_argument("--search", metavar="QUERY",
+                        help='Search stored analyses (terms, "exact phrases", prefix*), ranked by BM25')
+    parser.add_argument("--similar", metavar="ID_OR_TEXT",
+                        help="List the stored analyses most similar to a record ID (or its prefix) or a text")
+    parser.add_argument("--limit", type=int, default=10, help="Maximum number of --search/--similar results")
+    parser.add_argument("--export", choices=["csv", "markdown", "parquet", "arrow"],
+                        help="Export the whole history to exports/ (streamed, no record limit; "
+                             "parquet/arrow need pyarrow)")
+    parser.add_argument("--columns",
+                        help="Comma list of columns for --export csv/parquet/arrow (add full_text for document bodies)")
+    parser.add_argument("--gzip", action="store_true", help="Compress a csv/markdown --export file with gzip")
+    parser.add_argument("--sync-sheet", metavar="NAME",
+                        help="Append the records not yet exported to the Google Sheet NAME")
+    parser.add_argument("--full-resync", action="store_true",
+                        help="With --sync-sheet: clear the sheet and upload the whole history again")
+    parser.add_argument("--local-only", action="store_true",
+                        help="Local stats and offline lexicon sentiment only: no Gemini client, "
+                             "no AI requests (fastest start)")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     
     args = parser.parse_args()
 
-    app = TextAnalyzerApp(debug_mode=args.debug)
+    try:
+        metrics = parse_metrics(args.metrics) if args.metrics else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    app = TextAnalyzerApp(debug_mode=args.debug, use_cache=not args.no_cache,
+                          sentiment_engine=args.sentiment_engine, local_only=args.local_only)
 
-    if args.text:
-        app.perform_analysis(args.text, source="CLI Argument")
+    if args.export:
+        columns = [c.strip() for c in args.columns.split(",") if c.strip()] if args.columns else None
+        app.export_history(args.export, columns=columns, compress=args.gzip)
+    elif args.sync_sheet:
+        app.sync_sheet(args.sync_sheet, full=args.full_resync)
+    elif args.search:
+        app.search_history(args.search, limit=args.limit)
+    elif args.similar:
+        app.show_similar(args.similar, limit=args.limit)
+    elif args.batch:
+        app.run_batch(args.batch, workers=args.workers, ai_concurrency=args.ai_concurrency,
+                      commit_every=args.commit_every, sentiment_only=args.sentiment_only)
+    elif args.text:
+        app.perform_analysis(args.text, source="CLI Argument", metrics=metrics)
     elif args.file:
         try:
             if args.file.lower().endswith(".pdf"):
-                content = app.pdf_processor.extract_text(args.file)
-                app.perform_analysis(content, source=f"PDF: {args.file}")
+                content, local_stats = app.extract_pdf(args.file)
+                app.perform_analysis(content, source=f"PDF: {args.file}", local_stats=local_stats,
+                                     metrics=metrics)
             else:
+                local_stats = None
+                if os.path.getsize(args.file) >= PARALLEL_STATS_MIN_BYTES:
+                    local_stats = app.parallel_analyzer.analyze_file(args.file)
                 with open(args.file, "r", encoding="utf-8") as f:
-                    app.perform_analysis(f.read(), source=f"File: {args.file}")
+                    app.perform_analysis(f.read(), source=f"File: {args.file}", local_stats=local_stats,
+                                         metrics=metrics)
         except FileNotFoundError:
              rprint(f"[bold red]Error:[/bold red] File not found: {args.file}")
     else:
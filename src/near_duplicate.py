@@ -0,0 +1,229 @@
+"""
+Module for near-duplicate detection via NearDuplicateIndex class.
+Each saved record gets a MinHash signature of its word shingles; signatures
+are banded into an on-disk LSH table (SQLite), so finding earlier records
+similar to a new text only compares it with the few that share a band.
+"""
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import struct
+from contextlib import closing
+from typing import Iterable, List
+
+from src.aggregation import VALID_SENTIMENTS
+from src.blob_store import content_hash
+
+logger = logging.getLogger(__name__)
+
+NUM_HASHES = 128
+# 16 bands of 8 rows: texts above ~0.7 similarity almost surely share a band,
+# texts below ~0.5 rarely do.
+BANDS = 16
+ROWS_PER_BAND = NUM_HASHES // BANDS
+SHINGLE_SIZE = 5
+
+WORD_PATTERN = re.compile(r"\w+")
+
+HASH_MASK = (1 << 64) - 1
+# Bin values are below 2**64 / NUM_HASHES; borrowed values are shifted by
+# this much per bin of distance so they never equal a bin's own minimum.
+BIN_RANGE = (1 << 64) // NUM_HASHES
+SIGNATURE_FORMAT = f"<{NUM_HASHES}Q"
+
+# Summaries that carry no content and must not be reused.
+UNUSABLE_SUMMARIES = ("N/A", "Summary Error")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    timestamp TEXT,
+    content_hash TEXT NOT NULL,
+    reusable INTEGER NOT NULL,
+    signature BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_signatures_content_hash ON signatures (content_hash);
+CREATE TABLE IF NOT EXISTS bands (
+    band INTEGER NOT NULL,
+    bucket BLOB NOT NULL,
+    doc INTEGER NOT NULL,
+    PRIMARY KEY (band, bucket, doc)
+) WITHOUT ROWID;
+"""
+
+
+def shingle_hashes(text: str) -> set:
+    """Returns the 64-bit hashes of the text's overlapping word shingles."""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        shingles = [" ".join(words)] if words else []
+    else:
+        shingles = (" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+    return {
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        for shingle in shingles
+    }
+
+
+def minhash_signature(text: str) -> tuple:
+    """
+    Computes the MinHash signature of a text.
+
+    Uses one-permutation hashing: each shingle hash is routed to one of
+    NUM_HASHES bins and every bin keeps its minimum, so the cost is one hash
+    per shingle instead of one per shingle and permutation. Empty bins
+    borrow the value of the next non-empty bin (rotation densification).
+
+    Returns:
+        tuple: NUM_HASHES unsigned 64-bit integers.
+    """
+    bins = [None] * NUM_HASHES
+    for value in shingle_hashes(text):
+        slot, rest = divmod(value, BIN_RANGE)
+        if bins[slot] is None or rest < bins[slot]:
+            bins[slot] = rest
+    if all(value is None for value in bins):
+        return (HASH_MASK,) * NUM_HASHES
+
+    signature = list(bins)
+    for i in range(NUM_HASHES):
+        distance = 1
+        while signature[i] is None:
+            borrowed = bins[(i + distance) % NUM_HASHES]
+            if borrowed is not None:
+                signature[i] = (borrowed + distance * BIN_RANGE) & HASH_MASK
+            distance += 1
+    return tuple(signature)
+
+
+def estimate_similarity(first: tuple, second: tuple) -> float:
+    """Estimates the Jaccard similarity of two texts from their signatures."""
+    return sum(a == b for a, b in zip(first, second)) / NUM_HASHES
+
+
+def band_keys(signature: tuple) -> List[bytes]:
+    """Splits a signature into its LSH bucket keys, one per band."""
+    packed = struct.pack(SIGNATURE_FORMAT, *signature)
+    size = ROWS_PER_BAND * 8
+    return [packed[i * size:(i + 1) * size] for i in range(BANDS)]
+
+
+def is_reusable(record: dict) -> bool:
+    """Checks whether a record's sentiment and summary can stand in for a new analysis."""
+    summary = record.get("summary") or "N/A"
+    return (record.get("sentiment") in VALID_SENTIMENTS
+            and summary not in UNUSABLE_SUMMARIES
+            and not summary.startswith("AI Summary Unavailable"))
+
+
+class NearDuplicateIndex:
+    """Class to store MinHash signatures and find near-duplicate records."""
+
+    def __init__(self, db_path: str, threshold: float = None):
+        """
+        Initializes the NearDuplicateIndex and creates its tables if needed.
+
+        Args:
+            db_path (str): Path of the SQLite index file.
+            threshold (float): Minimum estimated similarity (0-1) for a
+                match. Defaults to NEAR_DUPLICATE_THRESHOLD from env, then 0.9.
+        """
+        self.db_path = db_path
+        self.threshold = threshold or float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.9"))
+        # The text looked up last is usually the next one saved.
+        self._last = (None, None)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens a connection to the index file."""
+        return sqlite3.connect(self.db_path)
+
+    def _signature(self, text: str, digest: str) -> tuple:
+        """Returns the signature of text, reusing the last computed one."""
+        if self._last[0] != digest:
+            self._last = (digest, minhash_signature(text))
+        return self._last[1]
+
+    def is_empty(self) -> bool:
+        """Checks whether no record has been indexed yet."""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT 1 FROM signatures LIMIT 1").fetchone() is None
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    def add_many(self, records: Iterable[dict]) -> int:
+        """
+        Stores the signatures of saved records in a single transaction.
+
+        Records already in the index (same id) are skipped.
+
+        Returns:
+            int: The number of records newly indexed.
+        """
+        added = 0
+        with closing(self._connect()) as conn, conn:
+            for record in records:
+                text = record.get("full_text") or record.get("text", "")
+                digest = content_hash(text)
+                signature = self._signature(text, digest)
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO signatures (id, timestamp, content_hash, reusable, signature) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (record["id"], record.get("timestamp"), digest, int(is_reusable(record)),
+                     struct.pack(SIGNATURE_FORMAT, *signature)),
+                )
+                if not cursor.rowcount:
+                    continue
+                conn.executemany(
+                    "INSERT OR IGNORE INTO bands (band, bucket, doc) VALUES (?, ?, ?)",
+                    [(band, key, cursor.lastrowid) for band, key in enumerate(band_keys(signature))],
+                )
+                added += 1
+        return added
+
+    def find(self, text: str):
+        """
+        Finds the earlier reusable record most similar to text.
+
+        An identical text is matched exactly (similarity 1.0); otherwise
+        only records sharing an LSH band are compared, and the best one at
+        or above the threshold wins. Ties go to the newest record.
+
+        Returns:
+            dict: {"id", "timestamp", "similarity"}, or None if no match.
+        """
+        digest = content_hash(text)
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT id, timestamp FROM signatures WHERE content_hash = ? AND reusable = 1 "
+                "ORDER BY rowid DESC LIMIT 1",
+                (digest,),
+            ).fetchone()
+            if row:
+                return {"id": row[0], "timestamp": row[1], "similarity": 1.0}
+
+            signature = self._signature(text, digest)
+            keys = band_keys(signature)
+            clauses = " OR ".join(["(band = ? AND bucket = ?)"] * BANDS)
+            params = [value for band, key in enumerate(keys) for value in (band, key)]
+            candidates = conn.execute(
+                f"SELECT s.rowid, s.id, s.timestamp, s.signature FROM signatures s "
+                f"WHERE s.reusable = 1 AND s.rowid IN (SELECT doc FROM bands WHERE {clauses})",
+                params,
+            ).fetchall()
+
+        best = None
+        for rowid, record_id, timestamp, packed in candidates:
+            similarity = estimate_similarity(signature, struct.unpack(SIGNATURE_FORMAT, packed))
+            if similarity >= self.threshold and (best is None or (similarity, rowid) > best[:2]):
+                best = (similarity, rowid, record_id, timestamp)
+        if best is None:
+            return None
+        logger.debug(f"Near-duplicate match {best[2]} ({best[0]:.2f}) among {len(candidates)} candidates")
+        return {"id": best[2], "timestamp": best[3], "similarity": best[0]}
@@ -0,0 +1,125 @@
+"""
+Module for multi-core local analysis of large files.
+Provides the ParallelTextAnalyzer class, which counts memory-mapped byte
+ranges in a process pool and merges the partial results.
+"""
+import codecs
+import logging
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from src.analyzer import StreamCounter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUB_CHUNK = 8 * 1024 * 1024
+
+
+def _utf8_boundary(buffer, position: int) -> int:
+    """Moves position forward past UTF-8 continuation bytes (10xxxxxx)."""
+    end = len(buffer)
+    while position < end and (buffer[position] & 0xC0) == 0x80:
+        position += 1
+    return position
+
+
+def _count_range(file_path: str, start: int, end: int,
+                 sub_chunk: int = DEFAULT_SUB_CHUNK) -> StreamCounter:
+    """
+    Counts the byte range [start, end) of a UTF-8 file.
+
+    Runs in a worker process: the file is mapped again there, so only the
+    range offsets travel to the worker and only a StreamCounter comes back.
+    """
+    counter = StreamCounter()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        position = start
+        while position < end:
+            stop = min(position + sub_chunk, end)
+            counter.update(decoder.decode(mm[position:stop]))
+            position = stop
+        counter.update(decoder.decode(b"", final=True))
+    return counter
+
+
+class ParallelTextAnalyzer:
+    """Class for counting words/chars/lines of large files on all cores."""
+
+    def __init__(self, workers: int = None, min_bytes_per_worker: int = 16 * 1024 * 1024):
+        """
+        Initializes the ParallelTextAnalyzer.
+
+        Args:
+            workers (int): Number of worker processes. Defaults to the CPU count.
+            min_bytes_per_worker (int): Smallest range worth shipping to a
+                worker; smaller files are counted in-process.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.min_bytes_per_worker = min_bytes_per_worker
+
+    def split_ranges(self, file_path: str) -> list:
+        """
+        Splits a file into contiguous byte ranges, one per worker.
+
+        Range boundaries never fall inside a multi-byte UTF-8 sequence.
+
+        Args:
+            file_path (str): Path to the file.
+
+        Returns:
+            list: (start, end) tuples covering the whole file in order.
+        """
+        size = os.path.getsize(file_path)
+        if size == 0:
+            return []
+
+        parts = max(1, min(self.workers, size // max(1, self.min_bytes_per_worker)))
+        if parts == 1:
+            return [(0, size)]
+
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            step = size // parts
+            cuts = [0]
+            for i in range(1, parts):
+                cut = _utf8_boundary(mm, i * step)
+                if cut > cuts[-1]:
+                    cuts.append(cut)
+            cuts.append(size)
+
+        return [(cuts[i], cuts[i + 1]) for i in range(len(cuts) - 1) if cuts[i] < cuts[i + 1]]
+
+    def analyze_file(self, file_path: str) -> dict:
+        """
+        Calculates word/char/line counts of a UTF-8 file in parallel.
+
+        The result is identical to TextAnalyzer.analyze on the file read in
+        text mode (so "\\r\\n" counts as a single character).
+
+        Args:
+            file_path (str): Path to the text file.
+
+        Returns:
+            dict: Same keys as TextAnalyzer.analyze.
+        """
+        ranges = self.split_ranges(file_path)
+        if not ranges:
+            return StreamCounter().result()
+
+        if len(ranges) == 1:
+            partials = [_count_range(file_path, *ranges[0])]
+        else:
+            logger.debug(f"Counting {file_path} in {len(ranges)} ranges")
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(ranges))) as pool:
+                partials = list(pool.map(
+                    _count_range,
+                    [file_path] * len(ranges),
+                    [start for start, _ in ranges],
+                    [end for _, end in ranges],
+                ))
+
+        total = StreamCounter()
+        for partial in partials:
+            total.merge(partial)
+        return total.result(translate_newlines=True)
@@ -0,0 +1,151 @@
+"""
+Module for caching extracted PDF text on disk via PDFTextCache class.
+Entries are keyed by the SHA-256 of the PDF bytes and evicted LRU-first
+once the cache grows past its size cap.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+logger = logging.getLogger(__name__)
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(file_path: str) -> str:
+    """Returns the SHA-256 hex digest of a file's contents."""
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class PDFTextCache:
+    """Class to store and look up extracted PDF text by content hash."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            digest TEXT PRIMARY KEY,
+            size_bytes INTEGER NOT NULL,
+            last_access REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access);
+        CREATE TABLE IF NOT EXISTS paths (
+            path TEXT PRIMARY KEY,
+            file_size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            digest TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, cache_dir: str = os.path.join("data", "pdf_cache"), max_bytes: int = None):
+        """
+        Initializes the PDFTextCache.
+
+        Args:
+            cache_dir (str): Directory holding the cached text files.
+            max_bytes (int): Size cap for cached text. Defaults to the
+                PDF_CACHE_MAX_MB environment variable, then 512 MB.
+        """
+        self.cache_dir = cache_dir
+        if max_bytes is None:
+            max_bytes = int(os.getenv("PDF_CACHE_MAX_MB", "512")) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(cache_dir, "index.sqlite3")
+        self._ensure_cache_dir()
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+
+    def _ensure_cache_dir(self):
+        """Ensures the cache directory exists."""
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens a connection to the cache index."""
+        return sqlite3.connect(self.index_file, timeout=30)
+
+    def _text_path(self, digest: str) -> str:
+        """Returns the file holding the text for a digest."""
+        return os.path.join(self.cache_dir, f"{digest}.txt")
+
+    def digest_for(self, file_path: str) -> str:
+        """
+        Returns the content hash of a file.
+
+        If the file's size and mtime match what was seen last time, the
+        stored digest is reused and the file is not read at all.
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT file_size, mtime_ns, digest FROM paths WHERE path = ?", (path,)
+            ).fetchone()
+            if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+                return row[2]
+
+            digest = file_digest(path)
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO paths (path, file_size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                    (path, stat.st_size, stat.st_mtime_ns, digest),
+                )
+            return digest
+
+    def get(self, digest: str):
+        """
+        Returns the cached text for a digest, or None on a miss.
+        """
+        text_path = self._text_path(digest)
+        try:
+            with open(text_path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("UPDATE entries SET last_access = ? WHERE digest = ?", (time.time(), digest))
+        logger.debug(f"PDF cache hit: {digest[:12]}")
+        return text
+
+    def put(self, digest: str, text: str) -> None:
+        """
+        Stores extracted text and evicts least recently used entries if needed.
+        """
+        text_path = self._text_path(digest)
+        tmp_path = f"{text_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, text_path)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (digest, size_bytes, last_access) VALUES (?, ?, ?)",
+                (digest, os.path.getsize(text_path), time.time()),
+            )
+        self._evict()
+
+    def _evict(self) -> None:
+        """Deletes least recently used entries until the cache fits its cap."""
+        with closing(self._connect()) as conn, conn:
+            total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            rows = conn.execute("SELECT digest, size_bytes FROM entries ORDER BY last_access").fetchall()
+            for digest, size_bytes in rows:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(self._text_path(digest))
+                except FileNotFoundError:
+                    pass
+                conn.execute("DELETE FROM entries WHERE digest = ?", (digest,))
+                total -= size_bytes
+                logger.debug(f"Evicted PDF cache entry {digest[:12]}")
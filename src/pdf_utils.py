@@ -1,43 +1,145 @@
-
 """
 Utility module for handling PDF files via PDFProcessor class.
+pypdf is imported when the first PDF is opened, not at startup.
 """
 import logging
-from pypdf import PdfReader
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List
+
+from src.pdf_cache import PDFTextCache
 
 logger = logging.getLogger(__name__)
 
+
+def _extract_page(page, index: int) -> str:
+    """
+    Extracts one page, falling back to plain mode if layout mode fails.
+
+    Returns:
+        str: The page text, or an empty string if both modes fail.
+    """
+    try:
+        return page.extract_text() or ""
+    except Exception as e:
+        logger.warning(f"Failed to extract text from page {index} (layout mode): {e}")
+        try:
+            return page.extract_text(extraction_mode="plain") or ""
+        except Exception as e2:
+            logger.error(f"Failed to extract text from page {index} (fallback mode): {e2}")
+            return ""
+
+
+def _extract_page_range(file_path: str, start: int, end: int) -> List[str]:
+    """
+    Extracts pages [start, end) of a PDF.
+
+    Runs in a worker process; each worker opens its own PdfReader.
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(file_path)
+    return [_extract_page(reader.pages[i], i) for i in range(start, end)]
+
+
 class PDFProcessor:
     """Class to handle PDF processing tasks."""
 
+    def __init__(self, workers: int = None, parallel_min_pages: int = 64,
+                 pages_per_task: int = 16, cache: PDFTextCache = None):
+        """
+        Initializes the PDFProcessor.
+
+        Args:
+            workers (int): Processes used for large PDFs. Defaults to the CPU count.
+            parallel_min_pages (int): PDFs with fewer pages are extracted in-process.
+            pages_per_task (int): Pages handed to a worker per task.
+            cache (PDFTextCache): Optional cache of extracted text.
+        """
+        self.cache = cache
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_min_pages = parallel_min_pages
+        self.pages_per_task = pages_per_task
+
+    def iter_pages(self, file_path: str) -> Iterator[str]:
+        """
+        Yields the text of each non-empty page, in order.
+
+        Large PDFs are split into page ranges extracted by a process pool.
+        Pages are yielded as soon as their range is done, so callers can
+        start consuming while later pages are still being extracted.
+
+        Args:
+            file_path (str): Path to the PDF file.
+
+        Yields:
+            str: Extracted text of one page.
+        """
+        from pypdf import PdfReader
+
+        reader = PdfReader(file_path)
+        page_count = len(reader.pages)
+
+        if self.workers <= 1 or page_count < self.parallel_min_pages:
+            for i, page in enumerate(reader.pages):
+                content = _extract_page(page, i)
+                if content:
+                    yield content
+            return
+
+        starts = list(range(0, page_count, self.pages_per_task))
+        ends = [min(start + self.pages_per_task, page_count) for start in starts]
+        logger.debug(f"Extracting {page_count} pages of {file_path} in {len(starts)} ranges")
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # map() returns results in submission order, so page order is kept.
+            for pages in pool.map(_extract_page_range, [file_path] * len(starts), starts, ends):
+                for content in pages:
+                    if content:
+                        yield content
+
+    def iter_text_chunks(self, file_path: str) -> Iterator[str]:
+        """
+        Yields pages with the separators extract_text puts between them.
+
+        "".join() of the chunks equals extract_text(file_path), which lets
+        TextAnalyzer.analyze_stream count a PDF while it is being extracted.
+
+        With a cache configured, a hit yields the cached text as a single
+        chunk without opening the PDF; a fully consumed miss is stored.
+        """
+        digest = None
+        if self.cache is not None:
+            digest = self.cache.digest_for(file_path)
+            cached = self.cache.get(digest)
+            if cached is not None:
+                if cached:
+                    yield cached
+                return
+
+        chunks = []
+        for i, content in enumerate(self.iter_pages(file_path)):
+            if i:
+                chunks.append("\n")
+                yield "\n"
+            chunks.append(content)
+            yield content
+
+        if digest is not None:
+            self.cache.put(digest, "".join(chunks))
+
     def extract_text(self, file_path: str) -> str:
         """
         Extracts text from a PDF file.
 
         Args:
             file_path (str): Path to the PDF file.
-            
+
         Returns:
             str: Extracted text content.
         """
         try:
-            reader = PdfReader(file_path)
-            text = []
-            for i, page in enumerate(reader.pages):
-                try:
-                    content = page.extract_text()
-                    if content:
-                        text.append(content)
-                except Exception as e:
-                    logger.warning(f"Failed to extract text from page {i} (layout mode): {e}")
-                    try:
-                        content = page.extract_text(extraction_mode="plain")
-                        if content:
-                            text.append(content)
-                    except Exception as e2:
-                        logger.error(f"Failed to extract text from page {i} (fallback mode): {e2}")
-                        continue
-            return "\n".join(text)
+            return "".join(self.iter_text_chunks(file_path))
         except Exception as e:
             logger.error(f"Error extracting PDF text: {e}")
             raise e
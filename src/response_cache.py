@@ -0,0 +1,117 @@
+"""
+Module for caching AI responses on disk via ResponseCache class.
+Entries are keyed by (model name, prompt kind, normalized text hash), expire
+after a TTL and are evicted least-recently-used first past a size bound.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+import unicodedata
+from contextlib import closing
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys: NFC, whitespace runs collapsed."""
+    return unicodedata.normalize("NFC", " ".join((text or "").split()))
+
+
+class ResponseCache:
+    """Class to persist AI responses with TTL expiry and LRU eviction."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            value TEXT NOT NULL,
+            created REAL NOT NULL,
+            last_access REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access);
+    """
+
+    def __init__(self, db_path: str = os.path.join("data", "ai_cache.sqlite3"),
+                 ttl_seconds: float = None, max_entries: int = None):
+        """
+        Initializes the ResponseCache.
+
+        Args:
+            db_path (str): Path of the SQLite cache file.
+            ttl_seconds (float): Entry lifetime. Defaults to the
+                AI_CACHE_TTL_HOURS environment variable, then 7 days.
+            max_entries (int): LRU bound. Defaults to AI_CACHE_MAX_ENTRIES,
+                then 10000.
+        """
+        self.db_path = db_path
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("AI_CACHE_TTL_HOURS", "168")) * 3600
+        if max_entries is None:
+            max_entries = int(os.getenv("AI_CACHE_MAX_ENTRIES", "10000"))
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        cache_dir = os.path.dirname(db_path)
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens a connection to the cache database."""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def make_key(model_name: str, kind: str, text: str) -> str:
+        """Builds the cache key for a prompt kind applied to a text."""
+        text_hash = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{model_name}:{kind}:{text_hash}"
+
+    def get(self, model_name: str, kind: str, text: str):
+        """
+        Returns the cached response, or None on a miss or an expired entry.
+        """
+        key = self.make_key(model_name, kind, text)
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] <= self.ttl_seconds:
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                self.hits += 1
+                logger.debug(f"AI cache hit for {kind}")
+                return json.loads(row[0])
+            if row:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+        self.misses += 1
+        return None
+
+    def set(self, model_name: str, kind: str, text: str, value) -> None:
+        """
+        Stores a response and trims the cache to max_entries.
+        """
+        key = self.make_key(model_name, kind, text)
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, kind, value, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, kind, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters for this process and the entry count."""
+        with closing(self._connect()) as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
@@ -0,0 +1,232 @@
+"""
+Module for quota-aware scheduling of AI requests.
+Provides token-bucket rate limiting (requests/min and tokens/min), retries with
+jittered exponential backoff on throttling and server errors, and an AIMD
+concurrency limiter via the RequestScheduler class.
+"""
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_CODES = (429,)
+RETRYABLE_CODES = (429, 500, 502, 503, 504)
+
+
+def _status_code(error: Exception):
+    """Returns the HTTP status carried by an API exception, if any."""
+    code = getattr(error, "code", None)
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_throttle(error: Exception) -> bool:
+    """Checks whether an error means the quota was exceeded (HTTP 429)."""
+    return _status_code(error) in THROTTLE_CODES
+
+
+def is_retryable(error: Exception) -> bool:
+    """Checks whether an error is worth retrying (429, 5xx, timeouts)."""
+    return _status_code(error) in RETRYABLE_CODES or isinstance(error, asyncio.TimeoutError)
+
+
+def full_jitter_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(max_delay, base_delay * 2^attempt)]."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float, capacity: float = None):
+        """
+        Initializes the TokenBucket.
+
+        Args:
+            per_minute (float): Refill rate in tokens per minute.
+            capacity (float): Burst size. Defaults to one minute of tokens.
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, amount: float) -> float:
+        """Takes tokens if available; otherwise returns the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Requests larger than the bucket could never fit; let them through
+            # once it is full instead of waiting forever.
+            amount = min(amount, self.capacity)
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.rate
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Waits until amount tokens are available and takes them."""
+        while True:
+            wait = self._take(amount)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit adjusted by additive increase, multiplicative decrease.
+
+    Every success raises the limit by about one slot per window of requests.
+    A throttling response cuts the limit by a factor, at most once per
+    cooldown, so one burst of 429s counts as one signal.
+    """
+
+    POLL_INTERVAL = 0.01
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 32,
+                 decrease_factor: float = 0.5, cooldown: float = 1.0):
+        """
+        Initializes the AIMDLimiter.
+
+        Args:
+            initial (int): Starting concurrency limit.
+            minimum (int): Lower bound for the limit.
+            maximum (int): Upper bound for the limit.
+            decrease_factor (float): Multiplier applied on throttling.
+            cooldown (float): Minimum seconds between two decreases.
+        """
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        """Waits for a free slot under the current limit."""
+        while True:
+            with self._lock:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+    def release(self) -> None:
+        """Frees a slot."""
+        with self._lock:
+            self.in_flight -= 1
+
+    def on_success(self) -> None:
+        """Additive increase."""
+        with self._lock:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+    def on_throttle(self) -> None:
+        """Multiplicative decrease."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.limit = max(self.minimum, self.limit * self.decrease_factor)
+            logger.info(f"Throttled: concurrency limit lowered to {int(self.limit)}")
+
+
+class RequestScheduler:
+    """Class to pace, bound and retry AI requests against quota limits."""
+
+    def __init__(self, requests_per_minute: float = 60, tokens_per_minute: float = 1_000_000,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0,
+                 limiter: AIMDLimiter = None):
+        """
+        Initializes the RequestScheduler.
+
+        Args:
+            requests_per_minute (float): Request quota.
+            tokens_per_minute (float): Input token quota.
+            max_retries (int): Retries after the first attempt.
+            base_delay (float): First backoff ceiling in seconds.
+            max_delay (float): Upper bound for any backoff.
+            limiter (AIMDLimiter): Adaptive concurrency limiter.
+        """
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.limiter = limiter or AIMDLimiter()
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0, "failed": 0}
+
+    @classmethod
+    def from_env(cls, max_concurrency: int = 8) -> "RequestScheduler":
+        """
+        Builds a scheduler from GEMINI_RPM, GEMINI_TPM and GEMINI_MAX_RETRIES.
+
+        Args:
+            max_concurrency (int): Starting and maximum concurrency limit.
+        """
+        return cls(
+            requests_per_minute=float(os.getenv("GEMINI_RPM", "60")),
+            tokens_per_minute=float(os.getenv("GEMINI_TPM", "1000000")),
+            max_retries=int(os.getenv("GEMINI_MAX_RETRIES", "5")),
+            limiter=AIMDLimiter(initial=max_concurrency, maximum=max_concurrency),
+        )
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt."""
+        return full_jitter_delay(attempt, self.base_delay, self.max_delay)
+
+    async def run(self, request: Callable[[], Awaitable], tokens: int = 1):
+        """
+        Runs a request once quota and concurrency allow, retrying transient errors.
+
+        Args:
+            request (Callable[[], Awaitable]): Starts the request; called
+                again for every attempt.
+            tokens (int): Estimated input tokens the request consumes.
+
+        Returns:
+            The request's result.
+
+        Raises:
+            Exception: The last error once retries are exhausted, or any
+                non-retryable error immediately.
+        """
+        attempt = 0
+        while True:
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(tokens)
+            await self.limiter.acquire()
+            self.stats["requests"] += 1
+            try:
+                result = await request()
+            except Exception as e:
+                if is_throttle(e):
+                    self.stats["throttled"] += 1
+                    self.limiter.on_throttle()
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    self.stats["failed"] += 1
+                    raise
+                delay = self.backoff_delay(attempt)
+                attempt += 1
+                self.stats["retries"] += 1
+                logger.warning(f"Retryable AI error ({e}); retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            else:
+                self.limiter.on_success()
+                return result
+            finally:
+                self.limiter.release()
+
+            await asyncio.sleep(delay)
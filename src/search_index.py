@@ -0,0 +1,167 @@
+"""
+Module for full-text search over the analysis history via SearchIndex class.
+Keeps a persistent inverted index (SQLite FTS5) of each record's full text
+and summary, updated as records are saved, and ranks matches with BM25.
+"""
+import logging
+import os
+import re
+import sqlite3
+from contextlib import closing
+from typing import Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# Summary matches weigh more than body matches: the summary is the gist.
+FULL_TEXT_WEIGHT = 1.0
+SUMMARY_WEIGHT = 2.0
+
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS documents (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    timestamp TEXT,
+    sentiment TEXT,
+    snippet TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    full_text, summary, content='', tokenize='unicode61 remove_diacritics 2'
+);
+INSERT INTO documents_fts (documents_fts, rank) VALUES ('rank', 'bm25({FULL_TEXT_WEIGHT}, {SUMMARY_WEIGHT})');
+"""
+
+
+def build_match_query(query: str) -> str:
+    """
+    Translates a user query into an FTS5 MATCH expression.
+
+    Bare words are terms, "double quoted" words are phrases and a trailing
+    '*' makes a term a prefix. All parts must match. Everything is quoted, so
+    user input never reaches FTS5 as operators.
+
+    Raises:
+        ValueError: If the query has no searchable terms.
+    """
+    parts = []
+    for phrase, term in QUERY_PATTERN.findall(query):
+        prefix = term.endswith("*") and len(term) > 1
+        text = (phrase or term.rstrip("*")).strip()
+        if not text:
+            continue
+        quoted = '"' + text.replace('"', '""') + '"'
+        parts.append(quoted + " *" if prefix else quoted)
+    if not parts:
+        raise ValueError("Search query is empty.")
+    return " ".join(parts)
+
+
+class SearchIndex:
+    """Class to index and search analysis records by their text."""
+
+    def __init__(self, db_path: str):
+        """
+        Initializes the SearchIndex and creates its tables if needed.
+
+        Args:
+            db_path (str): Path of the SQLite index file.
+
+        Raises:
+            sqlite3.OperationalError: If SQLite was built without FTS5.
+        """
+        self.db_path = db_path
+        with closing(self._connect()) as conn, conn:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'documents_fts'"
+            ).fetchone()
+            if not exists:
+                conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens a connection to the index file."""
+        return sqlite3.connect(self.db_path)
+
+    def is_empty(self) -> bool:
+        """Checks whether no record has been indexed yet."""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT 1 FROM documents LIMIT 1").fetchone() is None
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def add(self, record: dict) -> None:
+        """Indexes one saved record."""
+        self.add_many([record])
+
+    def add_many(self, records: Iterable[dict]) -> int:
+        """
+        Indexes saved records in a single transaction.
+
+        Records already in the index (same id) are skipped, so replaying a
+        history is safe.
+
+        Returns:
+            int: The number of records newly indexed.
+        """
+        added = 0
+        with closing(self._connect()) as conn, conn:
+            for record in records:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO documents (id, timestamp, sentiment, snippet) VALUES (?, ?, ?, ?)",
+                    (record["id"], record.get("timestamp"), record.get("sentiment"), record.get("text", "")),
+                )
+                if not cursor.rowcount:
+                    continue
+                conn.execute(
+                    "INSERT INTO documents_fts (rowid, full_text, summary) VALUES (?, ?, ?)",
+                    (cursor.lastrowid, record.get("full_text") or record.get("text", ""),
+                     record.get("summary") or ""),
+                )
+                added += 1
+        return added
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        """
+        Finds the records matching a query, best first.
+
+        Args:
+            query (str): Terms and "quoted phrases"; see build_match_query.
+            limit (int): Maximum number of results.
+
+        Returns:
+            List[dict]: Results with id, timestamp, sentiment, text (the
+            stored snippet) and score (BM25, higher is better).
+
+        Raises:
+            ValueError: If the query has no searchable terms.
+        """
+        match = build_match_query(query)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT d.id, d.timestamp, d.sentiment, d.snippet, hits.rank "
+                "FROM (SELECT rowid, rank FROM documents_fts WHERE documents_fts MATCH ? "
+                "      ORDER BY rank LIMIT ?) AS hits "
+                "JOIN documents d ON d.rowid = hits.rowid ORDER BY hits.rank",
+                (match, limit),
+            ).fetchall()
+        # FTS5 ranks are negated BM25 scores (lower sorts first).
+        return [
+            {"id": row[0], "timestamp": row[1], "sentiment": row[2], "text": row[3], "score": -row[4]}
+            for row in rows
+        ]
+
+
+def create_search_index(data_dir: str, filename: str = "search_index.sqlite3"):
+    """
+    Opens the search index stored in data_dir.
+
+    Returns:
+        SearchIndex: The index, or None if this SQLite build lacks FTS5.
+    """
+    try:
+        return SearchIndex(os.path.join(data_dir, filename))
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Full-text search disabled: {e}")
+        return None
@@ -0,0 +1,161 @@
+"""
+Module for choosing between local and Gemini sentiment via SentimentRouter class.
+Supports three engines: 'gemini' (local scoring only as a fallback), 'local'
+(no AI sentiment requests) and 'hybrid' (local first, escalating texts the
+lexicon is unsure about). A circuit breaker stops AI calls while the API is
+failing, and the local engine answers in the meantime.
+"""
+import logging
+import os
+from typing import List
+
+from src.aggregation import VALID_SENTIMENTS
+from src.circuit_breaker import CircuitBreaker
+from src.lexicon_sentiment import LexiconSentimentAnalyzer
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT_ENGINES = ("gemini", "local", "hybrid")
+
+# Sentiment markers returned by GeminiClient when the service itself failed
+# (as opposed to blocked or unparseable replies).
+SERVICE_ERRORS = ("API ERROR", "TIMEOUT", "ERROR")
+
+# Packing limits of batch runs without an AI client (local-only mode).
+LOCAL_BATCH_TOKEN_BUDGET = 8000
+LOCAL_BATCH_MAX_ITEMS = 50
+
+
+class SentimentRouter:
+    """Class to route sentiment requests to the local engine or Gemini."""
+
+    def __init__(self, client, engine: str = None, local: LexiconSentimentAnalyzer = None,
+                 breaker: CircuitBreaker = None, accept_confidence: tuple = ("HIGH",)):
+        """
+        Initializes the SentimentRouter.
+
+        Args:
+            client: A GeminiClient, or None to never send AI requests
+                (local-only mode; the engine should then be 'local').
+            engine (str): 'gemini', 'local' or 'hybrid'. Defaults to
+                SENTIMENT_ENGINE from env, then 'gemini'.
+            local (LexiconSentimentAnalyzer): The offline engine.
+            breaker (CircuitBreaker): Guards the AI requests.
+            accept_confidence (tuple): Local confidences kept without
+                escalation in hybrid mode.
+        """
+        self.client = client
+        self.engine = (engine or os.getenv("SENTIMENT_ENGINE", "gemini")).lower()
+        if self.engine not in SENTIMENT_ENGINES:
+            raise ValueError(f"Unknown sentiment engine '{self.engine}'. "
+                             f"Choose from: {', '.join(SENTIMENT_ENGINES)}")
+        self.local = local or LexiconSentimentAnalyzer()
+        self.breaker = breaker or CircuitBreaker()
+        self.accept_confidence = accept_confidence
+        self.stats = {"local": 0, "gemini": 0, "fallback": 0}
+
+    # BatchRunner reads the packing limits from its ai_client.
+    @property
+    def batch_token_budget(self) -> int:
+        return self.client.batch_token_budget if self.client else LOCAL_BATCH_TOKEN_BUDGET
+
+    @property
+    def batch_max_items(self) -> int:
+        return self.client.batch_max_items if self.client else LOCAL_BATCH_MAX_ITEMS
+
+    def _ai_ready(self) -> bool:
+        """Checks whether an AI request may be sent right now."""
+        return self.client is not None and self.client.backend.available and self.breaker.allow()
+
+    def _unavailable_summary(self) -> str:
+        """Summary placeholder when no AI request is sent."""
+        if self.client is None:
+            return "AI Summary Unavailable (Local Only)"
+        if not self.client.backend.available:
+            return "AI Summary Unavailable (No Key)"
+        return "AI Summary Unavailable (Circuit Open)"
+
+    def _keep_local(self, result: dict) -> bool:
+        """Checks whether a local result is final for the current engine."""
+        return self.engine == "local" or (self.engine == "hybrid" and result["confidence"] in self.accept_confidence)
+
+    def _summarize(self, text: str) -> str:
+        """Requests only the summary, honouring the circuit breaker."""
+        if not self._ai_ready():
+            return self._unavailable_summary()
+        summary = self.client.generate_summary(text)
+        if summary == "Summary Error":
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return summary
+
+    def analyze(self, text: str) -> tuple:
+        """
+        Gets sentiment and summary for one text.
+
+        Returns:
+            tuple: (sentiment dict, summary str)
+        """
+        local_result = None
+        if self.engine != "gemini":
+            local_result = self.local.analyze(text)
+            if self._keep_local(local_result):
+                self.stats["local"] += 1
+                return local_result, self._summarize(text)
+
+        if not self._ai_ready():
+            self.stats["fallback"] += 1
+            return local_result or self.local.analyze(text), self._unavailable_summary()
+
+        ai_result, summary = self.client.analyze(text)
+        if ai_result["sentiment"] in SERVICE_ERRORS:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+        if ai_result["sentiment"] in VALID_SENTIMENTS:
+            self.stats["gemini"] += 1
+            return ai_result, summary
+
+        logger.warning(f"AI sentiment unusable ({ai_result['sentiment']}), using local engine.")
+        self.stats["fallback"] += 1
+        return local_result or self.local.analyze(text), summary
+
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[dict]:
+        """
+        Gets sentiment for many texts; only those the engine escalates reach Gemini.
+
+        Returns:
+            List[dict]: One sentiment dict per text, in input order.
+        """
+        local_results = [None] * len(texts)
+        if self.engine != "gemini":
+            local_results = self.local.analyze_many(texts)
+
+        results = list(local_results)
+        pending = []
+        for i, result in enumerate(local_results):
+            if result is not None and self._keep_local(result):
+                self.stats["local"] += 1
+            else:
+                pending.append(i)
+        if not pending:
+            return results
+
+        ai_results = [None] * len(pending)
+        if self._ai_ready():
+            ai_results = self.client.analyze_sentiment_batch([texts[i] for i in pending])
+            if any(result["sentiment"] in SERVICE_ERRORS for result in ai_results):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+        for i, ai_result in zip(pending, ai_results):
+            if ai_result is not None and ai_result["sentiment"] in VALID_SENTIMENTS:
+                self.stats["gemini"] += 1
+                results[i] = ai_result
+            else:
+                self.stats["fallback"] += 1
+                results[i] = local_results[i] or self.local.analyze(texts[i])
+        return results
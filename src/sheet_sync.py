@@ -0,0 +1,305 @@
+"""
+Module for incremental Google Sheets sync via SheetSync class.
+Remembers the last record exported to each sheet and appends only the newer
+ones, in batches bounded by rows and bytes, retrying throttled or failed
+requests with backoff. A local fake backend stands in for Google Sheets in
+tests and benchmarks.
+"""
+import json
+import logging
+import os
+import random
+import time
+from typing import Callable, Dict, Iterable, List
+
+from src.exporter import COLUMNAR_DEFAULT_COLUMNS
+from src.scheduler import full_jitter_delay, is_retryable
+
+logger = logging.getLogger(__name__)
+
+SHEET_BACKENDS = ("gspread", "fake")
+
+# Google Sheets rejects cells longer than 50000 characters; same cut as to_google_sheet.
+MAX_CELL_CHARS = 30000
+TRUNCATION_MARK = "... [TRUNCATED]"
+
+# Bounds of one append request.
+BATCH_ROWS = 500
+MAX_BATCH_BYTES = 2 * 1024 * 1024
+
+
+class FakeSheetError(Exception):
+    """API error raised by FakeWorksheet, with an HTTP status like gspread's APIError."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+
+
+class FakeWorksheet:
+    """Local stand-in for a gspread Worksheet, persisted as one JSON line per row."""
+
+    def __init__(self, path: str, latency: float = None, error_rate: float = None,
+                 max_payload_bytes: int = None, seed: int = None):
+        """
+        Initializes the FakeWorksheet.
+
+        Args:
+            path (str): File holding the rows.
+            latency (float): Seconds added to every request. Defaults to
+                FAKE_SHEETS_LATENCY_MS from env, then 0.
+            error_rate (float): Share of requests failing with 429 or 503.
+                Defaults to FAKE_SHEETS_ERROR_RATE from env, then 0.
+            max_payload_bytes (int): Larger appends fail with 400, like the
+                real API's request size limit. Defaults to 10 MB.
+            seed (int): Seed of the simulated failures.
+        """
+        self.path = path
+        self.latency = latency if latency is not None else float(os.getenv("FAKE_SHEETS_LATENCY_MS", "0")) / 1000
+        self.error_rate = error_rate if error_rate is not None else float(os.getenv("FAKE_SHEETS_ERROR_RATE", "0"))
+        self.max_payload_bytes = max_payload_bytes or 10 * 1024 * 1024
+        self.requests = 0
+        self._random = random.Random(seed)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    @property
+    def url(self) -> str:
+        return f"file://{os.path.abspath(self.path)}"
+
+    def _request(self) -> None:
+        """Simulates the latency and transient failures of one API call."""
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self._random.random() < self.error_rate:
+            raise FakeSheetError(self._random.choice((429, 503)), "Simulated transient failure")
+
+    def get_all_values(self) -> List[list]:
+        self._request()
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def row_values(self, row: int) -> list:
+        rows = self.get_all_values()
+        return rows[row - 1] if len(rows) >= row else []
+
+    def clear(self) -> None:
+        self._request()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def append_row(self, values: list, value_input_option: str = "RAW") -> None:
+        self.append_rows([values], value_input_option=value_input_option)
+
+    def append_rows(self, values: List[list], value_input_option: str = "RAW") -> None:
+        self._request()
+        lines = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in values)
+        if len(lines.encode("utf-8")) > self.max_payload_bytes:
+            raise FakeSheetError(400, "Request payload size exceeds the limit")
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+def open_worksheet(sheet_name: str, backend: str = None, credentials_path: str = None,
+                   fake_dir: str = "data/fake_sheets"):
+    """
+    Opens the first worksheet of a spreadsheet.
+
+    Args:
+        sheet_name (str): Name of the spreadsheet.
+        backend (str): 'gspread' or 'fake'. Defaults to SHEETS_BACKEND from
+            env, then 'gspread'.
+        credentials_path (str): Service account file for gspread. Defaults
+            to GOOGLE_CREDENTIALS_PATH from env, then credentials.json.
+        fake_dir (str): Where the fake backend keeps its sheets.
+
+    Raises:
+        FileNotFoundError: If the credentials file is missing.
+        ValueError: If the backend is unknown or the spreadsheet is not found.
+    """
+    backend = (backend or os.getenv("SHEETS_BACKEND", "gspread")).lower()
+    if backend not in SHEET_BACKENDS:
+        raise ValueError(f"Unknown sheets backend '{backend}'. Choose one of: {', '.join(SHEET_BACKENDS)}")
+    if backend == "fake":
+        return FakeWorksheet(os.path.join(fake_dir, f"{sheet_name}.jsonl"))
+
+    if not credentials_path:
+        credentials_path = os.getenv("GOOGLE_CREDENTIALS_PATH", "credentials.json")
+    if not os.path.exists(credentials_path):
+        raise FileNotFoundError(f"Credentials file not found at: {credentials_path}. See GOOGLE_SETUP.md")
+
+    import gspread
+
+    gc = gspread.service_account(filename=credentials_path)
+    try:
+        return gc.open(sheet_name).get_worksheet(0)
+    except gspread.SpreadsheetNotFound:
+        raise ValueError(f"Spreadsheet '{sheet_name}' not found. Did you share it with the bot email?")
+
+
+def _cell(value):
+    """Converts a record value to a sheet cell, truncating overlong text."""
+    if value is None:
+        return ""
+    if isinstance(value, str) and len(value) > MAX_CELL_CHARS:
+        return value[:MAX_CELL_CHARS] + TRUNCATION_MARK
+    return value
+
+
+class SheetSync:
+    """Class to append new history records to a sheet, remembering what was sent."""
+
+    def __init__(self, worksheet, sheet_name: str, state_path: str = "data/sheet_sync_state.json",
+                 columns: List[str] = None, batch_rows: int = BATCH_ROWS,
+                 max_batch_bytes: int = MAX_BATCH_BYTES, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 60.0):
+        """
+        Initializes the SheetSync.
+
+        Args:
+            worksheet: A gspread Worksheet or a FakeWorksheet.
+            sheet_name (str): Key of this sheet in the state file.
+            state_path (str): JSON file with the sync position of every sheet.
+            columns (List[str]): Record fields to sync (default: every stored
+                field except full_text).
+            batch_rows (int): Maximum rows per append request.
+            max_batch_bytes (int): Maximum encoded size of one append request.
+            max_retries (int): Retries of a failed request before giving up.
+            base_delay (float): First backoff ceiling in seconds.
+            max_delay (float): Upper bound for any backoff.
+        """
+        self.worksheet = worksheet
+        self.sheet_name = sheet_name
+        self.state_path = state_path
+        self.columns = list(columns or COLUMNAR_DEFAULT_COLUMNS)
+        self.batch_rows = batch_rows
+        self.max_batch_bytes = max_batch_bytes
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def _load_states(self) -> Dict[str, dict]:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            logger.error(f"Corrupted sync state at {self.state_path}, ignoring it")
+            return {}
+
+    def load_state(self):
+        """Returns the sync position of this sheet, or None if it was never synced."""
+        return self._load_states().get(self.sheet_name)
+
+    def _save_state(self, state) -> None:
+        """Writes this sheet's position atomically, keeping the other sheets'."""
+        states = self._load_states()
+        if state is None:
+            states.pop(self.sheet_name, None)
+        else:
+            states[self.sheet_name] = state
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        temp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(states, f, indent=4)
+        os.replace(temp_path, self.state_path)
+
+    def _call(self, request: Callable, *args, **kwargs):
+        """Runs one API request, retrying throttling and server errors with backoff."""
+        attempt = 0
+        while True:
+            try:
+                return request(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    raise
+                delay = full_jitter_delay(attempt, self.base_delay, self.max_delay)
+                logger.warning(f"Sheet request failed ({e}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+
+    def _pending(self, records: Iterable[Dict], state) -> List[Dict]:
+        """Collects the records newer than the last synced one, oldest first."""
+        pending = []
+        for record in records:
+            if state and (record.get("id") == state["last_id"]
+                          or (record.get("timestamp") or "") < state["last_timestamp"]):
+                break
+            pending.append(record)
+        pending.reverse()
+        return pending
+
+    def _batches(self, rows: List[list]):
+        """Groups rows into append requests bounded by batch_rows and max_batch_bytes."""
+        batch, size = [], 0
+        for row in rows:
+            row_size = len(json.dumps(row, ensure_ascii=False).encode("utf-8"))
+            if batch and (len(batch) >= self.batch_rows or size + row_size > self.max_batch_bytes):
+                yield batch
+                batch, size = [], 0
+            batch.append(row)
+            size += row_size
+        if batch:
+            yield batch
+
+    def sync(self, records: Iterable[Dict], full: bool = False,
+             progress: Callable[[int], None] = None) -> int:
+        """
+        Appends the records not yet in the sheet.
+
+        The position is saved after every batch, so an interrupted sync
+        resumes where it stopped instead of starting over.
+
+        Args:
+            records (Iterable[Dict]): The history, newest first (as returned
+                by storage.iter_history()). Only the records newer than the
+                last synced one are read.
+            full (bool): Clear the sheet and upload the whole history again.
+            progress (Callable[[int], None]): Called with the number of rows
+                appended so far after every batch.
+
+        Returns:
+            int: The number of rows appended.
+
+        Raises:
+            ValueError: If the sheet has rows this sync did not write, or
+                was synced with other columns; run with full=True.
+        """
+        state = None if full else self.load_state()
+        if full:
+            self._call(self.worksheet.clear)
+            self._save_state(None)
+        elif state is None:
+            if self._call(self.worksheet.row_values, 1):
+                raise ValueError(f"Sheet '{self.sheet_name}' already has rows but no sync state. "
+                                 f"Run a full resync to rewrite it.")
+        elif state.get("columns") != self.columns:
+            raise ValueError(f"Sheet '{self.sheet_name}' was synced with other columns. "
+                             f"Run a full resync to rewrite it.")
+
+        pending = self._pending(records, state)
+        if not pending:
+            logger.info(f"Sheet '{self.sheet_name}' is up to date")
+            return 0
+
+        if state is None:
+            self._call(self.worksheet.append_row, self.columns, value_input_option="RAW")
+            state = {"columns": self.columns, "last_id": None, "last_timestamp": "", "rows": 0}
+
+        rows = [[_cell(record.get(column)) for column in self.columns] for record in pending]
+        sent = 0
+        for batch in self._batches(rows):
+            self._call(self.worksheet.append_rows, batch, value_input_option="RAW")
+            last = pending[sent + len(batch) - 1]
+            sent += len(batch)
+            state = dict(state, last_id=last.get("id"), last_timestamp=last.get("timestamp") or "",
+                         rows=state["rows"] + len(batch))
+            self._save_state(state)
+            if progress:
+                progress(sent)
+
+        logger.info(f"Synced {sent} rows to sheet '{self.sheet_name}'")
+        return sent
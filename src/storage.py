@@ -1,29 +1,55 @@
-
 """
 Module for data persistence.
-Handles saving and retrieving analysis results via StorageManager class.
+Handles saving and retrieving analysis results via StorageManager class,
+with JSON Lines journal and SQLite engines selectable through create_storage.
+Document bodies (full_text) live in a compressed, content-addressed BlobStore;
+stored records reference them by content_hash and load them on demand.
+Every engine keeps the search, near-duplicate and similarity indexes up to date.
 """
 import json
 import os
+import sqlite3
+import sys
 import uuid
+from contextlib import closing
 from datetime import datetime
 import logging
 
+from src.blob_store import BlobStore, content_hash
+from src.near_duplicate import NearDuplicateIndex
+from src.search_index import create_search_index
+from src.vector_index import VectorIndex
+
 logger = logging.getLogger(__name__)
 
-class StorageManager:
-    """Class to handle database operations (save/load)."""
+STORAGE_ENGINES = ("json", "journal", "sqlite")
 
-    def __init__(self, data_dir: str = "data", db_filename: str = "db.json"):
+def build_analysis_record(text: str, summary: str, local_stats: dict, ai_result: dict) -> dict:
+    """Assembles the record stored for one analysed document."""
+    return {
+        "text": text[:100] + "..." if len(text) > 100 else text,
+        "full_text": text,
+        "summary": summary,
+        **local_stats,
+        **ai_result
+    }
+
+class BaseStorage:
+    """Shared plumbing for the storage engines (data dir, record stamping)."""
+
+    def __init__(self, data_dir: str = "data"):
         """
-        Initializes the StorageManager.
-        
+        Initializes the storage engine.
+
         Args:
             data_dir (str): Directory to store data.
-            db_filename (str): Name of the JSON database file.
         """
         self.data_dir = data_dir
-        self.db_file = os.path.join(data_dir, db_filename)
+        self.blob_store = BlobStore(os.path.join(data_dir, "blobs"))
+        self.search_index = None
+        self.duplicate_index = None
+        self.vector_index = None
+        self._indexes = []
         self._ensure_data_dir()
 
     def _ensure_data_dir(self):
@@ -31,6 +57,133 @@ class StorageManager:
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
 
+    def _prepare_record(self, data: dict) -> dict:
+        """Returns a copy of data stamped with a new id and timestamp."""
+        record = data.copy()
+        record["id"] = str(uuid.uuid4())
+        record["timestamp"] = datetime.now().isoformat()
+        return record
+
+    def _externalize(self, record: dict) -> dict:
+        """
+        Returns the form of record that is written to the database.
+
+        full_text is moved to the blob store and replaced by its content_hash;
+        records without an inline full_text are returned unchanged.
+        """
+        if "full_text" not in record:
+            return record
+        stored = {key: value for key, value in record.items() if key != "full_text"}
+        stored["content_hash"] = self.blob_store.put(record["full_text"])
+        return stored
+
+    def load_full_text(self, record: dict) -> str:
+        """
+        Returns the full text of a stored record, reading its blob if needed.
+
+        Falls back to the snippet when the blob is missing.
+        """
+        if "full_text" in record:
+            return record["full_text"]
+        digest = record.get("content_hash")
+        if digest:
+            try:
+                return self.blob_store.get(digest)
+            except KeyError:
+                logger.warning(f"Missing blob {digest[:12]} for record {record.get('id')}")
+        return record.get("text", "")
+
+    def with_full_text(self, records):
+        """
+        Yields copies of records with full_text (and content_hash) filled in.
+
+        For exports that need document bodies; texts are read one record
+        at a time.
+        """
+        for record in records:
+            full = dict(record)
+            full["full_text"] = self.load_full_text(record)
+            full.setdefault("content_hash", content_hash(full["full_text"]))
+            yield full
+
+    def attach_index(self, index) -> None:
+        """
+        Keeps a secondary index (search, near-duplicates, vectors) updated on every save.
+
+        The index must provide is_empty() and add_many(records). A new,
+        empty index is first filled from the existing history.
+        """
+        self._indexes.append(index)
+        if index.is_empty():
+            history = self.get_history(limit=sys.maxsize)
+            if history:
+                added = index.add_many(self.with_full_text(reversed(history)))
+                logger.info(f"Indexed {added} existing records in {type(index).__name__}")
+
+    def _index_records(self, records: list) -> None:
+        """Adds freshly saved records to the attached indexes."""
+        for index in self._indexes:
+            try:
+                index.add_many(records)
+            except sqlite3.Error as e:
+                logger.error(f"Error updating {type(index).__name__}: {e}")
+
+    def get_record(self, record_id: str):
+        """
+        Retrieves one record by ID, or None if it does not exist.
+
+        Engines with a keyed lookup override this full scan.
+        """
+        return next((record for record in self.get_history(limit=sys.maxsize)
+                     if record.get("id") == record_id), None)
+
+    def save_analysis(self, data: dict) -> str:
+        """Saves a new analysis result and returns its ID."""
+        raise NotImplementedError
+
+    def save_many(self, items: list) -> list:
+        """
+        Saves several analysis results as one grouped commit.
+
+        Engines override this to pay their write cost once per group
+        instead of once per record.
+
+        Args:
+            items (list): The analysis data dicts to save.
+
+        Returns:
+            list: The IDs of the saved records, in input order.
+        """
+        return [self.save_analysis(data) for data in items]
+
+    def get_history(self, limit: int = 5) -> list:
+        """Retrieves the most recent analyses, newest first."""
+        raise NotImplementedError
+
+    def iter_history(self):
+        """
+        Yields every record, newest first.
+
+        Engines that can read their history incrementally override this;
+        the default materializes it with get_history.
+        """
+        yield from self.get_history(limit=sys.maxsize)
+
+
+class StorageManager(BaseStorage):
+    """Class to handle database operations (save/load)."""
+
+    def __init__(self, data_dir: str = "data", db_filename: str = "db.json"):
+        """
+        Initializes the StorageManager.
+        
+        Args:
+            data_dir (str): Directory to store data.
+            db_filename (str): Name of the JSON database file.
+        """
+        super().__init__(data_dir)
+        self.db_file = os.path.join(data_dir, db_filename)
+
     def _load_db(self) -> list:
         """Loads the database from the JSON file."""
         if not os.path.exists(self.db_file):
@@ -45,6 +198,7 @@ class StorageManager:
     def _save_db(self, data: list) -> None:
         """Saves the database to the JSON file."""
         try:
+            data = [self._externalize(record) for record in data]
             with open(self.db_file, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=4, ensure_ascii=False)
         except IOError as e:
@@ -60,20 +214,461 @@ class StorageManager:
         Returns:
             str: The ID of the saved record.
         """
-        record = data.copy()
-        record["id"] = str(uuid.uuid4())
-        record["timestamp"] = datetime.now().isoformat()
+        record = self._prepare_record(data)
         
         current_db = self._load_db()
         current_db.append(record)
         self._save_db(current_db)
+        self._index_records([record])
         
         logger.debug(f"Saved analysis record: {record['id']}")
         return record["id"]
 
+    def save_many(self, items: list) -> list:
+        """
+        Saves several analysis results with a single load/rewrite of the file.
+        """
+        records = [self._prepare_record(data) for data in items]
+
+        current_db = self._load_db()
+        current_db.extend(records)
+        self._save_db(current_db)
+        self._index_records(records)
+
+        logger.debug(f"Saved {len(records)} analysis records")
+        return [record["id"] for record in records]
+
     def get_history(self, limit: int = 5) -> list:
         """
         Retrieves the most recent analyses.
         """
         current_db = self._load_db()
         return current_db[-limit:][::-1]
+
+
+class JournalStorageManager(BaseStorage):
+    """
+    Append-only JSON Lines storage engine.
+
+    Each save appends a single line to the journal, so writes cost O(record)
+    instead of rewriting the whole history. History is read backwards from
+    the end of the file, touching only the blocks that hold the newest records.
+    """
+
+    READ_BLOCK_SIZE = 64 * 1024
+
+    def __init__(self, data_dir: str = "data", journal_filename: str = "db.jsonl"):
+        """
+        Initializes the JournalStorageManager.
+
+        Args:
+            data_dir (str): Directory to store data.
+            journal_filename (str): Name of the JSON Lines journal file.
+        """
+        super().__init__(data_dir)
+        self.journal_file = os.path.join(data_dir, journal_filename)
+
+    def _append_lines(self, records: list) -> None:
+        """Appends records to the journal with a single write call."""
+        payload = "".join(
+            json.dumps(self._externalize(record), ensure_ascii=False) + "\n" for record in records
+        )
+        if self._has_torn_tail():
+            # Terminate a line left half-written by a crash so it does not
+            # swallow the record appended after it.
+            payload = "\n" + payload
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+
+    def _has_torn_tail(self) -> bool:
+        """Checks whether the journal ends without a trailing newline."""
+        if not os.path.exists(self.journal_file) or os.path.getsize(self.journal_file) == 0:
+            return False
+        with open(self.journal_file, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def _iter_lines_reversed(self):
+        """Yields raw journal lines (bytes) from the last one to the first."""
+        if not os.path.exists(self.journal_file):
+            return
+
+        with open(self.journal_file, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            remainder = b""
+            while position > 0:
+                read_size = min(self.READ_BLOCK_SIZE, position)
+                position -= read_size
+                f.seek(position)
+                block = f.read(read_size) + remainder
+                lines = block.split(b"\n")
+                # The first piece may be the tail of a line that starts in an
+                # earlier block, so keep it until that block has been read.
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line
+            if remainder.strip():
+                yield remainder
+
+    def save_analysis(self, data: dict) -> str:
+        """
+        Appends a new analysis result to the journal.
+
+        Args:
+            data (dict): The analysis data to save.
+
+        Returns:
+            str: The ID of the saved record.
+        """
+        record = self._prepare_record(data)
+        try:
+            self._append_lines([record])
+            self._index_records([record])
+        except IOError as e:
+            logger.error(f"Error appending to journal: {e}")
+
+        logger.debug(f"Saved analysis record: {record['id']}")
+        return record["id"]
+
+    def save_many(self, items: list) -> list:
+        """
+        Appends several analysis results to the journal in one write.
+
+        Unlike save_analysis, write errors are raised so the caller knows
+        the whole group is not persisted.
+        """
+        records = [self._prepare_record(data) for data in items]
+        self._append_lines(records)
+        self._index_records(records)
+
+        logger.debug(f"Saved {len(records)} analysis records")
+        return [record["id"] for record in records]
+
+    def get_history(self, limit: int = 5) -> list:
+        """
+        Retrieves the most recent analyses by reading the journal backwards.
+        """
+        history = []
+        if limit <= 0:
+            return history
+
+        try:
+            for record in self.iter_history():
+                history.append(record)
+                if len(history) >= limit:
+                    break
+        except IOError as e:
+            logger.error(f"Error reading journal: {e}")
+        return history
+
+    def iter_history(self):
+        """
+        Streams every record, newest first, one journal block at a time.
+        """
+        for line in self._iter_lines_reversed():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                # A crash mid-append can leave a torn final line behind.
+                logger.warning(f"Skipping corrupt journal line: {e}")
+
+    def migrate_from_json(self, json_path: str = None) -> int:
+        """
+        One-time migration of a legacy db.json array into the journal.
+
+        The legacy file is renamed to '<name>.migrated' afterwards so the
+        migration is not repeated. Nothing happens if the journal already
+        contains data.
+
+        Args:
+            json_path (str): Path of the legacy JSON database.
+                Defaults to 'db.json' in the data directory.
+
+        Returns:
+            int: The number of records migrated.
+        """
+        json_path = json_path or os.path.join(self.data_dir, "db.json")
+        if not os.path.exists(json_path):
+            return 0
+
+        if os.path.exists(self.journal_file) and os.path.getsize(self.journal_file) > 0:
+            logger.warning(f"Journal {self.journal_file} is not empty, skipping migration.")
+            return 0
+
+        with open(json_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+
+        if not isinstance(records, list):
+            raise ValueError(f"Expected a JSON array in {json_path}")
+
+        self._append_lines(records)
+        os.replace(json_path, json_path + ".migrated")
+
+        logger.info(f"Migrated {len(records)} records from {json_path} to {self.journal_file}")
+        return len(records)
+
+
+class SQLiteStorageManager(BaseStorage):
+    """
+    SQLite storage engine with indexed history queries.
+
+    Records are stored as JSON next to indexed columns (timestamp, sentiment,
+    content hash), so history views can filter and paginate without parsing
+    the whole database. The file runs in WAL mode so readers do not block
+    the writer.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS analyses (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            timestamp TEXT NOT NULL,
+            sentiment TEXT,
+            content_hash TEXT,
+            record TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_analyses_timestamp ON analyses (timestamp, seq);
+        CREATE INDEX IF NOT EXISTS idx_analyses_sentiment ON analyses (sentiment, timestamp, seq);
+        CREATE INDEX IF NOT EXISTS idx_analyses_content_hash ON analyses (content_hash);
+    """
+
+    def __init__(self, data_dir: str = "data", db_filename: str = "db.sqlite3"):
+        """
+        Initializes the SQLiteStorageManager.
+
+        Args:
+            data_dir (str): Directory to store data.
+            db_filename (str): Name of the SQLite database file.
+        """
+        super().__init__(data_dir)
+        self.db_file = os.path.join(data_dir, db_filename)
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens a connection to the database."""
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_schema(self):
+        """Creates tables and indexes and switches the file to WAL mode."""
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+
+    def _to_row(self, record: dict) -> tuple:
+        """Maps a record to the column values of the analyses table."""
+        record = self._externalize(record)
+        return (
+            record["id"],
+            record["timestamp"],
+            record.get("sentiment"),
+            record.get("content_hash") or content_hash(record.get("text", "")),
+            json.dumps(record, ensure_ascii=False),
+        )
+
+    def _insert(self, records: list) -> None:
+        """Inserts records in a single transaction."""
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT INTO analyses (id, timestamp, sentiment, content_hash, record) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [self._to_row(record) for record in records],
+            )
+
+    def save_analysis(self, data: dict) -> str:
+        """
+        Saves a new analysis result to the database.
+
+        Args:
+            data (dict): The analysis data to save.
+
+        Returns:
+            str: The ID of the saved record.
+        """
+        record = self._prepare_record(data)
+        try:
+            self._insert([record])
+            self._index_records([record])
+        except sqlite3.Error as e:
+            logger.error(f"Error saving to SQLite database: {e}")
+
+        logger.debug(f"Saved analysis record: {record['id']}")
+        return record["id"]
+
+    def save_many(self, items: list) -> list:
+        """
+        Inserts several analysis results in a single transaction.
+
+        Unlike save_analysis, errors are raised so the caller knows the
+        whole group was rolled back.
+        """
+        records = [self._prepare_record(data) for data in items]
+        self._insert(records)
+        self._index_records(records)
+
+        logger.debug(f"Saved {len(records)} analysis records")
+        return [record["id"] for record in records]
+
+    def get_history(self, limit: int = 5) -> list:
+        """
+        Retrieves the most recent analyses.
+        """
+        records, _ = self.query_history(limit=limit)
+        return records
+
+    def iter_history(self, page_size: int = 1000):
+        """
+        Streams every record, newest first, one keyset page at a time.
+        """
+        cursor = None
+        while True:
+            records, cursor = self.query_history(limit=page_size, cursor=cursor)
+            yield from records
+            if cursor is None:
+                return
+
+    def query_history(self, limit: int = 20, sentiment: str = None,
+                      date_from: str = None, date_to: str = None,
+                      cursor: tuple = None) -> tuple:
+        """
+        Filters history by sentiment and date range, newest first.
+
+        Pagination is keyset based: pass the returned cursor back in to get
+        the next page. Every page is an index range scan, so deep pages cost
+        the same as the first one.
+
+        Args:
+            limit (int): Maximum number of records to return.
+            sentiment (str): Only return records with this sentiment.
+            date_from (str): Inclusive lower bound (ISO timestamp or date).
+            date_to (str): Exclusive upper bound (ISO timestamp or date).
+            cursor (tuple): Cursor returned by the previous page.
+
+        Returns:
+            tuple: (records, next_cursor). next_cursor is None on the last page.
+        """
+        clauses = []
+        params = []
+        if sentiment:
+            clauses.append("sentiment = ?")
+            params.append(sentiment)
+        if date_from:
+            clauses.append("timestamp >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("timestamp < ?")
+            params.append(date_to)
+        if cursor:
+            clauses.append("(timestamp, seq) < (?, ?)")
+            params.extend(cursor)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = (
+            f"SELECT seq, timestamp, record FROM analyses {where} "
+            "ORDER BY timestamp DESC, seq DESC LIMIT ?"
+        )
+        params.append(limit)
+
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error querying SQLite database: {e}")
+            return [], None
+
+        records = [json.loads(row[2]) for row in rows]
+        next_cursor = (rows[-1][1], rows[-1][0]) if len(rows) == limit else None
+        return records, next_cursor
+
+    def get_record(self, record_id: str):
+        """
+        Retrieves one record by ID with a primary-key lookup.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT record FROM analyses WHERE id = ?", (record_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find_by_content_hash(self, digest: str) -> list:
+        """
+        Returns all records whose text hashes to the given digest, newest first.
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT record FROM analyses WHERE content_hash = ? ORDER BY seq DESC",
+                (digest,),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def migrate_from_json(self, json_path: str = None) -> int:
+        """
+        One-time import of a legacy db.json array into the SQLite database.
+
+        Works like JournalStorageManager.migrate_from_json: skipped when the
+        database already holds records, and the legacy file is renamed after.
+
+        Args:
+            json_path (str): Path of the legacy JSON database.
+
+        Returns:
+            int: The number of records migrated.
+        """
+        json_path = json_path or os.path.join(self.data_dir, "db.json")
+        if not os.path.exists(json_path):
+            return 0
+
+        with closing(self._connect()) as conn:
+            if conn.execute("SELECT 1 FROM analyses LIMIT 1").fetchone():
+                logger.warning(f"Database {self.db_file} is not empty, skipping migration.")
+                return 0
+
+        with open(json_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+
+        if not isinstance(records, list):
+            raise ValueError(f"Expected a JSON array in {json_path}")
+
+        self._insert(records)
+        os.replace(json_path, json_path + ".migrated")
+
+        logger.info(f"Migrated {len(records)} records from {json_path} to {self.db_file}")
+        return len(records)
+
+
+def create_storage(engine: str = None, data_dir: str = "data") -> BaseStorage:
+    """
+    Builds the storage engine selected in configuration, with its full-text
+    search, near-duplicate and similarity indexes attached.
+
+    Args:
+        engine (str): One of STORAGE_ENGINES. Defaults to the STORAGE_ENGINE
+            environment variable, then 'json'.
+        data_dir (str): Directory to store data.
+
+    Returns:
+        BaseStorage: The configured storage engine.
+    """
+    engine = (engine or os.getenv("STORAGE_ENGINE") or "json").lower()
+
+    if engine == "json":
+        storage = StorageManager(data_dir=data_dir)
+    elif engine == "journal":
+        storage = JournalStorageManager(data_dir=data_dir)
+    elif engine == "sqlite":
+        storage = SQLiteStorageManager(data_dir=data_dir)
+    else:
+        raise ValueError(f"Unknown storage engine '{engine}'. Choose from: {', '.join(STORAGE_ENGINES)}")
+
+    if engine != "json":
+        storage.migrate_from_json()
+
+    storage.search_index = create_search_index(data_dir)
+    storage.duplicate_index = NearDuplicateIndex(os.path.join(data_dir, "near_duplicates.sqlite3"))
+    storage.vector_index = VectorIndex(os.path.join(data_dir, "vectors"))
+    for index in (storage.search_index, storage.duplicate_index, storage.vector_index):
+        if index is not None:
+            storage.attach_index(index)
+    return storage
@@ -0,0 +1,111 @@
+"""
+Module for summarizing documents longer than a single prompt.
+Provides the ChunkedSummarizer class: chunks are summarized concurrently (map)
+and the partial summaries are combined level by level (reduce).
+"""
+import asyncio
+import logging
+from typing import List
+
+from src.chunking import split_into_chunks
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkedSummarizer:
+    """Class to run map-reduce summarization on top of a GeminiClient."""
+
+    def __init__(self, client, chunk_chars: int = 8000, min_chunk_chars: int = 2000,
+                 fan_in: int = 8):
+        """
+        Initializes the ChunkedSummarizer.
+
+        Args:
+            client: A GeminiClient (anything with generate_text_async, cache
+                and model_name).
+            chunk_chars (int): Maximum characters per chunk.
+            min_chunk_chars (int): Chunks are not closed early below this size.
+            fan_in (int): Partial summaries combined per reduce request.
+        """
+        self.client = client
+        self.chunk_chars = chunk_chars
+        self.min_chunk_chars = min_chunk_chars
+        self.fan_in = max(2, fan_in)
+
+    @staticmethod
+    def _document_prompt(text: str) -> str:
+        """Builds the prompt for a document that fits in one chunk."""
+        return (
+            f"Summarize the following text in 2-3 concise sentences: '{text}'.\n"
+            "Keep it plain text."
+        )
+
+    @staticmethod
+    def _chunk_prompt(chunk: str) -> str:
+        """Builds the map prompt for one section."""
+        return (
+            f"Summarize the following section of a longer document in one short paragraph, "
+            f"keeping key facts, names and figures: '{chunk}'.\n"
+            "Keep it plain text."
+        )
+
+    @staticmethod
+    def _reduce_prompt(summaries: List[str], final: bool) -> str:
+        """Builds the reduce prompt combining consecutive partial summaries."""
+        joined = "\n\n".join(f"[{i + 1}] {summary}" for i, summary in enumerate(summaries))
+        target = "2-3 concise sentences" if final else "one short paragraph"
+        return (
+            "The following are summaries of consecutive sections of one document, in order:\n"
+            f"{joined}\n\n"
+            f"Write a single summary of the whole in {target}.\n"
+            "Keep it plain text."
+        )
+
+    async def _cached_generate(self, kind: str, key_text: str, prompt: str) -> str:
+        """Generates text for a prompt, reusing the client's cache when present."""
+        cache = self.client.cache
+        if cache is not None:
+            cached = cache.get(self.client.model_name, kind, key_text)
+            if cached is not None:
+                return cached
+
+        result = await self.client.generate_text_async(prompt)
+
+        if cache is not None:
+            cache.set(self.client.model_name, kind, key_text, result)
+        return result
+
+    async def summarize_async(self, text: str) -> str:
+        """
+        Summarizes a document of any length.
+
+        Each chunk summary is cached by chunk content, so after an edit only
+        the chunks that changed (and the reduce steps above them) are sent
+        again.
+
+        Returns:
+            str: A 2-3 sentence summary.
+
+        Raises:
+            Exception: Whatever the client raises for a failed request.
+        """
+        chunks = split_into_chunks(text, self.chunk_chars, self.min_chunk_chars)
+        if len(chunks) <= 1:
+            return await self.client.generate_text_async(self._document_prompt(text))
+
+        logger.debug(f"Summarizing {len(chunks)} chunks")
+        partials = await asyncio.gather(
+            *(self._cached_generate("chunk_summary", chunk, self._chunk_prompt(chunk)) for chunk in chunks)
+        )
+
+        while len(partials) > 1:
+            groups = [partials[i:i + self.fan_in] for i in range(0, len(partials), self.fan_in)]
+            final = len(groups) == 1
+            kind = "reduce_final" if final else "reduce"
+            logger.debug(f"Reducing {len(partials)} partial summaries in {len(groups)} groups")
+            partials = await asyncio.gather(
+                *(self._cached_generate(kind, "\n\n".join(group), self._reduce_prompt(group, final))
+                  for group in groups)
+            )
+
+        return partials[0]
@@ -0,0 +1,350 @@
+"""
+Module for extended local text metrics.
+Provides the MetricsCounter class: one tokenizing pass yields word and bigram
+frequencies, sentence count, average word length, type/token ratio and
+readability scores. Counters of consecutive chunks or of separate files can
+be merged.
+"""
+import heapq
+import itertools
+import re
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, List
+
+from src.analyzer import DEFAULT_CHUNK_SIZE
+
+METRICS = ("top_words", "bigrams", "sentences", "avg_word_length", "type_token_ratio", "readability")
+
+# A run of terminators followed by whitespace or the end of the segment.
+SENTENCE_END = re.compile(r"[.!?]+(?=\s|$)")
+# Stands in for a sentence end in the token stream.
+END_TOKEN = "\x00"
+# Digits and punctuation become spaces, so str.split() yields the words.
+# Apostrophes are kept inside words ("don't", "l'uomo") and dropped elsewhere.
+SEPARATORS = str.maketrans(
+    {c: " " for c in range(128) if not chr(c).isalpha() and chr(c) not in "'\x00"}
+    | {ord(c): " " for c in "“”„‘«»–—…•·€£°×"}
+    | {ord("’"): "'"}
+)
+STRAY_APOSTROPHE = re.compile(r"'(?:(?<![^\W\d_]')|(?![^\W\d_]))")
+VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+
+@lru_cache(maxsize=65536)
+def count_syllables(word: str) -> int:
+    """Estimates English syllables from vowel groups (silent final 'e' dropped)."""
+    groups = len(VOWEL_GROUPS.findall(word))
+    if word.endswith("e") and not word.endswith("le") and groups > 1:
+        groups -= 1
+    return max(1, groups)
+
+
+def _top(items: Iterable, n: int) -> list:
+    """Most frequent (key, count) pairs; ties are broken by key, so any table order gives the same list."""
+    return heapq.nsmallest(n, items, key=lambda item: (-item[1], item[0]))
+
+
+class CounterTable:
+    """Frequency table backed by collections.Counter."""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def count(self, keys: Iterable, exclude=None) -> None:
+        """Counts every key of an iterable (in C, straight into the table)."""
+        self.counts.update(keys)
+        self.counts.pop(exclude, None)
+
+    def add(self, counts: Counter) -> None:
+        """Adds a batch of counts."""
+        self.counts.update(counts)
+
+    def merge(self, other) -> None:
+        """Adds every count of another table."""
+        self.add(dict(other.items()))
+
+    def items(self):
+        return self.counts.items()
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def most_common(self, n: int) -> list:
+        return _top(self.items(), n)
+
+
+class ArrayTable:
+    """
+    Frequency table storing counts in a flat int64 array indexed by a vocabulary.
+
+    Uses less memory than a Counter for large vocabularies (8 bytes per
+    count instead of a boxed int per entry).
+    """
+
+    def __init__(self):
+        self.vocabulary = {}
+        self.keys = []
+        self.counts = array("q")
+
+    def count(self, keys: Iterable, exclude=None) -> None:
+        """Counts every key of an iterable."""
+        counts = Counter(keys)
+        counts.pop(exclude, None)
+        self.add(counts)
+
+    def add(self, counts: Counter) -> None:
+        """Adds a batch of counts."""
+        vocabulary = self.vocabulary
+        for key, count in counts.items():
+            index = vocabulary.get(key)
+            if index is None:
+                vocabulary[key] = len(self.keys)
+                self.keys.append(key)
+                self.counts.append(count)
+            else:
+                self.counts[index] += count
+
+    def merge(self, other) -> None:
+        """Adds every count of another table."""
+        self.add(dict(other.items()))
+
+    def items(self):
+        return zip(self.keys, self.counts)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def most_common(self, n: int) -> list:
+        return _top(self.items(), n)
+
+
+FREQUENCY_TABLES = {"counter": CounterTable, "array": ArrayTable}
+
+
+class MetricsCounter:
+    """
+    Accumulates the selected metrics over consecutive chunks of text.
+
+    update() cuts every chunk at its last whitespace and carries the rest to
+    the next one, so no word or terminator run is split. merge() joins
+    counters of adjacent segments (split at whitespace) or of unrelated
+    files; it links the bigram and the sentence that straddle the boundary.
+    """
+
+    def __init__(self, metrics: Iterable[str] = None, table: str = "counter"):
+        """
+        Initializes the MetricsCounter.
+
+        Args:
+            metrics (Iterable[str]): Metrics to compute. Defaults to all of METRICS.
+            table (str): 'counter' or 'array' frequency tables.
+        """
+        self.metrics = tuple(metrics) if metrics is not None else METRICS
+        unknown = set(self.metrics) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))}. Choose from: {', '.join(METRICS)}")
+        if table not in FREQUENCY_TABLES:
+            raise ValueError(f"Unknown frequency table '{table}'. Choose from: {', '.join(FREQUENCY_TABLES)}")
+        self.table = table
+
+        needs_words = {"top_words", "type_token_ratio", "readability"} & set(self.metrics)
+        self.words = FREQUENCY_TABLES[table]() if needs_words else None
+        self.bigrams = FREQUENCY_TABLES[table]() if "bigrams" in self.metrics else None
+        self.tokens = 0
+        self.letters = 0
+        # Sentences closed inside this segment; the open one at the end is
+        # counted by result() or by the segment that closes it.
+        self.sentences = 0
+        # First word when the segment starts mid-sentence; last word when it ends mid-sentence.
+        self.leading_word = None
+        self.trailing_word = None
+        self.closes_previous = False
+        self._carry = ""
+
+    def _count_segment(self, text: str) -> "MetricsCounter":
+        """
+        Counts a segment straight into this counter's frequency tables.
+
+        Sentence ends are replaced by END_TOKEN, separators are translated
+        to spaces and the text is split; tokenizing and counting run in C
+        (translate, split, Counter, zip). Python-level work is one step per
+        sentence end.
+
+        Returns:
+            MetricsCounter: The segment's scalar counts and boundary state,
+            sharing this counter's tables.
+        """
+        segment = MetricsCounter(self.metrics, self.table)
+        segment.words, segment.bigrams = self.words, self.bigrams
+        text = SENTENCE_END.sub(f" {END_TOKEN} ", text.lower()).translate(SEPARATORS)
+        tokens = STRAY_APOSTROPHE.sub(" ", text).split()
+        if not tokens:
+            return segment
+
+        ends = tokens.count(END_TOKEN)
+        segment.tokens = len(tokens) - ends
+        segment.letters = sum(map(len, tokens)) - ends
+
+        # Word runs between sentence ends; bigrams never cross them.
+        spans = []
+        start = position = 0
+        for _ in range(ends):
+            position = tokens.index(END_TOKEN, start)
+            if position > start:
+                spans.append((start, position))
+            elif position == 0:
+                segment.closes_previous = True
+            start = position + 1
+        if start < len(tokens):
+            spans.append((start, len(tokens)))
+        segment.sentences = len(spans) - (1 if tokens[-1] != END_TOKEN else 0)
+
+        if tokens[0] != END_TOKEN:
+            segment.leading_word = tokens[0]
+        if tokens[-1] != END_TOKEN:
+            segment.trailing_word = tokens[-1]
+        if self.words is not None:
+            self.words.count(tokens, exclude=END_TOKEN)
+        if self.bigrams is not None:
+            self.bigrams.count(itertools.chain.from_iterable(
+                zip(tokens[a:b], tokens[a + 1:b]) for a, b in spans
+            ))
+        return segment
+
+    def merge(self, other: "MetricsCounter", adjacent: bool = True) -> "MetricsCounter":
+        """
+        Adds the counts of another counter.
+
+        Args:
+            other (MetricsCounter): Counter with the same metric selection.
+            adjacent (bool): other counted the text that directly follows
+                this one (split at whitespace), so the sentence and bigram
+                across the boundary are joined. False for separate files.
+
+        Returns:
+            MetricsCounter: self, to allow chaining.
+        """
+        self.flush()
+        other.flush()
+        if not adjacent and self.trailing_word:
+            # Close this text's last sentence instead of continuing it.
+            self.sentences += 1
+            self.trailing_word = None
+        return self._merge_segment(other, adjacent)
+
+    def _merge_segment(self, other: "MetricsCounter", adjacent: bool = True) -> "MetricsCounter":
+        """Adds a flushed counter (see merge)."""
+        if not other.tokens and not other.closes_previous:
+            return self
+        if not adjacent:
+            other.closes_previous = False
+            other.leading_word = None
+
+        if self.trailing_word and other.leading_word and self.bigrams is not None:
+            self.bigrams.add(Counter({(self.trailing_word, other.leading_word): 1}))
+        if self.trailing_word and other.closes_previous:
+            self.sentences += 1
+        if self.words is not None and other.words is not self.words:
+            self.words.merge(other.words)
+        if self.bigrams is not None and other.bigrams is not self.bigrams:
+            self.bigrams.merge(other.bigrams)
+
+        if not self.tokens:
+            self.leading_word = other.leading_word
+            self.closes_previous = self.closes_previous or other.closes_previous
+        if other.tokens or other.closes_previous:
+            self.trailing_word = other.trailing_word
+
+        self.tokens += other.tokens
+        self.letters += other.letters
+        self.sentences += other.sentences
+        return self
+
+    def update(self, chunk: str) -> None:
+        """Counts the next chunk of the stream."""
+        text = self._carry + chunk
+        cut = max(text.rfind(" "), text.rfind("\n"), text.rfind("\t"), text.rfind("\r"))
+        self._carry = text[cut + 1:]
+        if cut >= 0:
+            self._merge_segment(self._count_segment(text[:cut + 1]))
+
+    def flush(self) -> None:
+        """Counts the text held back by update()."""
+        if self._carry:
+            carry, self._carry = self._carry, ""
+            self._merge_segment(self._count_segment(carry))
+
+    def result(self, top_n: int = 10) -> dict:
+        """
+        Returns the selected metrics.
+
+        Args:
+            top_n (int): Entries returned for top_words and bigrams.
+        """
+        self.flush()
+        # A final sentence without terminator still counts.
+        sentences = self.sentences + (1 if self.trailing_word else 0)
+        result = {"tokens": self.tokens}
+
+        if "top_words" in self.metrics:
+            result["top_words"] = self.words.most_common(top_n)
+        if "bigrams" in self.metrics:
+            result["bigrams"] = [(" ".join(pair), count) for pair, count in self.bigrams.most_common(top_n)]
+        if "sentences" in self.metrics:
+            result["sentences"] = sentences
+        if "avg_word_length" in self.metrics:
+            result["avg_word_length"] = round(self.letters / self.tokens, 2) if self.tokens else 0.0
+        if "type_token_ratio" in self.metrics:
+            result["type_token_ratio"] = round(len(self.words) / self.tokens, 4) if self.tokens else 0.0
+        if "readability" in self.metrics:
+            result.update(self._readability(sentences))
+        return result
+
+    def _readability(self, sentences: int) -> dict:
+        """Flesch reading ease and Flesch-Kincaid grade, from per-word syllables."""
+        if not self.tokens:
+            return {"flesch_reading_ease": 0.0, "flesch_kincaid_grade": 0.0}
+        syllables = sum(count_syllables(word) * count for word, count in self.words.items())
+        words_per_sentence = self.tokens / max(1, sentences)
+        syllables_per_word = syllables / self.tokens
+        return {
+            "flesch_reading_ease": round(206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 2),
+            "flesch_kincaid_grade": round(0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59, 2),
+        }
+
+
+def compute_metrics(text: str, metrics: Iterable[str] = None, top_n: int = 10,
+                    table: str = "counter") -> dict:
+    """Computes the selected metrics of a whole text."""
+    counter = MetricsCounter(metrics, table)
+    counter.update(text)
+    return counter.result(top_n)
+
+
+def compute_file_metrics(file_path: str, metrics: Iterable[str] = None, top_n: int = 10,
+                         table: str = "counter", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                         encoding: str = "utf-8") -> dict:
+    """Streams a text file in chunks and computes the selected metrics."""
+    counter = MetricsCounter(metrics, table)
+    with open(file_path, "r", encoding=encoding) as f:
+        for chunk in iter(lambda: f.read(chunk_size), ""):
+            counter.update(chunk)
+    return counter.result(top_n)
+
+
+def parse_metrics(spec: str) -> List[str]:
+    """
+    Parses a comma-separated metric list; 'all' selects every metric.
+
+    Raises:
+        ValueError: If a name is not one of METRICS.
+    """
+    if not spec or spec.strip().lower() == "all":
+        return list(METRICS)
+    names = [name.strip().lower() for name in spec.split(",") if name.strip()]
+    unknown = [name for name in names if name not in METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(unknown)}. Choose from: {', '.join(METRICS)}")
+    return names
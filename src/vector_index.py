@@ -0,0 +1,284 @@
+"""
+Module for "find similar analyses" via VectorIndex class.
+Each saved record becomes a hashed term-frequency vector appended to a
+memory-mapped NumPy matrix on disk; queries are weighted by IDF and scored
+with batched cosine similarity, without any network service. NumPy is
+imported on first use, so opening the index costs nothing at startup.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import zlib
+from contextlib import closing
+from typing import TYPE_CHECKING, Iterable, List
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Rows scored per matrix product; bounds the working memory of a query.
+SCORE_BATCH_ROWS = 65536
+
+# The IDF weights (and the row norms that depend on them) are recomputed
+# once the history has grown by this factor since they were last computed,
+# so the full pass over the matrix is amortized over many saves.
+IDF_REFRESH_GROWTH = 1.1
+
+# Prefixes shorter than this are treated as text, not as a record ID.
+MIN_ID_PREFIX = 8
+ID_PATTERN = re.compile(r"^[0-9a-f-]+$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vectors (
+    row INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    timestamp TEXT,
+    sentiment TEXT,
+    snippet TEXT
+);
+CREATE TABLE IF NOT EXISTS stats (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL
+);
+"""
+
+
+class VectorIndex:
+    """Class to store hashed TF-IDF vectors and rank records by cosine similarity."""
+
+    def __init__(self, directory: str, dimensions: int = None):
+        """
+        Initializes the VectorIndex, creating its files if needed.
+
+        Args:
+            directory (str): Directory for the matrix and its metadata.
+            dimensions (int): Hashed vector size. Defaults to
+                VECTOR_DIMENSIONS from env, then 512. Fixed once the index
+                has been created.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.db_path = os.path.join(directory, "vectors.sqlite3")
+        self.matrix_path = os.path.join(directory, "vectors.f32")
+        self.norms_path = os.path.join(directory, "norms.f32")
+
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+            stored = self._load_stat(conn, "dimensions")
+            if stored:
+                self.dimensions = int(stored)
+            else:
+                self.dimensions = dimensions or int(os.getenv("VECTOR_DIMENSIONS", "512"))
+                self._save_stat(conn, "dimensions", str(self.dimensions))
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens a connection to the metadata database."""
+        return sqlite3.connect(self.db_path)
+
+    @staticmethod
+    def _load_stat(conn: sqlite3.Connection, key: str):
+        row = conn.execute("SELECT value FROM stats WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _save_stat(conn: sqlite3.Connection, key: str, value) -> None:
+        conn.execute("INSERT OR REPLACE INTO stats (key, value) VALUES (?, ?)", (key, value))
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+
+    @staticmethod
+    def _trim(path: str, size: int) -> None:
+        """Drops bytes appended past size by a save that was not committed."""
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            logger.warning(f"Trimming uncommitted rows from {path}")
+            with open(path, "r+b") as f:
+                f.truncate(size)
+
+    def vectorize(self, text: str) -> np.ndarray:
+        """Returns the hashed, sublinear term-frequency vector of a text."""
+        import numpy as np
+
+        buckets = [zlib.crc32(word.encode("utf-8")) % self.dimensions
+                   for word in WORD_PATTERN.findall(text.lower())]
+        counts = np.bincount(np.asarray(buckets, dtype=np.int64), minlength=self.dimensions)
+        return np.log1p(counts).astype(np.float32)
+
+    def _matrix(self, rows: int) -> np.ndarray:
+        """Memory-maps the first rows of the vector matrix (read-only)."""
+        import numpy as np
+
+        return np.memmap(self.matrix_path, dtype=np.float32, mode="r", shape=(rows, self.dimensions))
+
+    def _row_norms(self, block: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Returns the norms of tf rows once weighted by IDF."""
+        import numpy as np
+
+        return np.sqrt((block * block) @ weights).astype(np.float32)
+
+    def _refresh_weights(self, conn: sqlite3.Connection, df: np.ndarray, rows: int) -> None:
+        """Recomputes the IDF weights and rewrites every row norm."""
+        import numpy as np
+
+        idf = np.log((1 + rows) / (1 + df)) + 1
+        # Squared, because both the dot product and the norms use idf twice.
+        weights = (idf * idf).astype(np.float32)
+        matrix = self._matrix(rows)
+        temp_path = self.norms_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            for start in range(0, rows, SCORE_BATCH_ROWS):
+                f.write(self._row_norms(matrix[start:start + SCORE_BATCH_ROWS], weights).tobytes())
+        os.replace(temp_path, self.norms_path)
+        self._save_stat(conn, "weights", weights.tobytes())
+        self._save_stat(conn, "weights_rows", str(rows))
+
+    def is_empty(self) -> bool:
+        """Checks whether no record has been indexed yet."""
+        return len(self) == 0
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return self._count(conn)
+
+    def add_many(self, records: Iterable[dict]) -> int:
+        """
+        Appends the vectors of saved records to the matrix.
+
+        Records already in the index (same id) are skipped. Metadata and
+        document frequencies are committed only after the vectors are
+        written, so a failed save leaves no half-indexed record.
+
+        Returns:
+            int: The number of records newly indexed.
+        """
+        import numpy as np
+
+        with closing(self._connect()) as conn, conn:
+            before = self._count(conn)
+            self._trim(self.matrix_path, before * self.dimensions * 4)
+            self._trim(self.norms_path, before * 4)
+
+            vectors = []
+            for record in records:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO vectors (id, timestamp, sentiment, snippet) VALUES (?, ?, ?, ?)",
+                    (record["id"], record.get("timestamp"), record.get("sentiment"), record.get("text", "")),
+                )
+                if cursor.rowcount:
+                    vectors.append(self.vectorize(record.get("full_text") or record.get("text", "")))
+            if not vectors:
+                return 0
+
+            block = np.vstack(vectors)
+            stored_df = self._load_stat(conn, "df")
+            df = (block > 0).sum(axis=0, dtype=np.int64)
+            if stored_df is not None:
+                df += np.frombuffer(stored_df, dtype=np.int64)
+            self._save_stat(conn, "df", df.tobytes())
+            with open(self.matrix_path, "ab") as f:
+                f.write(block.tobytes())
+
+            rows = before + len(vectors)
+            weights = self._load_stat(conn, "weights")
+            weights_rows = int(self._load_stat(conn, "weights_rows") or 0)
+            norms_complete = os.path.exists(self.norms_path) and os.path.getsize(self.norms_path) == before * 4
+            if weights is None or not norms_complete or rows > weights_rows * IDF_REFRESH_GROWTH:
+                self._refresh_weights(conn, df, rows)
+            else:
+                with open(self.norms_path, "ab") as f:
+                    f.write(self._row_norms(block, np.frombuffer(weights, dtype=np.float32)).tobytes())
+        return len(vectors)
+
+    def resolve_id(self, reference: str):
+        """
+        Maps a full record ID or a unique ID prefix (as shown in tables) to a row.
+
+        Returns:
+            tuple: (row, record id), or None if reference is not a known ID.
+        """
+        reference = reference.strip().lower()
+        if len(reference) < MIN_ID_PREFIX or not ID_PATTERN.match(reference):
+            return None
+        # Range scan on the id index: every id starting with reference.
+        upper = reference[:-1] + chr(ord(reference[-1]) + 1)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT row, id FROM vectors WHERE id >= ? AND id < ? LIMIT 2",
+                (reference, upper),
+            ).fetchall()
+        return rows[0] if len(rows) == 1 else None
+
+    def similar(self, reference: str, limit: int = 10) -> List[dict]:
+        """
+        Finds the stored records most similar to a record or a text.
+
+        Args:
+            reference (str): A record ID (or unique prefix), else a text.
+            limit (int): Maximum number of results.
+
+        Returns:
+            List[dict]: Results with id, timestamp, sentiment, text (the
+            stored snippet) and similarity (cosine, 0-1), best first. The
+            referenced record itself is left out.
+        """
+        import numpy as np
+
+        with closing(self._connect()) as conn:
+            rows = self._count(conn)
+            weights = self._load_stat(conn, "weights")
+        if rows == 0 or weights is None:
+            return []
+        weights = np.frombuffer(weights, dtype=np.float32)
+        matrix = self._matrix(rows)
+        norms = np.memmap(self.norms_path, dtype=np.float32, mode="r", shape=(rows,))
+
+        resolved = self.resolve_id(reference)
+        if resolved:
+            exclude = resolved[0] - 1
+            query = np.array(matrix[exclude])
+        else:
+            exclude = None
+            query = self.vectorize(reference)
+
+        query_norm = self._row_norms(query, weights)
+        if query_norm == 0:
+            return []
+        weighted_query = query * weights / query_norm
+
+        scores = np.zeros(rows, dtype=np.float32)
+        for start in range(0, rows, SCORE_BATCH_ROWS):
+            end = min(start + SCORE_BATCH_ROWS, rows)
+            block_norms = norms[start:end]
+            np.divide(matrix[start:end] @ weighted_query, block_norms,
+                      out=scores[start:end], where=block_norms > 0)
+        if exclude is not None:
+            scores[exclude] = -1
+
+        top = min(limit, rows)
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        best = [int(i) for i in best if scores[i] > 0]
+        if not best:
+            return []
+
+        with closing(self._connect()) as conn:
+            placeholders = ", ".join("?" * len(best))
+            meta = {
+                row[0]: row[1:]
+                for row in conn.execute(
+                    f"SELECT row, id, timestamp, sentiment, snippet FROM vectors WHERE row IN ({placeholders})",
+                    [i + 1 for i in best],
+                )
+            }
+        return [
+            {"id": meta[i + 1][0], "timestamp": meta[i + 1][1], "sentiment": meta[i + 1][2],
+             "text": meta[i + 1][3], "similarity": min(float(scores[i]), 1.0)}
+            for i in best
+        ]
@@ -0,0 +1,28 @@
+from src.aggregation import aggregate_sentiments, stratified_sample
+
+def test_stratified_sample_spreads_picks():
+    """Test that samples come from every part of the sequence."""
+    assert stratified_sample(list(range(10)), 5) == [1, 3, 5, 7, 9]
+    assert stratified_sample(list(range(3)), 5) == [0, 1, 2]
+    assert stratified_sample(list(range(3)), 0) == []
+
+def test_aggregate_unanimous_high_confidence():
+    """Test unanimous chunks give a high-confidence overall result."""
+    results = [{"sentiment": "POSITIVE", "confidence": "HIGH"}] * 3
+    assert aggregate_sentiments(results) == {"sentiment": "POSITIVE", "confidence": "HIGH"}
+
+def test_aggregate_weighted_vote():
+    """Test that chunk weights and confidences decide a split vote."""
+    results = [
+        {"sentiment": "NEGATIVE", "confidence": "MEDIUM"},
+        {"sentiment": "POSITIVE", "confidence": "LOW"},
+        {"sentiment": "API ERROR", "confidence": "None"},
+    ]
+    overall = aggregate_sentiments(results, weights=[1000, 1000, 5000])
+    assert overall["sentiment"] == "NEGATIVE"
+    assert overall["confidence"] == "MEDIUM"
+
+def test_aggregate_all_failed_returns_error():
+    """Test that an error marker is returned when no chunk succeeded."""
+    results = [{"sentiment": "TIMEOUT", "confidence": "None"}]
+    assert aggregate_sentiments(results) == {"sentiment": "TIMEOUT", "confidence": "None"}
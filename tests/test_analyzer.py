@@ -42,3 +42,35 @@ def test_get_text_statistics_special_chars(analyzer):
     text = "Hello, world! 123"
     stats = analyzer.analyze(text)
     assert stats["word_count"] == 3
+
+STREAM_SAMPLES = [
+    "",
+    "Hello world",
+    "Hello\nWorld\nAgain\n",
+    "line one\r\nline two\r\n\r\nlast",
+    "tabs\tand  spaces\u2028unicode\u00a0break\x85end",
+    "caffè è già pronto\n" * 7,
+]
+
+@pytest.mark.parametrize("text", STREAM_SAMPLES)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_analyze_stream_matches_analyze(analyzer, text, chunk_size):
+    """Test that chunked counting matches whole-text counting at any split."""
+    chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+    assert analyzer.analyze_stream(chunks) == analyzer.analyze(text)
+
+def test_analyze_stream_crlf_across_chunks(analyzer):
+    """Test a CRLF pair split over two chunks counts as one line break."""
+    stats = analyzer.analyze_stream(["first\r", "\nsecond"])
+    assert stats["line_count"] == 2
+    assert stats["word_count"] == 2
+
+def test_analyze_file_matches_read(analyzer, tmp_path):
+    """Test streaming a file gives the same result as reading it whole."""
+    path = tmp_path / "sample.txt"
+    path.write_bytes("alpha beta\r\ngamma\rdelta\n\nepsilon".encode("utf-8"))
+
+    with open(path, "r", encoding="utf-8") as f:
+        expected = analyzer.analyze(f.read())
+
+    assert analyzer.analyze_file(str(path), chunk_size=4) == expected
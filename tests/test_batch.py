@@ -0,0 +1,71 @@
+import pytest
+from src.batch import BatchRunner, discover_files
+from src.storage import JournalStorageManager
+
+class FakeAIClient:
+    """Stand-in for GeminiClient that answers instantly."""
+
+    batch_token_budget = 8000
+    batch_max_items = 2
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def analyze_sentiment_batch(self, texts):
+        self.batch_sizes.append(len(texts))
+        return [{"sentiment": "NEUTRAL", "confidence": "LOW"} for _ in texts]
+
+    def analyze(self, text):
+        return {"sentiment": "POSITIVE", "confidence": "HIGH"}, f"Summary of {len(text)} chars"
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Fixture creating a small directory of documents."""
+    docs = tmp_path / "docs"
+    (docs / "nested").mkdir(parents=True)
+    (docs / "a.txt").write_text("alpha beta", encoding="utf-8")
+    (docs / "b.txt").write_text("gamma\ndelta epsilon", encoding="utf-8")
+    (docs / "nested" / "c.txt").write_text("zeta", encoding="utf-8")
+    (docs / "notes.md").write_text("ignored", encoding="utf-8")
+    return docs
+
+@pytest.fixture
+def storage(tmp_path):
+    return JournalStorageManager(data_dir=str(tmp_path / "data"))
+
+def test_discover_files_dir_and_glob(corpus):
+    """Test discovery of .txt/.pdf files from a directory or a glob."""
+    assert [p.rsplit("/", 1)[-1] for p in discover_files(str(corpus))] == ["a.txt", "b.txt", "c.txt"]
+    assert len(discover_files(str(corpus / "*.txt"))) == 2
+
+def test_batch_run_saves_records(corpus, storage):
+    """Test a batch run analyzes and stores every document."""
+    runner = BatchRunner(storage, ai_client=FakeAIClient(), workers=2, commit_every=2)
+    summary = runner.run(str(corpus))
+
+    assert summary["processed"] == 3
+    assert summary["failed"] == 0
+    history = storage.get_history(limit=10)
+    assert sorted(r["word_count"] for r in history) == [1, 2, 3]
+    assert all(r["sentiment"] == "POSITIVE" for r in history)
+
+def test_batch_resume_skips_committed_files(corpus, storage):
+    """Test a second run only processes files not yet checkpointed."""
+    BatchRunner(storage, workers=1).run(str(corpus))
+    (corpus / "d.txt").write_text("new file", encoding="utf-8")
+
+    summary = BatchRunner(storage, workers=1).run(str(corpus))
+
+    assert summary["skipped"] == 3
+    assert summary["processed"] == 1
+    assert len(storage.get_history(limit=10)) == 4
+
+def test_batch_sentiment_only_packs_documents(corpus, storage):
+    """Test sentiment-only runs send several documents per AI request."""
+    client = FakeAIClient()
+    summary = BatchRunner(storage, ai_client=client, workers=1, sentiment_only=True).run(str(corpus))
+
+    assert summary["processed"] == 3
+    assert sum(client.batch_sizes) == 3
+    assert max(client.batch_sizes) == 2
+    assert all(r["sentiment"] == "NEUTRAL" for r in storage.get_history(limit=10))
@@ -0,0 +1,48 @@
+import json
+import os
+import pytest
+from src.blob_store import BlobStore, content_hash
+from src.storage import StorageManager, create_storage
+
+def test_put_deduplicates_and_compresses(tmp_path):
+    """Test that identical texts share one compressed blob."""
+    store = BlobStore(str(tmp_path / "blobs"))
+    text = "A long, repetitive document. " * 1000
+    digest = store.put(text)
+
+    assert digest == content_hash(text)
+    assert store.put(text) == digest
+    assert digest in store
+    assert store.get(digest) == text
+    files = [os.path.join(root, name) for root, _, names in os.walk(store.directory) for name in names]
+    assert len(files) == 1
+    assert os.path.getsize(files[0]) < len(text) / 20
+
+    with pytest.raises(KeyError):
+        store.get(content_hash("never stored"))
+
+@pytest.mark.parametrize("engine", ["json", "journal", "sqlite"])
+def test_records_reference_blobs(tmp_path, engine):
+    """Test that records keep a hash reference and full text loads on demand."""
+    storage = create_storage(engine, data_dir=str(tmp_path))
+    body = "Full document body. " * 200
+    storage.save_many([{"text": "Full...", "full_text": body}, {"text": "Full...", "full_text": body}])
+
+    history = storage.get_history(limit=5)
+    assert all("full_text" not in record for record in history)
+    assert {record["content_hash"] for record in history} == {content_hash(body)}
+    assert [r["full_text"] for r in storage.with_full_text(history)] == [body, body]
+    # The indexes saw the whole body, not just the snippet.
+    assert storage.search_index.search("body")
+
+def test_legacy_inline_records_are_moved_on_rewrite(tmp_path):
+    """Test that a JSON database with inline full_text is externalized on the next save."""
+    db_file = tmp_path / "db.json"
+    db_file.write_text(json.dumps([{"id": "old", "text": "Old", "full_text": "Old inline body"}]))
+    storage = StorageManager(data_dir=str(tmp_path))
+    assert storage.load_full_text(storage.get_history(limit=1)[0]) == "Old inline body"
+
+    storage.save_analysis({"text": "New", "full_text": "New body"})
+    stored = json.loads(db_file.read_text())
+    assert all("full_text" not in record for record in stored)
+    assert [r["full_text"] for r in storage.with_full_text(stored)] == ["Old inline body", "New body"]
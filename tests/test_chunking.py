@@ -0,0 +1,48 @@
+from src.chunking import estimate_tokens, pack_by_budget, split_into_chunks
+
+def test_estimate_tokens():
+    """Test the character based token estimate."""
+    assert estimate_tokens("") == 1
+    assert estimate_tokens("a" * 400) == 101
+
+def test_pack_by_budget_keeps_order_and_budget():
+    """Test that groups stay under budget and preserve item order."""
+    items = ["a" * 40, "b" * 40, "c" * 40, "d" * 200, "e" * 4]
+    groups = pack_by_budget(items, budget=25)
+
+    assert [item for group in groups for item in group] == items
+    assert groups == [["a" * 40, "b" * 40], ["c" * 40], ["d" * 200], ["e" * 4]]
+
+def test_pack_by_budget_max_items():
+    """Test the optional cap on items per group."""
+    groups = pack_by_budget(range(5), budget=100, cost=lambda _: 1, max_items=2)
+    assert groups == [[0, 1], [2, 3], [4]]
+
+def make_document(paragraphs):
+    return "\n\n".join(f"Paragraph {i}. " + "word " * 60 for i in range(paragraphs))
+
+def test_split_into_chunks_respects_limits():
+    """Test that chunks stay under max_chars and keep every paragraph."""
+    text = make_document(40)
+    chunks = split_into_chunks(text, max_chars=1500, min_chars=500)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1500 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+def test_split_into_chunks_hard_wraps_long_paragraph():
+    """Test a paragraph longer than max_chars is cut on word boundaries."""
+    chunks = split_into_chunks("word " * 1000, max_chars=300, min_chars=100)
+    assert all(len(chunk) <= 300 for chunk in chunks)
+    assert sum(len(chunk.split()) for chunk in chunks) == 1000
+
+def test_split_into_chunks_is_stable_after_edit():
+    """Test that editing one paragraph leaves most later chunks unchanged."""
+    original = make_document(60)
+    edited = original.replace("Paragraph 3.", "Paragraph 3, now with an inserted clause.")
+
+    before = split_into_chunks(original, max_chars=1500, min_chars=400)
+    after = split_into_chunks(edited, max_chars=1500, min_chars=400)
+
+    unchanged = set(before) & set(after)
+    assert len(unchanged) >= len(before) - 2
@@ -0,0 +1,62 @@
+import csv
+import gzip
+from datetime import datetime
+import pytest
+from src.exporter import ReportExporter
+
+def make_records(count):
+    """Generator of records, as a storage cursor would yield them."""
+    for i in range(count):
+        yield {"id": f"id-{i}", "timestamp": f"2024-05-0{1 + i % 9}T10:00:00",
+               "text": f"Snippet {i}", "full_text": f"Body {i}", "summary": f"Summary {i}",
+               "word_count": i, "char_count": 10 * i, "line_count": 1,
+               "sentiment": ["POSITIVE", "NEGATIVE", "NEUTRAL"][i % 3], "confidence": "HIGH"}
+
+@pytest.fixture
+def exporter(tmp_path):
+    """Fixture to create a ReportExporter with a temp directory."""
+    return ReportExporter(export_dir=str(tmp_path / "exports"))
+
+def test_csv_streams_with_columns_and_gzip(exporter):
+    """Test streaming a generator to gzip CSV with selected columns and progress."""
+    seen = []
+    path = exporter.to_csv(make_records(2500), columns=["id", "sentiment"], compress=True,
+                           progress=seen.append)
+
+    assert path.endswith(".csv.gz")
+    with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 2500
+    assert rows[0] == {"id": "id-0", "sentiment": "POSITIVE"}
+    assert seen == [1000, 2000, 2500]
+
+def test_csv_default_columns_skip_full_text(exporter):
+    """Test that document bodies are left out unless asked for."""
+    with open(exporter.to_csv(make_records(3)), newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f))
+    assert "full_text" not in header and "summary" in header
+    assert exporter.to_csv(iter([])) == ""
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_columnar_export_is_typed_and_batched(exporter, fmt):
+    """Test typed columns and dictionary-encoded sentiment across several record batches."""
+    pa = pytest.importorskip("pyarrow")
+    seen = []
+    export = exporter.to_parquet if fmt == "parquet" else exporter.to_arrow
+    path = export(make_records(25), batch_rows=10, progress=seen.append)
+    assert seen == [10, 20, 25]
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+    else:
+        import pyarrow.ipc as ipc
+        table = ipc.open_file(path).read_all()
+
+    assert table.num_rows == 25
+    assert "full_text" not in table.column_names
+    assert table.schema.field("word_count").type == pa.int64()
+    assert table.schema.field("timestamp").type == pa.timestamp("us")
+    assert pa.types.is_dictionary(table.schema.field("sentiment").type)
+    assert table.column("timestamp")[0].as_py() == datetime(2024, 5, 1, 10, 0)
+    assert table.column("sentiment").to_pylist()[:4] == ["POSITIVE", "NEGATIVE", "NEUTRAL", "POSITIVE"]
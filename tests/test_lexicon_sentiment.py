@@ -0,0 +1,33 @@
+import pytest
+from src.lexicon_sentiment import LexiconSentimentAnalyzer, load_lexicon
+
+@pytest.fixture
+def analyzer():
+    """Fixture for the built-in lexicon engine."""
+    return LexiconSentimentAnalyzer(negation_window=3)
+
+def test_polarity(analyzer):
+    """Test clear positive, negative and neutral texts."""
+    assert analyzer.analyze("I love this product, it is excellent!") == {"sentiment": "POSITIVE", "confidence": "HIGH"}
+    assert analyzer.analyze("The service was terrible and slow.")["sentiment"] == "NEGATIVE"
+    assert analyzer.analyze("The meeting is at five.") == {"sentiment": "NEUTRAL", "confidence": "LOW"}
+
+def test_negation_flips_within_clause(analyzer):
+    """Test that negators flip the following words but stop at clause boundaries."""
+    assert analyzer.analyze("This is not good.")["sentiment"] == "NEGATIVE"
+    assert analyzer.analyze("I don’t like it")["sentiment"] == "NEGATIVE"
+    # "not" does not reach "great" across the comma.
+    compound, positive, negative, hits = analyzer.score("Not bad, great")
+    assert hits == 2 and positive > negative
+
+def test_intensifiers_scale_weight(analyzer):
+    """Test that intensifiers strengthen the next sentiment word."""
+    assert analyzer.score("very good")[0] > analyzer.score("good")[0] > analyzer.score("slightly good")[0]
+
+def test_custom_lexicon(tmp_path):
+    """Test loading extra entries from a tab-separated file."""
+    path = tmp_path / "lexicon.tsv"
+    path.write_text("# domain terms\nbullish\t2\nbearish\t-2\n", encoding="utf-8")
+    analyzer = LexiconSentimentAnalyzer(lexicon=load_lexicon(str(path)))
+    assert analyzer.analyze("Analysts are bullish")["sentiment"] == "POSITIVE"
+    assert analyzer.analyze_many(["bearish", "neutral words"])[0]["sentiment"] == "NEGATIVE"
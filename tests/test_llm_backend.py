@@ -0,0 +1,63 @@
+import asyncio
+import json
+import pytest
+from src.llm_backend import FakeAPIError, FakeBackend, create_backend
+from src.scheduler import is_retryable, is_throttle
+
+@pytest.fixture
+def backend():
+    """Fixture for an instant fake backend."""
+    return FakeBackend(latency=0)
+
+def generate(backend, prompt, generation_config=None):
+    """Runs one fake request."""
+    return asyncio.run(backend.generate(prompt, generation_config))
+
+def test_sentiment_reply_is_deterministic(backend):
+    """Test that the same prompt always gets the same valid JSON verdict."""
+    prompt = "Analyze the sentiment of the following text: 'I love it'.\nRespond STRICTLY..."
+    first = json.loads(generate(backend, prompt).text)
+    assert first == json.loads(generate(backend, prompt).text)
+    assert first["sentiment"] in FakeBackend.SENTIMENTS
+
+def test_batch_reply_matches_single_verdicts(backend):
+    """Test that a packed prompt gets one item per text, agreeing with single requests."""
+    prompt = "Analyze the sentiment of each numbered text below.\n...\n\n[0] 'good day'\n[1] 'bad day'"
+    items = json.loads(generate(backend, prompt, {"response_schema": {"type": "array"}}).text)
+    assert [item["index"] for item in items] == [0, 1]
+    assert items[1]["sentiment"] == FakeBackend._verdict("bad day")["sentiment"]
+
+def test_model_reuse(backend):
+    """Test that one model instance serves every request unless reuse is off."""
+    for _ in range(3):
+        generate(backend, "Summarize 'x'.\n")
+    assert backend.models_created == 1
+
+    fresh = FakeBackend(latency=0, reuse_model=False)
+    for _ in range(3):
+        generate(fresh, "Summarize 'x'.\n")
+    assert fresh.models_created == 3
+
+def test_throttling_and_injected_errors():
+    """Test that the fake quota raises 429s and error_rate raises 503s."""
+    throttled = FakeBackend(latency=0, requests_per_minute=2)
+    generate(throttled, "a")
+    generate(throttled, "b")
+    with pytest.raises(FakeAPIError) as info:
+        generate(throttled, "c")
+    assert is_throttle(info.value)
+
+    failing = FakeBackend(latency=0, error_rate=1.0)
+    with pytest.raises(FakeAPIError) as info:
+        generate(failing, "a")
+    assert info.value.code == 503 and is_retryable(info.value)
+
+def test_create_backend_from_env(monkeypatch):
+    """Test that LLM_BACKEND selects the fake backend and its settings."""
+    monkeypatch.setenv("LLM_BACKEND", "fake")
+    monkeypatch.setenv("FAKE_LLM_LATENCY_MS", "5")
+    backend = create_backend()
+    assert isinstance(backend, FakeBackend)
+    assert backend.latency == pytest.approx(0.005)
+    with pytest.raises(ValueError):
+        create_backend("nope")
@@ -0,0 +1,72 @@
+import random
+import pytest
+from src.near_duplicate import NearDuplicateIndex, estimate_similarity, is_reusable, minhash_signature
+from src.storage import create_storage
+
+def make_text(seed, words=300):
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(2000)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+def edit(text, changes, seed=1):
+    """Replaces a few words, as a small revision of a document would."""
+    rng = random.Random(seed)
+    words = text.split()
+    for i in rng.sample(range(len(words)), changes):
+        words[i] = "edited"
+    return " ".join(words)
+
+@pytest.fixture
+def index(tmp_path):
+    """Fixture to create a NearDuplicateIndex."""
+    return NearDuplicateIndex(str(tmp_path / "dup.sqlite3"), threshold=0.8)
+
+def record(record_id, text, sentiment="POSITIVE", summary="A summary."):
+    return {"id": record_id, "timestamp": "2024-01-01T00:00:00", "full_text": text,
+            "sentiment": sentiment, "summary": summary}
+
+def test_signature_similarity_tracks_edits():
+    """Test that the estimated similarity drops as more words change."""
+    text = make_text(0)
+    base = minhash_signature(text)
+    assert minhash_signature(text) == base
+    light = estimate_similarity(base, minhash_signature(edit(text, 2)))
+    heavy = estimate_similarity(base, minhash_signature(edit(text, 60)))
+    unrelated = estimate_similarity(base, minhash_signature(make_text(99)))
+    assert light > 0.85
+    assert light > heavy > unrelated
+    assert unrelated < 0.1
+
+def test_find_exact_and_near_duplicates(index):
+    """Test exact matches, near matches above the threshold and misses."""
+    text = make_text(0)
+    index.add_many([record("a", text), record("b", make_text(5))])
+
+    assert index.find(text) == {"id": "a", "timestamp": "2024-01-01T00:00:00", "similarity": 1.0}
+    match = index.find(edit(text, 2))
+    assert match["id"] == "a" and 0.8 <= match["similarity"] < 1.0
+    assert index.find(edit(text, 80)) is None
+    assert index.find(make_text(7)) is None
+
+def test_unusable_records_are_not_matched(index):
+    """Test that records with failed AI results are never reused."""
+    assert not is_reusable({"sentiment": "API ERROR", "summary": "x"})
+    assert not is_reusable({"sentiment": "POSITIVE", "summary": "AI Summary Unavailable (No Key)"})
+    text = make_text(0)
+    index.add_many([record("bad", text, summary="Summary Error")])
+    assert index.find(text) is None
+
+    index.add_many([record("good", text)])
+    assert index.find(edit(text, 1))["id"] == "good"
+
+@pytest.mark.parametrize("engine", ["json", "sqlite"])
+def test_storage_indexes_signatures_on_save(tmp_path, engine):
+    """Test that saving through storage makes records findable by similarity."""
+    storage = create_storage(engine, data_dir=str(tmp_path))
+    text = make_text(3)
+    record_id = storage.save_analysis({"text": text[:100], "full_text": text, "sentiment": "NEGATIVE",
+                                       "confidence": "HIGH", "summary": "Complaint."})
+    match = storage.duplicate_index.find(edit(text, 1))
+    assert match["id"] == record_id
+    assert storage.get_record(record_id)["summary"] == "Complaint."
+    assert storage.get_record("missing") is None
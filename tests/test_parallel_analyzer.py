@@ -0,0 +1,40 @@
+import pytest
+from src.analyzer import TextAnalyzer
+from src.parallel_analyzer import ParallelTextAnalyzer
+
+@pytest.fixture
+def sample_file(tmp_path):
+    """Fixture writing a multi-byte, mixed line-ending UTF-8 file."""
+    path = tmp_path / "corpus.txt"
+    text = ("Perché no? Überall grüße 日本語のテキスト\r\n" * 40) + "tail\rend  word"
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+def expected_stats(file_path):
+    with open(file_path, "r", encoding="utf-8") as f:
+        return TextAnalyzer().analyze(f.read())
+
+def test_split_ranges_respect_utf8(sample_file):
+    """Test that every range starts on a UTF-8 lead byte and ranges are contiguous."""
+    engine = ParallelTextAnalyzer(workers=7, min_bytes_per_worker=1)
+    ranges = engine.split_ranges(sample_file)
+
+    with open(sample_file, "rb") as f:
+        data = f.read()
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[start] & 0xC0 != 0x80
+
+@pytest.mark.parametrize("workers", [1, 3, 8])
+def test_parallel_matches_analyze(sample_file, workers):
+    """Test that merged partial counts equal TextAnalyzer.analyze exactly."""
+    engine = ParallelTextAnalyzer(workers=workers, min_bytes_per_worker=1)
+    assert engine.analyze_file(sample_file) == expected_stats(sample_file)
+
+def test_parallel_empty_file(tmp_path):
+    """Test an empty file yields zero counts."""
+    path = tmp_path / "empty.txt"
+    path.write_text("")
+    assert ParallelTextAnalyzer().analyze_file(str(path)) == TextAnalyzer().analyze("")
@@ -0,0 +1,38 @@
+import os
+import pytest
+from src.pdf_cache import PDFTextCache, file_digest
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture to create a PDFTextCache in a temp directory."""
+    return PDFTextCache(cache_dir=str(tmp_path / "cache"), max_bytes=1024)
+
+def test_put_and_get(cache):
+    """Test that stored text is returned for the same digest."""
+    assert cache.get("abc") is None
+    cache.put("abc", "Extracted text")
+    assert cache.get("abc") == "Extracted text"
+
+def test_digest_precheck_skips_rehash(cache, tmp_path, monkeypatch):
+    """Test that an unchanged file (same size and mtime) is not hashed again."""
+    pdf = tmp_path / "doc.pdf"
+    pdf.write_bytes(b"%PDF-1.4 fake content")
+    digest = cache.digest_for(str(pdf))
+    assert digest == file_digest(str(pdf))
+
+    def fail(_):
+        raise AssertionError("file should not be re-hashed")
+    monkeypatch.setattr("src.pdf_cache.file_digest", fail)
+    assert cache.digest_for(str(pdf)) == digest
+
+def test_lru_eviction(cache):
+    """Test that the least recently used entry is evicted past the size cap."""
+    cache.put("old", "a" * 400)
+    cache.put("mid", "b" * 400)
+    cache.get("old")  # "mid" is now the least recently used entry
+    cache.put("new", "c" * 400)
+
+    assert cache.get("mid") is None
+    assert cache.get("old") == "a" * 400
+    assert cache.get("new") == "c" * 400
+    assert not os.path.exists(os.path.join(cache.cache_dir, "mid.txt"))
@@ -0,0 +1,38 @@
+import time
+import pytest
+from src.response_cache import ResponseCache
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture to create a ResponseCache in a temp directory."""
+    return ResponseCache(db_path=str(tmp_path / "cache.sqlite3"), ttl_seconds=60, max_entries=2)
+
+def test_hit_on_normalized_text(cache):
+    """Test that whitespace-only differences hit the same entry."""
+    cache.set("model", "sentiment", "Great  product\n", {"sentiment": "POSITIVE"})
+
+    assert cache.get("model", "sentiment", "  Great product") == {"sentiment": "POSITIVE"}
+    assert cache.get("model", "summary", "Great product") is None
+    assert cache.get("other-model", "sentiment", "Great product") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+def test_ttl_expiry(cache, monkeypatch):
+    """Test that expired entries are treated as misses."""
+    cache.set("model", "summary", "text", "A summary")
+    assert cache.get("model", "summary", "text") == "A summary"
+
+    later = time.time() + 61
+    monkeypatch.setattr("src.response_cache.time.time", lambda: later)
+    assert cache.get("model", "summary", "text") is None
+
+def test_lru_bound(cache):
+    """Test that the least recently used entry goes past max_entries."""
+    cache.set("model", "summary", "one", "1")
+    cache.set("model", "summary", "two", "2")
+    cache.get("model", "summary", "one")
+    cache.set("model", "summary", "three", "3")
+
+    assert cache.get("model", "summary", "two") is None
+    assert cache.get("model", "summary", "one") == "1"
+    assert cache.stats()["entries"] == 2
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from src.scheduler import AIMDLimiter, RequestScheduler, TokenBucket, is_retryable, is_throttle
+
+class FakeAPIError(Exception):
+    """Mimics google.api_core errors, which carry an HTTP status in .code."""
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+@pytest.fixture
+def scheduler():
+    """Fixture for a scheduler with generous quota and no backoff delay."""
+    return RequestScheduler(requests_per_minute=6000, tokens_per_minute=10**6,
+                            max_retries=3, base_delay=0)
+
+def test_error_classification():
+    """Test that 429/5xx/timeouts are retryable and only 429 is throttling."""
+    assert is_throttle(FakeAPIError(429)) and is_retryable(FakeAPIError(429))
+    assert is_retryable(FakeAPIError(503)) and not is_throttle(FakeAPIError(503))
+    assert is_retryable(asyncio.TimeoutError())
+    assert not is_retryable(FakeAPIError(400))
+    assert not is_retryable(ValueError("bad json"))
+
+def test_token_bucket_waits_for_refill(monkeypatch):
+    """Test that an empty bucket reports the time until enough tokens refill."""
+    now = [1000.0]
+    monkeypatch.setattr("src.scheduler.time.monotonic", lambda: now[0])
+    bucket = TokenBucket(per_minute=60)
+    assert bucket._take(60) == 0.0
+    assert bucket._take(2) == pytest.approx(2.0)
+    now[0] += 2
+    assert bucket._take(2) == 0.0
+
+def test_retries_transient_errors(scheduler):
+    """Test that a throttled request is retried until it succeeds."""
+    calls = []
+
+    async def request():
+        calls.append(1)
+        if len(calls) < 3:
+            raise FakeAPIError(429)
+        return "ok"
+
+    assert asyncio.run(scheduler.run(request, tokens=10)) == "ok"
+    assert len(calls) == 3
+    assert scheduler.stats["retries"] == 2
+    assert scheduler.stats["throttled"] == 2
+    assert scheduler.limiter.in_flight == 0
+
+def test_non_retryable_error_raises_immediately(scheduler):
+    """Test that client errors are not retried."""
+    calls = []
+
+    async def request():
+        calls.append(1)
+        raise FakeAPIError(400)
+
+    with pytest.raises(FakeAPIError):
+        asyncio.run(scheduler.run(request))
+    assert len(calls) == 1
+    assert scheduler.stats["failed"] == 1
+
+def test_aimd_limit_adapts():
+    """Test multiplicative decrease on throttling and additive recovery."""
+    limiter = AIMDLimiter(initial=8, minimum=1, maximum=8, cooldown=0)
+    limiter.on_throttle()
+    assert int(limiter.limit) == 4
+    limiter.on_throttle()
+    assert int(limiter.limit) == 2
+    for _ in range(10):
+        limiter.on_success()
+    assert 2 < limiter.limit <= 8
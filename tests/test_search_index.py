@@ -0,0 +1,63 @@
+import pytest
+from src.search_index import SearchIndex, build_match_query
+from src.storage import create_storage
+
+@pytest.fixture
+def index(tmp_path):
+    """Fixture to create a SearchIndex with a few records."""
+    index = SearchIndex(str(tmp_path / "search.sqlite3"))
+    index.add_many([
+        {"id": "a", "text": "Late delivery", "full_text": "The delivery was late and the box was damaged.",
+         "summary": "Complaint about a late delivery."},
+        {"id": "b", "text": "Great service", "full_text": "Great service, the delivery arrived early.",
+         "summary": "Praise for the service."},
+        {"id": "c", "text": "Billing", "full_text": "I was charged twice for one order.",
+         "summary": "Billing problem: double charge."},
+    ])
+    return index
+
+def test_build_match_query_quotes_input():
+    """Test that terms, phrases and prefixes are quoted for FTS5."""
+    assert build_match_query('late "box was" deliv*') == '"late" "box was" "deliv" *'
+    assert build_match_query('say "hi') == '"say" """hi"'
+    with pytest.raises(ValueError):
+        build_match_query('  "" ')
+
+def test_search_terms_and_phrases(index):
+    """Test term (AND) and phrase queries."""
+    assert [r["id"] for r in index.search("delivery late")] == ["a"]
+    assert {r["id"] for r in index.search("delivery")} == {"a", "b"}
+    assert [r["id"] for r in index.search('"delivery arrived"')] == ["b"]
+    assert index.search('"arrived delivery"') == []
+    assert [r["id"] for r in index.search("charg*")] == ["c"]
+    # Operators and stray quotes are plain words, not FTS5 syntax.
+    assert [r["id"] for r in index.search('box AND "damaged')] == ["a"]
+
+def test_search_ranks_summary_matches_higher(index):
+    """Test BM25 ranking, with the summary weighted above the body."""
+    results = index.search("service")
+    assert results[0]["id"] == "b"
+    assert results[0]["score"] > 0
+    ranked = index.search("delivery")
+    assert ranked[0]["id"] == "a"
+    assert ranked[0]["score"] > ranked[1]["score"]
+
+def test_add_many_skips_indexed_records(index):
+    """Test that re-adding known records is a no-op."""
+    assert index.add_many([{"id": "a", "full_text": "Something else entirely"}]) == 0
+    assert len(index) == 3
+    assert index.search("entirely") == []
+
+@pytest.mark.parametrize("engine", ["json", "journal", "sqlite"])
+def test_storage_updates_index_on_save(tmp_path, engine):
+    """Test that every engine indexes saved records and backfills a new index."""
+    storage = create_storage(engine, data_dir=str(tmp_path))
+    record_id = storage.save_analysis({"text": "Quarterly", "full_text": "Quarterly revenue grew.",
+                                       "summary": "Revenue up"})
+    storage.save_many([{"text": "Other", "full_text": "Unrelated text"}])
+    assert [r["id"] for r in storage.search_index.search("revenue")] == [record_id]
+
+    (tmp_path / "search_index.sqlite3").unlink()
+    reopened = create_storage(engine, data_dir=str(tmp_path))
+    assert len(reopened.search_index) == 2
+    assert [r["id"] for r in reopened.search_index.search("quarterly")] == [record_id]
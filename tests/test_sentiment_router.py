@@ -0,0 +1,87 @@
+import pytest
+from types import SimpleNamespace
+from src.circuit_breaker import CircuitBreaker
+from src.sentiment_router import SentimentRouter
+
+class FakeGeminiClient:
+    """Stand-in for GeminiClient recording which texts reach the AI."""
+
+    batch_token_budget = 8000
+    batch_max_items = 10
+
+    def __init__(self, sentiment="POSITIVE"):
+        self.sentiment = sentiment
+        self.backend = SimpleNamespace(available=True)
+        self.analyzed = []
+        self.summarized = []
+
+    def analyze(self, text):
+        self.analyzed.append(text)
+        return {"sentiment": self.sentiment, "confidence": "HIGH"}, "AI summary"
+
+    def generate_summary(self, text):
+        self.summarized.append(text)
+        return "AI summary"
+
+    def analyze_sentiment_batch(self, texts):
+        self.analyzed.extend(texts)
+        return [{"sentiment": self.sentiment, "confidence": "HIGH"} for _ in texts]
+
+CLEAR = "I love it, excellent and wonderful!"
+VAGUE = "It arrived on Tuesday."
+
+def test_local_engine_never_asks_ai_for_sentiment():
+    """Test that local mode scores locally and only requests the summary."""
+    client = FakeGeminiClient()
+    result, summary = SentimentRouter(client, engine="local").analyze(VAGUE)
+    assert result["sentiment"] == "NEUTRAL"
+    assert summary == "AI summary"
+    assert client.analyzed == [] and client.summarized == [VAGUE]
+
+def test_without_client_everything_stays_local():
+    """Test that a router without AI client (local-only mode) never needs one."""
+    router = SentimentRouter(None, engine="local")
+    result, summary = router.analyze(CLEAR)
+    assert result["sentiment"] == "POSITIVE"
+    assert summary == "AI Summary Unavailable (Local Only)"
+    assert len(router.analyze_sentiment_batch([CLEAR, VAGUE])) == 2
+    assert router.batch_max_items > 0
+
+def test_hybrid_escalates_low_confidence_only():
+    """Test that hybrid mode only sends unsure texts to Gemini."""
+    client = FakeGeminiClient(sentiment="NEGATIVE")
+    router = SentimentRouter(client, engine="hybrid")
+    results = router.analyze_sentiment_batch([CLEAR, VAGUE])
+    assert client.analyzed == [VAGUE]
+    assert [r["sentiment"] for r in results] == ["POSITIVE", "NEGATIVE"]
+    assert router.stats == {"local": 1, "gemini": 1, "fallback": 0}
+
+def test_breaker_opens_and_falls_back_locally():
+    """Test that repeated API errors open the circuit and the local engine answers."""
+    client = FakeGeminiClient(sentiment="API ERROR")
+    router = SentimentRouter(client, engine="gemini",
+                             breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    for _ in range(3):
+        result, summary = router.analyze(CLEAR)
+        assert result["sentiment"] == "POSITIVE"
+
+    assert len(client.analyzed) == 2
+    assert router.breaker.state == CircuitBreaker.OPEN
+    assert summary == "AI Summary Unavailable (Circuit Open)"
+    assert router.stats["fallback"] == 3
+
+def test_breaker_half_open_trial(monkeypatch):
+    """Test that one trial request is let through after the reset timeout."""
+    now = [100.0]
+    monkeypatch.setattr("src.circuit_breaker.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    assert not breaker.allow()
+    now[0] += 30
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_unknown_engine_rejected():
+    with pytest.raises(ValueError):
+        SentimentRouter(FakeGeminiClient(), engine="magic")
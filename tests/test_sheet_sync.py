@@ -0,0 +1,79 @@
+import pytest
+from src.sheet_sync import FakeSheetError, FakeWorksheet, SheetSync
+
+def make_history(count):
+    """Records newest first, as storage.iter_history() yields them."""
+    return [{"id": f"id-{i}", "timestamp": f"2024-05-01T10:{i // 60:02d}:{i % 60:02d}",
+             "sentiment": "POSITIVE", "text": f"Snippet {i}", "summary": f"Summary {i}"}
+            for i in reversed(range(count))]
+
+@pytest.fixture
+def sheet(tmp_path):
+    """Fixture to create an empty FakeWorksheet."""
+    return FakeWorksheet(str(tmp_path / "sheet.jsonl"), latency=0, error_rate=0)
+
+def make_sync(sheet, tmp_path, **kwargs):
+    return SheetSync(sheet, "Reports", state_path=str(tmp_path / "state.json"),
+                     columns=["id", "sentiment", "text"], base_delay=0, **kwargs)
+
+def test_sync_appends_only_new_rows_in_batches(sheet, tmp_path):
+    """Test that a second sync sends only the records added since the first."""
+    sync = make_sync(sheet, tmp_path, batch_rows=4)
+    seen = []
+    assert sync.sync(make_history(10), progress=seen.append) == 10
+    assert seen == [4, 8, 10]
+
+    requests = sheet.requests
+    assert sync.sync(make_history(13)) == 3
+    assert sync.sync(make_history(13)) == 0
+    # One append for the three new rows, no rewrite of the older ones.
+    assert sheet.requests - requests == 1
+
+    rows = sheet.get_all_values()
+    assert rows[0] == ["id", "sentiment", "text"]
+    assert [row[0] for row in rows[1:]] == [f"id-{i}" for i in range(13)]
+    assert sync.load_state()["last_id"] == "id-12"
+
+def test_sync_batches_bounded_by_bytes(sheet, tmp_path):
+    """Test that large rows are split so no request exceeds the payload limit."""
+    sheet.max_payload_bytes = 5000
+    sync = make_sync(sheet, tmp_path, max_batch_bytes=4000)
+    history = make_history(6)
+    for record in history:
+        record["text"] = "x" * 1500
+
+    assert sync.sync(history) == 6
+    assert len(sheet.get_all_values()) == 7
+
+def test_sync_retries_transient_errors(sheet, tmp_path):
+    """Test that throttling and server errors are retried with backoff."""
+    sheet.error_rate = 0.3
+    sheet._random.seed(1)
+    sync = make_sync(sheet, tmp_path, batch_rows=2, max_retries=20)
+
+    assert sync.sync(make_history(20)) == 20
+    sheet.error_rate = 0
+    assert len(sheet.get_all_values()) == 21
+
+def test_sync_gives_up_on_client_errors(sheet, tmp_path):
+    """Test that a rejected request is not retried and keeps the last position."""
+    sheet.max_payload_bytes = 200
+    sync = make_sync(sheet, tmp_path, batch_rows=2, max_batch_bytes=10 ** 6)
+    history = make_history(6)
+    history[1]["text"] = "x" * 500
+
+    with pytest.raises(FakeSheetError) as excinfo:
+        sync.sync(history)
+    assert excinfo.value.code == 400
+    assert sync.load_state()["last_id"] == "id-3"
+
+def test_sync_refuses_unknown_sheet_until_full_resync(sheet, tmp_path):
+    """Test that a sheet with foreign rows is only rewritten on request."""
+    sheet.append_row(["something", "else"])
+    sync = make_sync(sheet, tmp_path)
+
+    with pytest.raises(ValueError):
+        sync.sync(make_history(3))
+    assert sync.sync(make_history(3), full=True) == 3
+    assert sheet.get_all_values()[0] == ["id", "sentiment", "text"]
+    assert len(sheet.get_all_values()) == 4
@@ -2,7 +2,13 @@
 import os
 import json
 import pytest
-from src.storage import StorageManager
+from src.storage import (
+    StorageManager,
+    JournalStorageManager,
+    SQLiteStorageManager,
+    content_hash,
+    create_storage,
+)
 
 @pytest.fixture
 def mock_storage(tmp_path):
@@ -49,3 +55,129 @@ def test_load_empty_db_file_not_exists(tmp_path):
     
     history = storage.get_history()
     assert history == []
+
+@pytest.fixture
+def journal_storage(tmp_path):
+    """Fixture to create a JournalStorageManager with a temp directory."""
+    return JournalStorageManager(data_dir=str(tmp_path / "journal"))
+
+def test_journal_save_appends_one_line(journal_storage):
+    """Test that each save appends exactly one JSON line."""
+    first_id = journal_storage.save_analysis({"text": "First"})
+    journal_storage.save_analysis({"text": "Second"})
+
+    with open(journal_storage.journal_file, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    assert len(lines) == 2
+    assert json.loads(lines[0])["id"] == first_id
+
+def test_journal_get_history_across_blocks(journal_storage):
+    """Test reading history backwards when records span several blocks."""
+    journal_storage.READ_BLOCK_SIZE = 16
+    for i in range(10):
+        journal_storage.save_analysis({"text": f"Record {i}", "padding": "x" * 40})
+
+    history = journal_storage.get_history(limit=3)
+
+    assert [r["text"] for r in history] == ["Record 9", "Record 8", "Record 7"]
+    assert len(journal_storage.get_history(limit=50)) == 10
+
+def test_journal_skips_torn_line(journal_storage):
+    """Test that a partially written last line does not break history."""
+    journal_storage.save_analysis({"text": "Intact"})
+    with open(journal_storage.journal_file, "a", encoding="utf-8") as f:
+        f.write('{"text": "Tor')
+
+    history = journal_storage.get_history(limit=5)
+    assert [r["text"] for r in history] == ["Intact"]
+
+    journal_storage.save_analysis({"text": "After crash"})
+    history = journal_storage.get_history(limit=5)
+    assert [r["text"] for r in history] == ["After crash", "Intact"]
+
+def test_journal_migrate_from_json(tmp_path):
+    """Test the one-time migration from the legacy db.json array."""
+    d = tmp_path / "legacy"
+    legacy = StorageManager(data_dir=str(d))
+    legacy.save_analysis({"text": "Old 1"})
+    legacy.save_analysis({"text": "Old 2"})
+
+    journal = JournalStorageManager(data_dir=str(d))
+    assert journal.migrate_from_json() == 2
+    assert not os.path.exists(legacy.db_file)
+    assert os.path.exists(legacy.db_file + ".migrated")
+    assert [r["text"] for r in journal.get_history(limit=5)] == ["Old 2", "Old 1"]
+
+    # Running it again is a no-op.
+    assert journal.migrate_from_json() == 0
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    """Fixture to create a SQLiteStorageManager with a temp directory."""
+    return SQLiteStorageManager(data_dir=str(tmp_path / "sqlite"))
+
+def test_sqlite_save_and_history(sqlite_storage):
+    """Test the SQLite engine honours the StorageManager interface."""
+    sqlite_storage.save_analysis({"text": "First"})
+    sqlite_storage.save_analysis({"text": "Second"})
+    sqlite_storage.save_analysis({"text": "Third"})
+
+    history = sqlite_storage.get_history(limit=2)
+    assert [r["text"] for r in history] == ["Third", "Second"]
+
+def test_sqlite_filters_and_keyset_pagination(sqlite_storage):
+    """Test sentiment filtering and paging through results with a cursor."""
+    for i in range(5):
+        sqlite_storage.save_analysis({"text": f"Pos {i}", "sentiment": "POSITIVE"})
+        sqlite_storage.save_analysis({"text": f"Neg {i}", "sentiment": "NEGATIVE"})
+
+    page, cursor = sqlite_storage.query_history(limit=2, sentiment="POSITIVE")
+    assert [r["text"] for r in page] == ["Pos 4", "Pos 3"]
+
+    seen = [r["text"] for r in page]
+    while cursor:
+        page, cursor = sqlite_storage.query_history(limit=2, sentiment="POSITIVE", cursor=cursor)
+        seen.extend(r["text"] for r in page)
+    assert seen == [f"Pos {i}" for i in range(4, -1, -1)]
+
+    none_yet, _ = sqlite_storage.query_history(date_to="2000-01-01")
+    assert none_yet == []
+
+def test_sqlite_find_by_content_hash(sqlite_storage):
+    """Test looking up records by the hash of their text."""
+    record_id = sqlite_storage.save_analysis({"text": "Short", "full_text": "Full document"})
+
+    matches = sqlite_storage.find_by_content_hash(content_hash("Full document"))
+    assert [r["id"] for r in matches] == [record_id]
+
+def test_create_storage_selects_engine(tmp_path, monkeypatch):
+    """Test picking the storage engine from the STORAGE_ENGINE setting."""
+    monkeypatch.setenv("STORAGE_ENGINE", "sqlite")
+    assert isinstance(create_storage(data_dir=str(tmp_path)), SQLiteStorageManager)
+    assert isinstance(create_storage("journal", data_dir=str(tmp_path)), JournalStorageManager)
+
+    with pytest.raises(ValueError):
+        create_storage("xml", data_dir=str(tmp_path))
+
+@pytest.mark.parametrize("engine", ["json", "journal", "sqlite"])
+def test_save_many_grouped_commit(tmp_path, engine):
+    """Test saving a group of records in one commit on every engine."""
+    storage = create_storage(engine, data_dir=str(tmp_path))
+    ids = storage.save_many([{"text": "One"}, {"text": "Two"}, {"text": "Three"}])
+
+    assert len(set(ids)) == 3
+    history = storage.get_history(limit=5)
+    assert [r["id"] for r in history] == ids[::-1]
+
+@pytest.mark.parametrize("engine", ["json", "journal", "sqlite"])
+def test_iter_history_streams_everything(tmp_path, engine):
+    """Test that iter_history yields the whole history, newest first, past any page size."""
+    storage = create_storage(engine, data_dir=str(tmp_path))
+    ids = storage.save_many([{"text": f"Doc {i}"} for i in range(25)])
+
+    if engine == "sqlite":
+        streamed = list(storage.iter_history(page_size=10))
+    else:
+        streamed = list(storage.iter_history())
+    assert [r["id"] for r in streamed] == ids[::-1]
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from src.response_cache import ResponseCache
+from src.summarizer import ChunkedSummarizer
+
+class FakeClient:
+    """Minimal stand-in exposing what ChunkedSummarizer needs from GeminiClient."""
+
+    model_name = "fake-model"
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.prompts = []
+
+    async def generate_text_async(self, prompt):
+        self.prompts.append(prompt)
+        return f"summary #{len(self.prompts)}"
+
+def make_document(paragraphs):
+    return "\n\n".join(f"Section {i}. " + "detail " * 80 for i in range(paragraphs))
+
+def test_short_document_single_request():
+    """Test a document that fits one chunk is summarized in one call."""
+    client = FakeClient()
+    summary = asyncio.run(ChunkedSummarizer(client).summarize_async("Just a short note."))
+
+    assert summary == "summary #1"
+    assert len(client.prompts) == 1
+
+def test_map_reduce_levels():
+    """Test chunks are summarized, then reduced until one summary is left."""
+    client = FakeClient()
+    summarizer = ChunkedSummarizer(client, chunk_chars=1200, min_chunk_chars=400, fan_in=3)
+    asyncio.run(summarizer.summarize_async(make_document(30)))
+
+    map_calls = [p for p in client.prompts if p.startswith("Summarize the following section")]
+    reduce_calls = [p for p in client.prompts if p.startswith("The following are summaries")]
+    assert len(map_calls) > 3
+    assert len(reduce_calls) >= 2
+    assert "2-3 concise sentences" in reduce_calls[-1]
+
+def test_unchanged_chunks_reused_after_edit(tmp_path):
+    """Test that re-summarizing an edited document only resends changed chunks."""
+    cache = ResponseCache(db_path=str(tmp_path / "cache.sqlite3"))
+    client = FakeClient(cache=cache)
+    summarizer = ChunkedSummarizer(client, chunk_chars=1200, min_chunk_chars=400)
+
+    document = make_document(30)
+    asyncio.run(summarizer.summarize_async(document))
+    first_map_calls = sum(p.startswith("Summarize the following section") for p in client.prompts)
+
+    client.prompts.clear()
+    edited = document.replace("Section 2.", "Section 2 (revised).")
+    asyncio.run(summarizer.summarize_async(edited))
+    second_map_calls = sum(p.startswith("Summarize the following section") for p in client.prompts)
+
+    assert first_map_calls > 3
+    assert second_map_calls <= 2
@@ -0,0 +1,53 @@
+import pytest
+from src.text_metrics import MetricsCounter, compute_file_metrics, compute_metrics, parse_metrics
+
+TEXT = "The cat sat. The cat ran! Did the dog see it?\nNo, it didn't"
+
+def test_compute_all_metrics():
+    """Test every metric on a small text."""
+    result = compute_metrics(TEXT, top_n=2)
+    assert result["tokens"] == 14
+    assert result["top_words"] == [("the", 3), ("cat", 2)]
+    assert result["bigrams"][0] == ("the cat", 2)
+    assert result["sentences"] == 4
+    assert result["avg_word_length"] == 3.0
+    assert result["type_token_ratio"] == pytest.approx(10 / 14, abs=1e-4)
+    assert "flesch_reading_ease" in result and "flesch_kincaid_grade" in result
+
+def test_bigrams_do_not_cross_sentences():
+    """Test that bigrams stop at sentence ends."""
+    bigrams = dict(compute_metrics("Red apple. Green pear.")["bigrams"])
+    assert bigrams == {"red apple": 1, "green pear": 1}
+
+def test_metric_selection():
+    """Test that only the requested metrics are returned."""
+    result = compute_metrics(TEXT, metrics=["sentences"])
+    assert set(result) == {"tokens", "sentences"}
+    with pytest.raises(ValueError):
+        parse_metrics("sentences,colour")
+    assert parse_metrics("all") == parse_metrics(None)
+
+@pytest.mark.parametrize("table", ["counter", "array"])
+def test_chunked_stream_matches_whole_text(table):
+    """Test that any chunking gives the same result as the whole text."""
+    whole = compute_metrics(TEXT, top_n=50, table=table)
+    for size in (1, 3, 7):
+        counter = MetricsCounter(table=table)
+        for i in range(0, len(TEXT), size):
+            counter.update(TEXT[i:i + size])
+        assert counter.result(top_n=50) == whole
+
+def test_merge_files(tmp_path):
+    """Test merging counters of separate files."""
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    first.write_text("alpha beta", encoding="utf-8")
+    second.write_text("gamma delta.", encoding="utf-8")
+
+    a, b = MetricsCounter(), MetricsCounter()
+    a.update(first.read_text(encoding="utf-8"))
+    b.update(second.read_text(encoding="utf-8"))
+    merged = a.merge(b, adjacent=False).result()
+
+    assert merged["sentences"] == 2
+    assert ("beta gamma", 1) not in merged["bigrams"]
+    assert compute_file_metrics(str(second))["tokens"] == 2
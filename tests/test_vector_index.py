@@ -0,0 +1,59 @@
+import os
+import numpy as np
+import pytest
+from src.storage import create_storage
+from src.vector_index import VectorIndex
+
+DOCS = [
+    {"id": "11111111-aaaa", "text": "Shipping", "full_text": "The parcel shipping was late and the courier lost the parcel."},
+    {"id": "22222222-bbbb", "text": "Courier", "full_text": "Courier delays again: my parcel shipping took three weeks."},
+    {"id": "33333333-cccc", "text": "Recipe", "full_text": "Whisk the eggs with sugar, then fold in the flour and bake."},
+    {"id": "44444444-dddd", "text": "Baking", "full_text": "Bake the cake after mixing flour, sugar and eggs."},
+]
+
+@pytest.fixture
+def index(tmp_path):
+    """Fixture to create a VectorIndex with a few records."""
+    index = VectorIndex(str(tmp_path / "vectors"), dimensions=256)
+    index.add_many(DOCS)
+    return index
+
+def test_similar_by_text_and_id(index):
+    """Test ranking by a free text and by a record ID prefix, which is excluded."""
+    by_text = index.similar("late parcel shipping", limit=2)
+    assert [r["id"] for r in by_text] == ["11111111-aaaa", "22222222-bbbb"]
+    assert 0 < by_text[1]["similarity"] <= by_text[0]["similarity"] <= 1
+
+    by_id = index.similar("33333333", limit=3)
+    assert by_id[0]["id"] == "44444444-dddd"
+    assert "33333333-cccc" not in [r["id"] for r in by_id]
+
+def test_unknown_prefix_is_used_as_text(index):
+    """Test that a short or unknown reference is compared as text."""
+    assert index.resolve_id("1111") is None
+    assert index.resolve_id("99999999") is None
+    assert index.resolve_id("11111111")[1] == "11111111-aaaa"
+    assert index.similar("zzz qqq") == []
+
+def test_matrix_is_appended_and_memory_mapped(index, tmp_path):
+    """Test that vectors persist on disk and duplicates are skipped."""
+    assert index.add_many(DOCS[:1]) == 0
+    assert os.path.getsize(index.matrix_path) == 4 * 256 * 4
+    assert os.path.getsize(index.norms_path) == 4 * 4
+    reopened = VectorIndex(str(tmp_path / "vectors"), dimensions=1024)
+    assert reopened.dimensions == 256
+    assert isinstance(reopened._matrix(len(reopened)), np.memmap)
+
+    # A row written without its metadata commit is dropped on reopen.
+    with open(index.matrix_path, "ab") as f:
+        f.write(b"\0" * 256 * 4)
+    assert VectorIndex(str(tmp_path / "vectors")).add_many(
+        [{"id": "55555555-eeee", "full_text": "Fold the flour into the eggs."}]) == 1
+    assert os.path.getsize(index.matrix_path) == 5 * 256 * 4
+    assert index.similar("55555555")[0]["id"] in ("33333333-cccc", "44444444-dddd")
+
+def test_storage_updates_vectors_on_save(tmp_path):
+    """Test that saved records are immediately searchable by similarity."""
+    storage = create_storage("sqlite", data_dir=str(tmp_path))
+    ids = storage.save_many([{"text": d["text"], "full_text": d["full_text"]} for d in DOCS])
+    assert storage.vector_index.similar(ids[0], limit=1)[0]["id"] == ids[1]